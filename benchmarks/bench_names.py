@@ -0,0 +1,83 @@
+"""
+Tab 3 benchmark: near-duplicate name lookup at name-master scale.
+
+Builds validator.names.NearDuplicateIndex over synthetic 'Brand Model Code Size'
+names, then queries it with perturbed copies of master names (case, punctuation,
+one typo) and with unrelated names. Reports build time, per-query latency and
+recall (the original name among the top-k). A naive thefuzz scan over the whole
+master is timed on a handful of queries for comparison.
+
+    python benchmarks/bench_names.py                 # 100k and 1M names
+    python benchmarks/bench_names.py 100000
+"""
+import os
+import sys
+import time
+import random
+
+import numpy as np
+from thefuzz import fuzz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from validator import names  # noqa: E402
+
+BRANDS = ["Ray-Ban", "Oakley", "Persol", "Tom Ford", "Gucci", "Prada", "Carrera", "Police",
+          "Vogue Eyewear", "Emporio Armani", "Hugo Boss", "Polaroid", "Guess", "Max Mara", "Etnia Barcelona"]
+MODELS = ["Aviator", "Wayfarer", "Clubmaster", "Round", "Cat Eye", "Pilot", "Square", "Browline", "Oval", "Shield"]
+
+
+def make_names(n, seed=3):
+    rng = random.Random(seed)
+    out = set()
+    while len(out) < n:
+        out.add(f"{rng.choice(BRANDS)} {rng.choice(MODELS)} {rng.choice('ABCDEFGHKLMPRSTV')}{rng.choice('ABCDEFGHKLMPRSTV')}"
+                f"{rng.randint(100, 99999)} {rng.randint(44, 62)}")
+    return list(out)
+
+
+def perturb(name, rng):
+    """Case/punctuation change plus one typo."""
+    s = name.lower().replace("-", " ") if rng.random() < 0.5 else name.upper().replace(" ", "-")
+    i = rng.randrange(len(s))
+    op = rng.choice(("drop", "swap", "sub"))
+    if op == "drop": return s[:i] + s[i + 1:]
+    if op == "swap" and i < len(s) - 1: return s[:i] + s[i + 1] + s[i] + s[i + 2:]
+    return s[:i] + rng.choice("abcdefghij0123456789") + s[i + 1:]
+
+
+def main(sizes, n_queries=2000):
+    rng = random.Random(11)
+    print(f"{'names':>9} {'build s':>8} {'MB':>6} {'p50 ms':>7} {'p99 ms':>7} {'recall':>7} {'false+':>7} {'naive ms':>9}")
+    for n in sizes:
+        master = make_names(n)
+        t0 = time.perf_counter()
+        index = names.NearDuplicateIndex.from_list(master)
+        build = time.perf_counter() - t0
+        mb = sum(a.nbytes for a in index.postings.values()) / 1e6
+
+        originals = rng.sample(master, n_queries // 2)
+        queries = [(perturb(o, rng), o) for o in originals]
+        queries += [(f"Unknown Brand {rng.randint(0, 10**6)}", None) for _ in range(n_queries // 2)]
+
+        times, found, false_pos = [], 0, 0
+        for q, original in queries:
+            t0 = time.perf_counter()
+            hits = index.query(q)
+            times.append(time.perf_counter() - t0)
+            if original is None: false_pos += bool(hits)
+            else: found += any(h == original for h, _ in hits)
+        times = np.array(times) * 1000
+
+        sample = [q for q, _ in queries[:5]]
+        t0 = time.perf_counter()
+        for q in sample:
+            key = names.name_key(q)
+            max(master, key=lambda m: fuzz.ratio(key, names.name_key(m)))
+        naive = (time.perf_counter() - t0) / len(sample) * 1000
+
+        print(f"{n:>9} {build:>8.1f} {mb:>6.0f} {np.percentile(times, 50):>7.3f} {np.percentile(times, 99):>7.3f} "
+              f"{found / (n_queries // 2):>7.1%} {false_pos / (n_queries // 2):>7.1%} {naive:>9.0f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [100_000, 1_000_000])
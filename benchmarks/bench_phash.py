@@ -0,0 +1,123 @@
+"""
+Tab 4 benchmark: perceptual-hash duplicate images.
+
+1. Detection: synthetic products (random shapes and colors, transparent
+   background). Some are copied under another product's name, re-saved
+   the way copies usually are: scaled, padded on white, JPEG. Reports the
+   share of planted copies found and the images flagged that weren't planted.
+2. Search: near_pairs (multi-index Hamming) vs. comparing every pair,
+   on random 64-bit hashes with planted near copies.
+
+    python benchmarks/bench_phash.py             # 400 images, search up to 50k
+    python benchmarks/bench_phash.py 2000 200000
+"""
+import io
+import os
+import sys
+import time
+import random
+import zipfile
+import tempfile
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from validator import phash  # noqa: E402
+from validator.zipstream import ImageZip  # noqa: E402
+
+
+def product_image(rng, size=(600, 240)):
+    """RGBA PNG bytes of a random product: a few filled ellipses / rectangles in random colors."""
+    img = Image.new("RGBA", size, (0, 0, 0, 0))
+    d = ImageDraw.Draw(img)
+    w, h = size
+    for _ in range(rng.randint(3, 7)):
+        x0, y0 = rng.randint(0, w - 60), rng.randint(0, h - 40)
+        box = (x0, y0, x0 + rng.randint(40, w // 2), y0 + rng.randint(30, h // 2))
+        fill = tuple(rng.randint(0, 220) for _ in range(3)) + (rng.choice([120, 255]),)
+        (d.ellipse if rng.random() < 0.5 else d.rectangle)(box, fill=fill)
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+    return buf.getvalue()
+
+
+def copied(data, rng):
+    """The same shot re-saved: scaled 50-150%, padded on white, JPEG."""
+    img = Image.open(io.BytesIO(data)).convert("RGBA")
+    s = rng.uniform(0.5, 1.5)
+    img = img.resize((max(1, int(img.width * s)), max(1, int(img.height * s))))
+    px, py = rng.randint(0, 200), rng.randint(0, 200)
+    bg = Image.new("RGBA", (img.width + px, img.height + py), (255, 255, 255, 255))
+    bg.alpha_composite(img, (rng.randint(0, px), rng.randint(0, py)))
+    buf = io.BytesIO()
+    bg.convert("RGB").save(buf, "JPEG", quality=rng.randint(60, 95))
+    return buf.getvalue()
+
+
+def detection(n_images, seed=5):
+    rng = random.Random(seed)
+    buf, names, planted = io.BytesIO(), set(), set()
+    with zipfile.ZipFile(buf, "w") as z:
+        for n in range(n_images):
+            data = product_image(rng, (rng.randint(480, 720), rng.randint(180, 300)))
+            z.writestr(f"Brand_P{n}.png", data)
+            names.add(f"brand/p{n}")
+            if n % 10 == 0:
+                z.writestr(f"Brand_C{n}.jpg", copied(data, rng))
+                names.add(f"brand/c{n}")
+                planted |= {f"brand/p{n}", f"brand/c{n}"}
+    path = tempfile.mktemp(suffix=".zip")
+    db = tempfile.mktemp(suffix=".sqlite")
+    with open(path, "wb") as f: f.write(buf.getvalue())
+    try:
+        for run in ("cold", "cached"):
+            with ImageZip(path) as zf, phash.HashCache(db) as cache:
+                t0 = time.perf_counter()
+                records, _ = phash.find_duplicate_images(zf, names, workers=1, cache=cache)
+                seconds = time.perf_counter() - t0
+            flagged = {r["Product"] for r in records}
+            print(f"{run:>7}: {len(zf.image_names())} images in {seconds:.2f} s ({seconds / len(names) * 1000:.2f} ms/img), "
+                  f"planted copies found {len(flagged & planted) / len(planted):.0%}, not planted but flagged {len(flagged - planted)}")
+    finally:
+        for p in (path, db, db + "-wal", db + "-shm"):
+            if os.path.exists(p): os.remove(p)
+
+
+def brute_pairs(hashes, max_distance, block=256):
+    count = 0
+    for start in range(0, len(hashes), block):
+        dist = phash.hamming(hashes[start:start + block, None], hashes[None, :])
+        i, j = np.nonzero(dist <= max_distance)
+        count += int(((i + start) < j).sum())
+    return count
+
+
+def search(n_max, seed=9):
+    rng = np.random.default_rng(seed)
+    print(f"{'hashes':>8} {'multi-index s':>14} {'pairs':>7} {'all-pairs s':>12}")
+    n = 10_000
+    while n <= n_max:
+        base = rng.integers(0, 2 ** 63, size=n, dtype=np.uint64) * np.uint64(2) + rng.integers(0, 2, size=n, dtype=np.uint64)
+        # 1% near copies (1-5 flipped bits)
+        src = rng.choice(n, n // 100, replace=False)
+        flips = np.zeros(len(src), dtype=np.uint64)
+        for k in range(len(src)):
+            for bit in rng.choice(64, rng.integers(1, phash.MAX_DISTANCE + 1), replace=False):
+                flips[k] |= np.uint64(1) << np.uint64(bit)
+        hashes = np.concatenate([base, base[src] ^ flips])
+        t0 = time.perf_counter()
+        i, _, _ = phash.near_pairs(hashes)
+        fast = time.perf_counter() - t0
+        brute = ""
+        if len(hashes) <= 20_000:
+            t0 = time.perf_counter()
+            assert brute_pairs(hashes, phash.MAX_DISTANCE) == len(i)
+            brute = f"{time.perf_counter() - t0:.2f}"
+        print(f"{len(hashes):>8} {fast:>14.3f} {len(i):>7} {brute:>12}")
+        n *= 5
+
+
+if __name__ == "__main__":
+    detection(int(sys.argv[1]) if len(sys.argv) > 1 else 400)
+    search(int(sys.argv[2]) if len(sys.argv) > 2 else 50_000)
@@ -0,0 +1,90 @@
+"""
+Tab 4 benchmark: accuracy vs. speed of the color quantization backends.
+
+Synthetic background-free frames are drawn in a known COLOR_MAP frame color
+(with shading and noise) and tinted lenses, then every backend in
+validator.colors.QUANTIZERS is scored on:
+  found - colors_match(frame color, detected) is True
+  clean - share of detected percentage that belongs to the frame or lens color (aliases allowed)
+  agree - same dominant color as the sklearn 'kmeans' backend
+
+    python benchmarks/bench_quantize.py          # 60 images
+    python benchmarks/bench_quantize.py 200
+"""
+import io
+import os
+import sys
+import time
+import random
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from validator import colors  # noqa: E402
+
+FRAME_COLORS = [c for c in colors.COLOR_MAP if c not in ("White", "Ivory")]
+
+
+def frame_image(frame_rgb, lens_rgb, rng, size=(600, 240), noise=12, temple_rgb=None):
+    """RGBA PNG bytes of a simple glasses front: two rims, a bridge, temples (frame color by default), tinted lenses."""
+    w, h = size
+    temple_rgb = temple_rgb or frame_rgb
+    img = Image.new("RGBA", size, (0, 0, 0, 0))
+    d = ImageDraw.Draw(img)
+    rim = max(6, h // 18)
+    lw, lh = int(w * 0.36), int(h * 0.7)
+    boxes = [(int(w * 0.08), int(h * 0.15)), (int(w * 0.56), int(h * 0.15))]
+    for x, y in boxes:
+        d.ellipse((x, y, x + lw, y + lh), fill=lens_rgb + (120,), outline=frame_rgb + (255,), width=rim)
+    d.rectangle((int(w * 0.44), int(h * 0.3), int(w * 0.56), int(h * 0.3) + rim), fill=frame_rgb + (255,))
+    d.rectangle((0, int(h * 0.22), int(w * 0.08), int(h * 0.22) + rim), fill=temple_rgb + (255,))
+    d.rectangle((int(w * 0.92), int(h * 0.22), w, int(h * 0.22) + rim), fill=temple_rgb + (255,))
+
+    # Shading + sensor noise on the visible pixels
+    arr = np.asarray(img).astype(np.int16)
+    shade = np.linspace(-15, 15, w, dtype=np.int16)[None, :, None]
+    jitter = np.random.default_rng(rng.randint(0, 1 << 30)).normal(0, noise, arr[..., :3].shape).astype(np.int16)
+    arr[..., :3] = np.clip(arr[..., :3] + shade + jitter, 0, 255)
+    arr[arr[..., 3] == 0] = 0
+
+    buf = io.BytesIO()
+    Image.fromarray(arr.astype(np.uint8), "RGBA").save(buf, "PNG")
+    return buf.getvalue()
+
+
+def make_fixtures(n, seed=7):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        frame = rng.choice(FRAME_COLORS)
+        lens = rng.choice(["Grey", "Brown", "Green", "Blue"])
+        out.append((frame, lens, frame_image(colors.COLOR_MAP[frame], colors.COLOR_MAP[lens], rng)))
+    return out
+
+
+def same_color(expected, name):
+    return name == expected or name in colors.COLOR_ALIASES.get(expected, ())
+
+
+def main(n_images):
+    fixtures = make_fixtures(n_images)
+    reference = []
+    print(f"{n_images} synthetic frames")
+    print(f"{'backend':>10} {'ms/img':>8} {'found':>6} {'clean':>6} {'agree':>6}")
+    for method in colors.QUANTIZERS:
+        colors.extract_dominant_colors(fixtures[0][2], method=method)  # warm-up (imports)
+        t0 = time.perf_counter()
+        detected = [colors.extract_dominant_colors(data, method=method) for _, _, data in fixtures]
+        ms = (time.perf_counter() - t0) / n_images * 1000
+
+        found = np.mean([bool(colors.colors_match(frame, det)) for (frame, _, _), det in zip(fixtures, detected)])
+        clean = np.mean([sum(pct for name, pct in det if same_color(frame, name) or same_color(lens, name)) / 100
+                         for (frame, lens, _), det in zip(fixtures, detected)])
+        if method == "kmeans": reference = [det[0][0] for det in detected]
+        agree = np.mean([det[0][0] == ref for det, ref in zip(detected, reference)]) if reference else float("nan")
+        print(f"{method:>10} {ms:>8.2f} {found:>6.0%} {clean:>6.0%} {agree:>6.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 60)
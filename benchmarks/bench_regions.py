@@ -0,0 +1,66 @@
+"""
+Tab 4 benchmark: whole-image vs. per-region color checks.
+
+Synthetic frames get independent frame, lens and temple colors
+(bench_quantize.frame_image). Each field is checked twice: against the
+whole-image colors (old behaviour) and against its own region
+(colors.extract_region_colors). Per field and quantizer:
+  found - the field's own color is matched
+  false - a color of another part (not an alias) is matched too
+
+    python benchmarks/bench_regions.py          # 60 images
+    python benchmarks/bench_regions.py 200
+"""
+import os
+import sys
+import time
+import random
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from validator import colors  # noqa: E402
+from bench_quantize import FRAME_COLORS, frame_image  # noqa: E402
+
+LENS_COLORS = ["Grey", "Brown", "Green", "Blue"]
+
+
+def make_fixtures(n, seed=11):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        frame, lens, temple = rng.choice(FRAME_COLORS), rng.choice(LENS_COLORS), rng.choice(FRAME_COLORS)
+        data = frame_image(colors.COLOR_MAP[frame], colors.COLOR_MAP[lens], rng, temple_rgb=colors.COLOR_MAP[temple])
+        out.append(({"frame": frame, "lens": lens, "temple": temple}, data))
+    return out
+
+
+def main(n_images):
+    fixtures = make_fixtures(n_images)
+    print(f"{n_images} synthetic frames (random frame / lens / temple colors)")
+    print(f"{'backend':>10} {'mode':>7} {'ms/img':>8} " + " ".join(f"{r + ' found':>13} {r + ' false':>13}" for r in colors.REGIONS))
+    for method in colors.QUANTIZERS:
+        colors.extract_region_colors(fixtures[0][1], method=method)  # warm-up (imports)
+        t0 = time.perf_counter()
+        whole = [colors.extract_dominant_colors(data, method=method) for _, data in fixtures]
+        ms_whole = (time.perf_counter() - t0) / n_images * 1000
+        t0 = time.perf_counter()
+        by_region = [colors.extract_region_colors(data, method=method) for _, data in fixtures]
+        ms_region = (time.perf_counter() - t0) / n_images * 1000
+
+        for mode, ms, pick in (("image", ms_whole, lambda i, r: whole[i]),
+                               ("region", ms_region, lambda i, r: by_region[i].get(r, by_region[i]["all"]))):
+            cells = []
+            for region in colors.REGIONS:
+                found, false = [], []
+                for i, (truth, _) in enumerate(fixtures):
+                    detected = pick(i, region)
+                    found.append(bool(colors.colors_match(truth[region], detected)))
+                    others = {c for c in truth.values() if not colors.colors_match(c, [(truth[region], 100)])}
+                    false.append(any(colors.colors_match(c, detected) for c in others))
+                cells.append(f"{np.mean(found):>13.0%} {np.mean(false):>13.0%}")
+            print(f"{method:>10} {mode:>7} {ms:>8.2f} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 60)
@@ -0,0 +1,283 @@
+"""
+End-to-end benchmark suite on synthetic data, results as JSON for comparing commits.
+
+Generated per scale (seeded, so every run and every commit sees the same data):
+  master       - 'Items type' + every IDEAL_PAIRS column, comma-separated allowed values, ~80% Glasses rows
+  name master  - name / name_private columns, ~90% glasses rows
+  user sheet   - xlsx with the IDEAL_PAIRS user columns + 'Glasses name'; --error-rate of the cells
+                 carry a mistake (unknown value, stray space, space around '|') and the names mix
+                 master duplicates, near duplicates, look-alike characters and new names
+  image ZIP    - background-free frames in COLOR_MAP colors (see bench_quantize.py)
+
+Timed: load_master (cold = empty disk cache, warm = cache hit), load_name_master,
+clean_user_file, the Tab 1 index build + validation, the Tab 3 index build + analysis
+and extract_dominant_colors over the ZIP.
+
+    python benchmarks/bench_suite.py                            # small + medium -> bench_results.json
+    python benchmarks/bench_suite.py --scales large --repeat 1
+    python benchmarks/bench_suite.py --out new.json --compare old.json
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import zipfile
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from validator import colors, masters, names, perf  # noqa: E402
+from validator.cache import DiskCache  # noqa: E402
+from validator.index import MasterIndex  # noqa: E402
+from validator.userfile import clean_user_file  # noqa: E402
+from validator.zipstream import ImageZip  # noqa: E402
+from bench_names import make_names, perturb  # noqa: E402
+from bench_quantize import FRAME_COLORS, frame_image  # noqa: E402
+
+SCALES = {
+    "small":  {"master_rows": 2_000,   "names": 5_000,   "user_rows": 1_000,  "images": 8},
+    "medium": {"master_rows": 20_000,  "names": 50_000,  "user_rows": 10_000, "images": 30},
+    "large":  {"master_rows": 100_000, "names": 200_000, "user_rows": 50_000, "images": 100},
+}
+VALUES_PER_COLUMN = 40
+FILLER_COLUMNS = 10   # master columns Tab 1 never reads
+HOMOGLYPHS = {"a": "а", "e": "е", "o": "о", "c": "с"}  # Latin -> Cyrillic
+
+
+# ==========================================
+# 🧪 SYNTHETIC DATA
+# ==========================================
+def column_values(master_key):
+    return [f"{master_key.split(':')[-1].strip()} {i}" for i in range(VALUES_PER_COLUMN)]
+
+
+def make_master(folder, n_rows, rng):
+    """master.csv: Glasses + other item rows, every IDEAL_PAIRS column holding 1-3 comma-separated values."""
+    cols = {"Items type": [("Glasses" if rng.random() < 0.8 else rng.choice(["Lenses", "Case", "Cloth"])) for _ in range(n_rows)]}
+    for i in range(FILLER_COLUMNS):
+        cols[f"Attribute {i}"] = [f"x{rng.randint(0, 10 ** 6)}" for _ in range(n_rows)]
+    for mk in masters.IDEAL_PAIRS:
+        if mk == "Items type": continue
+        vocab = column_values(mk)
+        cols[f" {mk}  "] = [",".join(rng.sample(vocab, rng.randint(1, 3))) if rng.random() < 0.9 else None for _ in range(n_rows)]
+    path = os.path.join(folder, "master.csv")
+    pd.DataFrame(cols).to_csv(path, index=False)
+    return path
+
+
+def make_name_master(folder, n_names, rng):
+    """name_master.csv; returns the glasses names (what load_name_master should give back)."""
+    glasses = make_names(n_names, seed=rng.randint(0, 1 << 30))
+    rows = [(n, "glasses " + n.lower()) for n in glasses]
+    rows += [(f"Lens {i}", "contact lenses") for i in range(n_names // 10)]
+    rng.shuffle(rows)
+    pd.DataFrame(rows, columns=["name", "name_private"]).to_csv(os.path.join(folder, "name_master.csv"), index=False)
+    return glasses
+
+
+def look_alike(name, rng):
+    pos = [i for i, ch in enumerate(name) if ch in HOMOGLYPHS]
+    if not pos: return name + " х"
+    i = rng.choice(pos)
+    return name[:i] + HOMOGLYPHS[name[i]] + name[i + 1:]
+
+
+def user_name(master_names, rng):
+    r = rng.random()
+    if r < 0.10: return rng.choice(master_names)                  # duplicate
+    if r < 0.20: return perturb(rng.choice(master_names), rng)   # near duplicate
+    if r < 0.25: return look_alike(rng.choice(master_names), rng)
+    return f"New Brand {rng.randint(0, 10 ** 6)} {rng.randint(44, 62)}"
+
+
+def user_cell(vocab, error_rate, rng):
+    if rng.random() < 0.1: return None
+    cell = "|".join(rng.sample(vocab, rng.randint(1, min(2, len(vocab)))))
+    if rng.random() < error_rate:
+        kind = rng.randrange(3)
+        if kind == 0: cell = cell + "|bogus " + str(rng.randint(0, 99))
+        elif kind == 1: cell = " " + cell
+        else: cell = cell.replace("|", " | ") if "|" in cell else cell + " | " + rng.choice(vocab)
+    return cell
+
+
+def make_user_sheet(n_rows, master_names, error_rate, rng):
+    """xlsx bytes of an import sheet."""
+    cols = {"Glasses name": [user_name(master_names, rng) for _ in range(n_rows)]}
+    for mk, uk in masters.IDEAL_PAIRS.items():
+        vocab = ["Glasses"] if mk == "Items type" else column_values(mk)
+        cols[uk] = [user_cell(vocab, error_rate, rng) for _ in range(n_rows)]
+    buf = io.BytesIO()
+    pd.DataFrame(cols).to_excel(buf, index=False, engine="xlsxwriter")
+    return buf.getvalue()
+
+
+def make_image_zip(path, n_images, rng):
+    """ZIP of frame PNGs; returns {entry name: frame color}."""
+    expected = {}
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as zf:
+        for i in range(n_images):
+            frame = rng.choice(FRAME_COLORS)
+            lens = rng.choice(["Grey", "Brown", "Green", "Blue"])
+            name = f"product_{i}.png"
+            zf.writestr(name, frame_image(colors.COLOR_MAP[frame], colors.COLOR_MAP[lens], rng))
+            expected[name] = frame
+    return expected
+
+
+# ==========================================
+# ⏱️ TIMING
+# ==========================================
+def measure(fn, repeat, setup=None):
+    """(seconds per run, last result); setup() runs untimed before each run and its result is passed to fn."""
+    runs, result = [], None
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        t0 = time.perf_counter()
+        result = fn(arg) if setup else fn()
+        runs.append(time.perf_counter() - t0)
+    return runs, result
+
+
+def record(results, scale, bench, items, runs, stages, **output):
+    best = min(runs)
+    row = {"scale": scale, "bench": bench, "items": items,
+           "seconds_min": round(best, 4), "seconds_median": round(statistics.median(runs), 4),
+           "items_per_s": round(items / best, 1) if items and best else None,
+           "runs": [round(r, 4) for r in runs], "output": output}
+    if stages: row["stages"] = perf.summary()
+    results.append(row)
+    print(f"{scale:>7} {bench:<24} {items:>8} {best:>9.3f} {row['items_per_s'] or 0:>12,.0f}  {output}")
+
+
+def run_scale(scale, sizes, args, work):
+    rng = random.Random(args.seed)
+    folder = os.path.join(work, scale)
+    os.makedirs(folder, exist_ok=True)
+    t0 = time.perf_counter()
+    make_master(folder, sizes["master_rows"], rng)
+    master_names = make_name_master(folder, sizes["names"], rng)
+    user_bytes = make_user_sheet(sizes["user_rows"], master_names, args.error_rate, rng)
+    zip_path = os.path.join(work, f"{scale}_images.zip")
+    expected = make_image_zip(zip_path, sizes["images"], rng)
+    print(f"{scale:>7} data generated in {time.perf_counter() - t0:.1f} s")
+
+    results, n = [], 0
+
+    def bench(name, fn, items, setup=None, output=None):
+        if args.stages: perf.RECORDER.reset()
+        runs, result = measure(fn, args.repeat, setup)
+        record(results, scale, name, items, runs, args.stages, **(output(result) if output else {}))
+        return result
+
+    def fresh_cache():
+        nonlocal n
+        n += 1
+        return DiskCache(root=os.path.join(work, "cache", f"{scale}-{n}"))
+
+    master_df = bench("load_master.cold", lambda c: masters.load_master(folder, cache=c), sizes["master_rows"],
+                      setup=fresh_cache, output=lambda df: {"rows": len(df), "columns": len(df.columns)})
+    warm = fresh_cache()
+    masters.load_master(folder, cache=warm)
+    bench("load_master.warm", lambda: masters.load_master(folder, cache=warm), sizes["master_rows"])
+    bench("load_name_master", lambda c: masters.load_name_master(folder, cache=c), sizes["names"],
+          setup=fresh_cache, output=lambda lst: {"names": len(lst or [])})
+
+    user_df = bench("clean_user_file", lambda: clean_user_file(io.BytesIO(user_bytes)), sizes["user_rows"],
+                    output=lambda df: {"rows": len(df), "reader": df.attrs["load"]["reader"]})
+    cells = sizes["user_rows"] * len(masters.IDEAL_PAIRS)
+
+    index = bench("tab1.index_build", lambda: MasterIndex.from_frame(master_df), sizes["master_rows"])
+    bench("tab1.validate", lambda: index.find_mistakes(user_df), cells,
+          output=lambda found: {"findings": len(found), **found["Error"].value_counts().to_dict()})
+
+    name_index = bench("tab3.index_build", lambda: names.NameIndex.from_list(master_names), sizes["names"])
+    user_names = user_df["Glasses name"]
+    # A fresh index per run: NearDuplicateIndex memoizes queries
+    bench("tab3.analyze", lambda idx: names.analyze_names(user_names, idx), len(user_names),
+          setup=lambda: names.NameIndex.from_list(master_names),
+          output=lambda rep: {"reports": len(rep), **pd.Series([r["Issue"] for r in rep], dtype=object).value_counts().to_dict()})
+    del name_index
+
+    def dominant_colors():
+        with ImageZip(zip_path) as zf:
+            return {name: colors.extract_dominant_colors(data) for name, data in zf.iter_images()}
+    bench("extract_dominant_colors", dominant_colors, sizes["images"],
+          output=lambda det: {"method": colors.QUANTIZER,
+                              "frame_found": round(float(np.mean([bool(colors.colors_match(expected[k], v)) for k, v in det.items()])), 3)})
+    return results
+
+
+# ==========================================
+# 📊 REPORT
+# ==========================================
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(args):
+    return {
+        "commit": git_commit(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(), "pandas": pd.__version__, "numpy": np.__version__,
+        "platform": platform.platform(), "cpus": os.cpu_count(),
+        "quantizer": colors.QUANTIZER, "master_mode": masters.MASTER_MODE,
+        "seed": args.seed, "repeat": args.repeat, "error_rate": args.error_rate,
+        "scales": {s: SCALES[s] for s in args.scales},
+    }
+
+
+def compare(results, baseline_path):
+    """Print seconds_min of the baseline vs. this run, per (scale, bench)."""
+    with open(baseline_path) as f: baseline = json.load(f)
+    old = {(r["scale"], r["bench"]): r for r in baseline["results"]}
+    print(f"\nvs. {baseline_path} (commit {baseline['meta'].get('commit')})")
+    print(f"{'scale':>7} {'bench':<24} {'old s':>9} {'new s':>9} {'change':>8}")
+    for r in results:
+        o = old.get((r["scale"], r["bench"]))
+        if o is None: continue
+        change = r["seconds_min"] / o["seconds_min"] - 1 if o["seconds_min"] else 0.0
+        flag = "  <-- slower" if change > 0.10 else ""
+        print(f"{r['scale']:>7} {r['bench']:<24} {o['seconds_min']:>9.3f} {r['seconds_min']:>9.3f} {change:>+8.0%}{flag}")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark every validator on synthetic data.")
+    p.add_argument("--scales", default="small,medium", help=f"comma-separated, from {', '.join(SCALES)}")
+    p.add_argument("--repeat", type=int, default=3, help="runs per benchmark (min and median are reported)")
+    p.add_argument("--error-rate", type=float, default=0.05, help="share of user cells carrying a mistake")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--stages", action="store_true", help="also record validator.perf stage totals per benchmark")
+    p.add_argument("--out", default="bench_results.json")
+    p.add_argument("--compare", metavar="BASELINE_JSON")
+    args = p.parse_args(argv)
+    args.scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in args.scales if s not in SCALES]
+    if unknown: p.error(f"unknown scale(s): {', '.join(unknown)}")
+    perf.enable(args.stages)
+
+    results = []
+    print(f"{'scale':>7} {'bench':<24} {'items':>8} {'min s':>9} {'items/s':>12}  output")
+    with tempfile.TemporaryDirectory() as work:
+        for scale in args.scales:
+            results += run_scale(scale, SCALES[scale], args, work)
+
+    with open(args.out, 'w') as f:
+        json.dump({"meta": metadata(args), "results": results}, f, indent=1, default=str)
+    print(f"\nWrote {args.out}")
+    if args.compare: compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+User file benchmark: the original clean_user_file (read_excel, on any error
+read_csv with the python-engine sniffer) vs. the sniffing loader in
+validator.userfile. Both must give the same frame.
+
+    python benchmarks/bench_userfile.py              # 10k and 100k rows
+    python benchmarks/bench_userfile.py 5000
+"""
+import io
+import os
+import sys
+import time
+import random
+import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from validator.userfile import clean_user_file  # noqa: E402
+
+N_COLS = 40
+CELLS = ["value 1", "value 2|value 3", " padded ", "Čierna", "NA", None, None, 3, 4.5, 12.0, True,
+         datetime.datetime(2024, 5, 1, 12, 30)]
+
+
+def legacy_clean_user_file(file):
+    """The original loader from app.py, kept here as the reference."""
+    try: df = pd.read_excel(file, dtype=str, header=0)
+    except: file.seek(0); df = pd.read_csv(file, dtype=str, sep=None, engine='python', header=0)
+    df.columns = df.columns.astype(str).str.replace(r'\s+', ' ', regex=True).str.strip()
+    return df
+
+
+def make_frame(n_rows, seed=5):
+    rng = random.Random(seed)
+    cols = {f"Col {c}  ID" if c % 7 else f"Glasses type {c}": [rng.choice(CELLS) for _ in range(n_rows)] for c in range(N_COLS)}
+    df = pd.DataFrame(cols, dtype=object)
+    df.iloc[n_rows // 2] = None  # a blank row in the middle
+    return df
+
+
+def make_files(n_rows):
+    df = make_frame(n_rows)
+    xlsx = io.BytesIO()
+    df.to_excel(xlsx, index=False, engine="xlsxwriter")
+    csv_comma = df.to_csv(index=False).encode("utf-8")
+    csv_semicolon = df.to_csv(index=False, sep=";").encode("utf-8")
+    return {"xlsx": xlsx.getvalue(), "csv ,": csv_comma, "csv ;": csv_semicolon}
+
+
+def timed(loader, data):
+    t0 = time.perf_counter()
+    try:
+        df = loader(io.BytesIO(data))
+    except Exception as e:
+        return None, time.perf_counter() - t0, e
+    return df, time.perf_counter() - t0, None
+
+
+def main(sizes):
+    print(f"{'rows':>7} {'file':>6} {'legacy s':>9} {'sniffed s':>10} {'speed-up':>9}  same  reader")
+    for n in sizes:
+        for name, data in make_files(n).items():
+            old, t_old, err = timed(legacy_clean_user_file, data)
+            new, t_new, _ = timed(clean_user_file, data)
+            same = "err" if err else ("yes" if old.equals(new) and list(old.columns) == list(new.columns) else "NO")
+            print(f"{n:>7} {name:>6} {t_old:>9.2f} {t_new:>10.2f} {t_old / t_new:>8.1f}x  {same:>4}  {new.attrs['load']['reader']}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,82 @@
+"""
+Tab 1 benchmark: old iterrows() loop vs. the column-wise engine.
+
+    python benchmarks/bench_validation.py            # 1k, 10k, 100k rows
+    python benchmarks/bench_validation.py 5000 50000 # custom sizes
+"""
+import os
+import sys
+import time
+import random
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from validator.engine import validate_frame  # noqa: E402
+
+N_COLS = 30
+VOCAB = [f"value {i}" for i in range(40)]
+
+
+def legacy_validate(user_df, active_map, valid_values):
+    """The original per-row loop from app.py, kept here as the reference."""
+    mistakes = []
+    for idx, row in user_df.iterrows():
+        for m_col, u_col in active_map.items():
+            raw_val = str(row[u_col])
+            if raw_val.lower() in ['nan', '', 'none']: continue
+
+            ws_issues = []
+            if raw_val.startswith(" "): ws_issues.append("Leading Space")
+            if raw_val.endswith(" "): ws_issues.append("Trailing Space")
+            if "  " in raw_val: ws_issues.append("Double Spaces")
+            if "| " in raw_val or " |" in raw_val: ws_issues.append("Space around Separator")
+            for ws in ws_issues:
+                mistakes.append({"Row": idx+2, "Column": u_col, "Error": "Whitespace", "Value": ws, "Content": raw_val})
+
+            clean_val = raw_val.strip()
+            parts = [v.strip() for v in clean_val.split('|')]
+            for p in parts:
+                if p and p.lower() not in valid_values[m_col]:
+                    mistakes.append({"Row": idx+2, "Column": u_col, "Error": "Invalid Content", "Value": p, "Content": raw_val, "Allowed": list(valid_values[m_col])[:3]})
+    return mistakes
+
+
+def make_cell(rng):
+    r = rng.random()
+    if r < 0.10: return None
+    if r < 0.15: return " " + rng.choice(VOCAB)
+    if r < 0.20: return rng.choice(VOCAB) + " | " + rng.choice(VOCAB)
+    if r < 0.25: return "bogus " + str(rng.randint(0, 99))
+    if r < 0.40: return rng.choice(VOCAB) + "|" + rng.choice(VOCAB).upper()
+    return rng.choice(VOCAB)
+
+
+def make_data(n_rows, seed=42):
+    rng = random.Random(seed)
+    cols = {f"Col {c} ID": [make_cell(rng) for _ in range(n_rows)] for c in range(N_COLS)}
+    user_df = pd.DataFrame(cols, dtype=str)
+    active_map = {f"Master {c}": f"Col {c} ID" for c in range(N_COLS)}
+    valid_values = {m: {v.lower() for v in VOCAB} for m in active_map}
+    return user_df, active_map, valid_values
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'legacy s':>10} {'engine s':>10} {'speedup':>8} {'issues':>8}")
+    for n in sizes:
+        user_df, active_map, valid_values = make_data(n)
+
+        t0 = time.perf_counter()
+        new = validate_frame(user_df, active_map, valid_values)
+        t_new = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        old = legacy_validate(user_df, active_map, valid_values)
+        t_old = time.perf_counter() - t0
+
+        assert old == new, f"engine output differs from legacy loop at {n} rows"
+        print(f"{n:>8} {t_old:>10.3f} {t_new:>10.3f} {t_old / t_new:>7.1f}x {len(new):>8}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000])
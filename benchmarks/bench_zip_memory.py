@@ -0,0 +1,79 @@
+"""
+Tab 4 benchmark: peak RSS of ZIP ingestion, old in-memory path vs. streaming path.
+
+  legacy    - whole archive in memory (BytesIO), zf.read + extract per image
+  streaming - ImageZip (spooled/on-disk, lazy entries) + iter_dominant_colors(workers=1)
+
+Each mode runs in a fresh subprocess so ru_maxrss is its own peak.
+
+    python benchmarks/bench_zip_memory.py            # 40 images of 3000x2000
+    python benchmarks/bench_zip_memory.py 100 4000x3000
+"""
+import io
+import os
+import sys
+import time
+import zipfile
+import resource
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def make_zip(path, n, size):
+    import numpy as np
+    from PIL import Image
+    rng = np.random.default_rng(0)
+    w, h = size
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as zf:
+        for i in range(n):
+            # Noisy content so PNG/JPEG can't compress it away
+            arr = rng.integers(0, 255, (h // 8, w // 8, 4), dtype=np.uint8)
+            arr[..., 3] = np.where(arr[..., 3] > 60, 255, 0)
+            img = Image.fromarray(arr, "RGBA").resize((w, h), Image.NEAREST)
+            buf = io.BytesIO()
+            if i % 2: img.convert("RGB").save(buf, "JPEG", quality=90)
+            else: img.save(buf, "PNG", compress_level=1)
+            zf.writestr(f"product_{i}.{'jpg' if i % 2 else 'png'}", buf.getvalue())
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def run_mode(mode, zip_path):
+    from validator import colors
+    t0 = time.perf_counter()
+    base = peak_rss_mb()
+    if mode == "legacy":
+        with open(zip_path, 'rb') as f: upload = io.BytesIO(f.read())
+        with zipfile.ZipFile(upload, 'r') as zf:
+            for name in zf.namelist():
+                img_bytes = zf.read(name)
+                colors.extract_dominant_colors(img_bytes, method="palette")
+    else:
+        from validator.zipstream import ImageZip
+        with open(zip_path, 'rb') as upload, ImageZip(upload) as zf:
+            for _ in colors.iter_dominant_colors(zf.read, zf.image_names(), workers=1, method="palette"):
+                pass
+    print(f"{mode:>10} {time.perf_counter() - t0:>8.2f}s  peak RSS {peak_rss_mb():>7.0f} MB  (after imports {base:.0f} MB)")
+
+
+def main(n, size):
+    with tempfile.TemporaryDirectory() as tmp:
+        zip_path = os.path.join(tmp, "images.zip")
+        make_zip(zip_path, n, size)
+        print(f"{n} images of {size[0]}x{size[1]}, archive {os.path.getsize(zip_path) / 1024 / 1024:.0f} MB")
+        for mode in ("legacy", "streaming"):
+            subprocess.run([sys.executable, __file__, "--run", mode, zip_path], check=True)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--run"]:
+        run_mode(sys.argv[2], sys.argv[3])
+    else:
+        n = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+        size = tuple(int(v) for v in sys.argv[2].split("x")) if len(sys.argv) > 2 else (3000, 2000)
+        main(n, size)
@@ -0,0 +1,68 @@
+import os
+import time
+
+import streamlit as st
+import pandas as pd
+from validator import memory, precompute
+
+# ==========================================
+# 🛠️ ADMIN: SERVER MEMORY
+# Resident footprint of this server process: the shared master
+# builds (held once) and what every session keeps between runs.
+# Set VALIDATOR_ADMIN_PASSWORD to require a password.
+# ==========================================
+st.set_page_config(page_title="Validator Admin", layout="wide")
+st.title("🛠️ Server Memory")
+
+password = os.environ.get("VALIDATOR_ADMIN_PASSWORD")
+if password and st.text_input("Admin password", type="password") != password:
+    st.stop()
+
+def mb(n):
+    return round(n / 1024 / 1024, 2)
+
+worker = precompute.shared_worker()
+memory.SESSIONS.prune()
+sessions = memory.SESSIONS.sessions()
+shared = worker.footprint()
+rss = memory.process_rss()
+
+session_total = sum(sum(sizes.values()) for _, sizes, _, _ in sessions)
+shared_total = sum(shared.values())
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Process RSS", f"{mb(rss):,} MB" if rss else "n/a")
+c2.metric("Shared master data", f"{mb(shared_total):,} MB")
+c3.metric(f"Sessions ({len(sessions)})", f"{mb(session_total):,} MB")
+if rss: c4.metric("Interpreter, libraries, caches", f"{mb(max(rss - shared_total - session_total, 0)):,} MB", help="RSS minus the figures on the left (Python, pandas/NumPy, Streamlit, allocator slack).")
+
+# ---------- Shared builds ----------
+st.subheader("Shared builds")
+built = worker.built_at
+st.dataframe(pd.DataFrame([
+    {"Item": "Master index (Tab 1)", "Status": worker.status["master"], "MB": mb(shared["master"]),
+     "Built": time.strftime("%H:%M:%S", time.localtime(built["master"])) if "master" in built else ""},
+    {"Item": "Name index (Tab 3)", "Status": worker.status["names"], "MB": mb(shared["names"]),
+     "Built": time.strftime("%H:%M:%S", time.localtime(built["names"])) if "names" in built else ""},
+]), use_container_width=True, hide_index=True)
+holders = memory.SESSIONS.holders()
+current = holders.get(built.get("master"), 0)
+st.caption(f"🔗 {current} session(s) read the current master build; none of them holds a copy.")
+stale = sum(n for b, n in holders.items() if b != built.get("master"))
+if stale: st.caption(f"ℹ️ {stale} session(s) last ran against an older master build; it is freed once they rerun.")
+
+# ---------- Sessions ----------
+st.subheader("Sessions")
+if not sessions:
+    st.caption("No sessions yet.")
+else:
+    rows = []
+    for sid, sizes, seen, _ in sessions:
+        row = {"Session": sid, "Idle (s)": int(time.time() - seen), "Total MB": mb(sum(sizes.values()))}
+        top = sorted(sizes.items(), key=lambda kv: kv[1], reverse=True)
+        row["Largest items"] = ", ".join(f"{k} ({mb(v)} MB)" for k, v in top[:3] if v >= 1024)
+        rows.append(row)
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    st.caption(f"Sessions idle for more than {memory.SESSION_IDLE_SECONDS / 60:g} min are dropped from this table (`VALIDATOR_SESSION_IDLE_SECONDS`).")
+
+if st.button("🔄 Refresh"): st.rerun()
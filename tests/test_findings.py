@@ -0,0 +1,69 @@
+import io
+
+import pandas as pd
+import pytest
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from validator.findings import Findings
+from validator.index import MasterIndex
+
+
+def shared_user_column():
+    """Master index whose 'width ID' and 'lens width ID' pairs both land on the user's 'lens width ID'."""
+    master = pd.DataFrame({
+        "Glasses size: glasses width": ["glasses width 1", "glasses width 2"],
+        "Glasses size: lens width": ["lens width 1", "lens width 2"],
+    }, dtype=object)
+    user = pd.DataFrame({"Glasses name": ["A", "B"], "lens width ID": ["lens width 1", "bogus 3"]}, dtype=object)
+    return MasterIndex.from_frame(master), user
+
+
+def test_two_master_columns_on_one_user_column():
+    index, user = shared_user_column()
+    active_map = index.active_map(user.columns)
+    assert list(active_map.values()) == ["lens width ID", "lens width ID"]
+
+    findings = index.findings(user, active_map)
+    assert findings.columns == ["lens width ID"]
+    frame = findings.frame()
+    assert set(frame["Column"]) == {"lens width ID"}
+    # 'bogus 3' fails both master columns, 'lens width 1' only the glasses width one
+    assert sorted(frame["Value"]) == ["bogus 3", "bogus 3", "lens width 1"]
+    assert findings.counts()["Issues"].sum() == 3
+
+
+def test_each_master_column_keeps_its_allowed_sample():
+    index, user = shared_user_column()
+    active_map = index.active_map(user.columns)
+    findings = index.findings(user, active_map)
+    records = list(findings.records())
+    assert records == index.validate(user, active_map)
+    samples = {tuple(sorted(r["Allowed"])) for r in records}
+    assert samples == {("glasses width 1", "glasses width 2"), ("lens width 1", "lens width 2")}
+    # The same after a chunked job run and a filter
+    merged = Findings.concat([index.findings(user.iloc[:1], active_map), index.findings(user.iloc[1:], active_map)],
+                             list(active_map.values()))
+    assert list(merged.records()) == records
+    assert merged.select(errors=["Invalid Content"]).frame(allowed_text=True)["Allowed"].tolist() == [
+        r["Allowed"] and ", ".join(r["Allowed"]) for r in records]
+
+
+def test_concat_with_duplicated_columns():
+    index, user = shared_user_column()
+    active_map = index.active_map(user.columns)
+    parts = [index.findings(user.iloc[:1], active_map), index.findings(user.iloc[1:], active_map)]
+    merged = Findings.concat(parts, list(active_map.values()))
+    assert merged.frame().equals(index.findings(user, active_map).frame())
+    assert len(Findings.concat([], list(active_map.values())).columns) == 1
+
+
+@pytest.mark.parametrize("fmt", ["csv", "xlsx"])
+def test_deferred_download_is_accepted_by_streamlit(fmt):
+    index, user = shared_user_column()
+    findings = index.findings(user, index.active_map(user.columns))
+    deferred = lambda: findings.export(fmt)  # what Tab 1 hands to st.download_button
+    data, _ = convert_data_to_bytes_and_infer_mime(deferred(), RuntimeError("unsupported type"))
+    if fmt == "csv":
+        assert pd.read_csv(io.BytesIO(data)).shape == (3, 6)
+    else:
+        assert pd.read_excel(io.BytesIO(data), sheet_name="Mistakes").shape == (3, 6)
@@ -0,0 +1,32 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from validator import images
+
+
+def test_only_explicit_angle_suffix_is_stripped():
+    names = {"rb 3025", "model", "aviator"}
+    assert images.resolve_product("aviator (2)", names) == "aviator"
+    assert images.resolve_product("aviator(12)", names) == "aviator"
+    assert images.resolve_product("rb 3025-01", names) is None
+    assert images.resolve_product("model 12", names) is None
+    assert images.resolve_product("model/2", names) is None
+
+
+def test_numbered_files_stay_in_extra():
+    table = images.parse_path_table('C:\\img\\RB 3025-01.jpg\n"C:\\img\\RB 3025 (2).jpg"\n/img/Model 12.png\n/img/rb 3025.png')
+    missing, extra, counts = images.match_images({"rb 3025", "model"}, table)
+    assert missing == ["model"]
+    assert extra == ["model 12", "rb 3025-01"]
+    assert counts.set_index("Product").loc["rb 3025", "Files"] == "RB 3025 (2).jpg, rb 3025.png"
+
+
+def test_parse_memo_is_thread_safe():
+    texts = [f"/img/p{i}_{j}.jpg" for i in range(40) for j in range(3)]
+    with ThreadPoolExecutor(8) as ex:
+        tables = list(ex.map(images.parse_path_table, texts * 5))
+    assert len(images._PARSED) <= images.PARSE_MEMO_MAX
+    assert all(t["Key"].tolist() == [text[5:-4].replace("_", "/")] for t, text in zip(tables, texts * 5))
+    # the same text from many threads at once shares one stored frame
+    with ThreadPoolExecutor(8) as ex:
+        same = list(ex.map(images.parse_path_table, ["/img/shared.jpg"] * 32))
+    assert all(t is same[0] for t in same) and images.parse_path_table("/img/shared.jpg") is same[0]
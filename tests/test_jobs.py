@@ -0,0 +1,80 @@
+import io
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from PIL import Image
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from validator import colorcache, colors, jobs
+from validator.index import MasterIndex
+
+
+def png(rgb):
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 20), rgb).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def wait(store, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while store.get(job_id)["status"] in ("queued", "running") and time.time() < deadline: time.sleep(0.05)
+    return store.get(job_id)
+
+
+def test_colors_job_uses_one_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(colorcache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(jobs, "CHUNK_IMAGES", 3)
+    pools = []
+
+    def color_pool(workers=None):
+        # Threads instead of processes: same executor interface, no forkserver in the test
+        pools.append(ThreadPoolExecutor(2))
+        return pools[-1]
+    monkeypatch.setattr(colors, "color_pool", color_pool)
+
+    user = b"Glasses name,Frame Colour ID\n" + b"".join(f"p{i},Black\n".encode() for i in range(10))
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        for i in range(10): z.writestr(f"p{i}.png", png((10, 10, 10) if i % 2 else (250, 20, 20)))
+
+    store = jobs.JobStore(str(tmp_path))
+    runner = jobs.JobRunner(store, shared=None)
+    try:
+        job_id = runner.submit("colors", {"user.csv": user, "images.zip": buf.getvalue()},
+                               {"user_file": "user.csv", "workers": 2, "method": "palette", "regions": False})
+        job = wait(store, job_id)
+        assert job["status"] == "done", job["error"]
+        results, skipped = runner.result(job_id)
+        report = pd.read_csv(io.BytesIO(convert_data_to_bytes_and_infer_mime(runner.export(job_id), RuntimeError())[0]))
+    finally:
+        runner.stop()
+        store.close()
+
+    assert job["chunks"] == 4
+    assert len(pools) == 1 and pools[0]._shutdown
+    assert not skipped
+    assert sorted({r["Row"] for r in results}) == list(range(2, 12))  # Excel row numbers
+    assert len(report) == len(results)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "xlsx"])
+def test_data_job_download_is_accepted_by_streamlit(tmp_path, fmt):
+    index = MasterIndex.from_frame(pd.DataFrame({"Glasses shape": ["Round", "Square"]}, dtype=object))
+    user = b"Glasses name,Glasses shape ID\nA,Round\nB,Oval\nC, Square\n"
+    store = jobs.JobStore(str(tmp_path))
+    runner = jobs.JobRunner(store, shared=lambda item: index)
+    try:
+        job_id = runner.submit("data", {"user.csv": user}, {"user_file": "user.csv"})
+        job = wait(store, job_id)
+        assert job["status"] == "done", job["error"]
+        deferred = lambda: runner.export(job_id, fmt)  # what the job panel hands to st.download_button
+        data, _ = convert_data_to_bytes_and_infer_mime(deferred(), RuntimeError("unsupported type"))
+    finally:
+        runner.stop()
+        store.close()
+
+    report = pd.read_csv(io.BytesIO(data)) if fmt == "csv" else pd.read_excel(io.BytesIO(data), sheet_name="Mistakes")
+    assert sorted(zip(report["Row"], report["Error"])) == [(3, "Invalid Content"), (4, "Whitespace")]
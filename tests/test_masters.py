@@ -0,0 +1,99 @@
+import re
+import zipfile
+
+import pandas as pd
+import pytest
+
+from validator import masters
+from validator.cache import DiskCache
+
+# (encoding, separator, a character only that encoding writes as a single non-UTF-8 byte)
+DIALECTS = [("cp1252", ";", "€"), ("latin1", "\t", "ÿ")]
+
+
+def write_csv(path, rows, encoding, sep):
+    with open(path, "w", encoding=encoding, newline="") as f:
+        for row in rows: f.write(sep.join(row) + "\n")
+    return str(path)
+
+
+def master_rows(char, n=20, late=False):
+    """Glasses + Lenses rows; 'late' pushes every non-ASCII value past the sniffed sample."""
+    rows = [["Items type", "Manufacturer", "Glasses  frame color ", "Price", "Glasses size: bridge"]]
+    for i in range(n):
+        special = not late or i == n - 1
+        rows.append(["Glasses" if i % 3 else "Lenses", f"Maker {i % 4}", f"Noir {char}{i}" if special else f"Black {i}",
+                     f"{i}.50", str(14 + i % 6)])
+    if late: rows[1:-1] = rows[1:-1] * (3000 // (n - 1))
+    return rows
+
+
+def expected_master(path, encoding, sep):
+    df = pd.read_csv(path, dtype=str, encoding=encoding, sep=sep)
+    df.columns = [masters.clean_header(c) for c in df.columns]
+    return df[df["Items type"] == "Glasses"]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(str(tmp_path / "cache"))
+
+
+@pytest.mark.parametrize("late", [False, True])
+@pytest.mark.parametrize("encoding,sep,char", DIALECTS)
+def test_read_master_table_matches_read_csv(tmp_path, cache, encoding, sep, char, late):
+    path = write_csv(tmp_path / "master.csv", master_rows(char, late=late), encoding, sep)
+    got = masters.read_master_table(path, cache=cache)
+    pd.testing.assert_frame_equal(got, pd.read_csv(path, dtype=str, encoding=encoding, sep=sep))
+
+
+@pytest.mark.parametrize("late", [False, True])
+@pytest.mark.parametrize("encoding,sep,char", DIALECTS)
+def test_parse_master_compact_matches_read_csv(tmp_path, cache, encoding, sep, char, late):
+    path = write_csv(tmp_path / "master.csv", master_rows(char, late=late), encoding, sep)
+    got = masters.parse_master_compact(path, cache=cache)
+    expected = expected_master(path, encoding, sep).drop(columns=["Price"])
+    assert list(got.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(got.astype(object), expected.astype(object))
+    assert got.attrs["memory"]["columns_total"] == 5
+
+
+@pytest.mark.parametrize("encoding,sep,char", DIALECTS)
+def test_parse_master_matches_read_csv(tmp_path, cache, encoding, sep, char):
+    path = write_csv(tmp_path / "master.csv", master_rows(char), encoding, sep)
+    pd.testing.assert_frame_equal(masters.parse_master(path, cache=cache), expected_master(path, encoding, sep))
+
+
+@pytest.mark.parametrize("encoding,sep,char", DIALECTS)
+def test_parse_name_master_matches_read_csv(tmp_path, cache, encoding, sep, char):
+    rows = [["id", " name ", "name_private", "note"]]
+    for i in range(12):
+        rows.append([str(i), f"Modèle {char}{i % 5}", "Glasses frame" if i % 2 else "contact lens", f"n{i}"])
+    path = write_csv(tmp_path / "name_master.csv", rows, encoding, sep)
+
+    df = pd.read_csv(path, dtype=str, encoding=encoding, sep=sep)
+    expected = df[df["name_private"].str.contains("glasses", case=False)][" name "].unique().tolist()
+    assert masters.parse_name_master(path, cache=cache) == expected
+    assert all(char in n for n in expected)
+
+
+def stale_dimension_xlsx(path, rows):
+    """xlsx whose sheet claims to be A1:B1 (as some exporters leave it) but holds every row."""
+    import openpyxl
+    wb = openpyxl.Workbook()
+    for row in rows: wb.active.append(row)
+    wb.save(path)
+    with zipfile.ZipFile(path) as z: parts = {n: z.read(n) for n in z.namelist()}
+    sheet = parts["xl/worksheets/sheet1.xml"].decode()
+    parts["xl/worksheets/sheet1.xml"] = re.sub(r'<dimension ref="[^"]*"', '<dimension ref="A1:B1"', sheet).encode()
+    with zipfile.ZipFile(path, "w") as z:
+        for n, data in parts.items(): z.writestr(n, data)
+    return str(path)
+
+
+def test_parse_master_compact_ignores_stale_dimension(tmp_path, cache):
+    rows = [["Items type", "Manufacturer", "Glasses shape"]] + [["Glasses", f"Maker {i}", f"Shape {i}"] for i in range(5)]
+    path = stale_dimension_xlsx(tmp_path / "master.xlsx", rows)
+    df = masters.parse_master_compact(path, cache=cache)
+    assert df.shape == (5, 3)
+    assert df["Glasses shape"].astype(object).tolist() == [f"Shape {i}" for i in range(5)]
@@ -0,0 +1,31 @@
+import os
+import time
+
+from validator import precompute
+from validator.cache import DiskCache
+
+
+def wait_for(check, timeout=30):
+    deadline = time.time() + timeout
+    while not check() and time.time() < deadline: time.sleep(0.05)
+    return check()
+
+
+def test_failed_rebuild_reports_the_build_still_in_use(tmp_path):
+    folder = str(tmp_path / "masters")
+    os.makedirs(folder)
+    with open(os.path.join(folder, "master.csv"), "w") as f: f.write("Items type,Glasses shape\nGlasses,Round\nGlasses,Square\n")
+    worker = precompute.start_worker(folder, interval=0.05, cache=DiskCache(str(tmp_path / "cache")))
+    try:
+        assert worker.wait("master", 30) == "ready"
+        assert worker.stale_since("master") is None
+        first, built = worker.master_index, worker.built_at["master"]
+
+        # A changed master that can't be used: the old build keeps serving, flagged as stale
+        with open(os.path.join(folder, "master.csv"), "w") as f: f.write("Glasses shape\nRound\nOval\nSquare\n")
+        assert wait_for(lambda: worker.status["master"] == "error")
+        assert worker.master_index is first
+        assert worker.stale_since("master") == built
+        assert "Items type" in worker.errors["master"]
+    finally:
+        worker.stop()
@@ -0,0 +1,42 @@
+import os
+
+import pandas as pd
+
+from validator import rules
+
+SPEC = {"rules": [
+    {"name": "frame width", "check": {"column": "width ID", "between": [100, 170]}},
+    {"name": "fits", "check": {"compare": {"left": {"sum": {"lens width ID": 2, "bridge ID": 1}}, "op": "<=",
+                                           "right": {"column": "width ID", "plus": 5}}}},
+    {"name": "lens width", "check": {"column": "lens width ID", "between": [30, 75]}},
+]}
+
+
+def test_resolve_is_exact():
+    assert rules.RuleSet.resolve(["lens width ID", "bridge ID"], ["width ID", "lens width ID"]) == {"lens width ID": "lens width ID"}
+    assert rules.RuleSet.resolve([" width ID", "lens width ID"], ["width ID"]) == {"width ID": " width ID"}
+
+
+def test_rule_with_missing_column_is_skipped():
+    user = pd.DataFrame({"lens width ID": ["52", "80"], "bridge ID": ["18", "18"]}, dtype=object)
+    blocks, stats = rules.RuleSet.from_spec(SPEC).check(user)
+    by_rule = {s["Rule"]: s for s in stats}
+    assert by_rule["frame width"]["Skipped"] == "missing width ID"
+    assert by_rule["fits"]["Skipped"] == "missing width ID"
+    assert by_rule["lens width"]["Violations"] == 1
+    assert [b["Value"][0] for b in blocks] == ["lens width"]
+
+
+def test_violations_are_positional_and_three_valued():
+    user = pd.DataFrame({"width ID": ["130", "100", "", "150"], "lens width ID": ["52", "50", "50", "x"],
+                         "bridge ID": ["18", "9", "18", "18"]}, dtype=object, index=[10, 11, 12, 13])
+    blocks, _ = rules.RuleSet.from_spec(SPEC).check(user)
+    fits = next(b for b in blocks if b["Value"][0] == "fits")
+    assert fits["_pos"].tolist() == [1]  # 2*50 + 9 > 100 + 5; empty / non-numeric cells never fire
+    assert fits["Content"][0] == "lens width ID=50; bridge ID=9; width ID=100"
+
+
+def test_default_rule_file_is_next_to_the_app():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if os.environ.get("VALIDATOR_RULES"): return
+    assert rules.RULES_FILE == os.path.join(root, "validation_rules.json")
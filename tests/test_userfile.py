@@ -0,0 +1,31 @@
+import io
+
+import pandas as pd
+import pytest
+
+from validator import userfile
+from validator.formats import SNIFF_BYTES
+
+
+def late_cp1252_csv():
+    """';' CSV that is pure ASCII for the whole sniffed sample, then has a cp1252 '€'."""
+    rows = ["Glasses name;Price"] + [f"model {i};{i}" for i in range(SNIFF_BYTES // 10)] + ["Modèle €;99"]
+    return ("\n".join(rows) + "\n").encode("cp1252")
+
+
+@pytest.mark.parametrize("as_path", [False, True])
+def test_csv_with_late_non_utf8_byte_falls_back(tmp_path, as_path):
+    data = late_cp1252_csv()
+    assert len(data) > SNIFF_BYTES
+    file = io.BytesIO(data)
+    if as_path:
+        file = str(tmp_path / "user.csv")
+        with open(file, "wb") as f: f.write(data)
+    df = userfile.clean_user_file(file)
+    pd.testing.assert_frame_equal(df, pd.read_csv(io.BytesIO(data), dtype=str, sep=";", encoding="cp1252"))
+    assert df.attrs["load"]["reader"] == "csv (cp1252, ';')"
+
+
+def test_malformed_csv_row_is_reported():
+    with pytest.raises(pd.errors.ParserError):
+        userfile.read_user_file(io.BytesIO(b"a,b\n1,2\n3,4,5\n"))
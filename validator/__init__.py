@@ -0,0 +1 @@
+"""Streamlit-free core of the Glasses Import Validator."""
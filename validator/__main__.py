@@ -0,0 +1,5 @@
+import sys
+
+from validator.batch import main
+
+sys.exit(main())
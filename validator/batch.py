@@ -0,0 +1,246 @@
+import os
+import sys
+import json
+import argparse
+
+import pandas as pd
+
+from validator import colorcheck, images, masters, names, perf, phash, rules
+from validator.colorcache import ColorCache
+from validator.colors import QUANTIZER, QUANTIZERS
+from validator.index import load_master_index
+from validator.userfile import clean_user_file
+from validator.zipstream import ImageZip
+
+# ==========================================
+# 🤖 HEADLESS BATCH MODE
+#   python -m validator import.xlsx --zip images.zip --report report.json
+#   python -m validator incoming/ --report report.xlsx
+# Exit code: 0 = clean, 1 = issues found, 2 = could not run.
+# ==========================================
+
+CHECKS = ("data", "images", "names", "colors", "duplicates")
+REPORT_COLUMNS = ["File", "Check", "Row", "Column", "Issue", "Value", "Details"]
+USER_EXTENSIONS = ('.xlsx', '.csv')
+
+
+class Masters:
+    """Master data loaded once and reused for every user file."""
+
+    def __init__(self, folder='.', rules_path=None):
+        self.index = load_master_index(folder)
+        self.name_index = names.load_name_index(folder)
+        self.rules = rules.load_rules(rules_path)
+        if rules_path and self.rules is None: raise rules.RuleError(f"Rule file '{rules_path}' not found.")
+
+
+def user_files(paths):
+    """Expand directories to the user files inside them."""
+    out = []
+    for path in paths:
+        if os.path.isdir(path):
+            out += sorted(os.path.join(path, f) for f in os.listdir(path)
+                          if f.endswith(USER_EXTENSIONS) and not f.startswith('~$') and "mistakes" not in f)
+        else:
+            out.append(path)
+    return out
+
+
+def sibling(path, ext):
+    """'<stem><ext>' next to a user file, if it exists."""
+    candidate = os.path.splitext(path)[0] + ext
+    return candidate if os.path.exists(candidate) else None
+
+
+def image_paths_text(args, user_path):
+    """Tab 2 input: --paths file, --image-dir listing or a sibling '<stem>.txt'."""
+    if args.image_dir:
+        return "\n".join(os.listdir(args.image_dir))
+    source = args.paths or sibling(user_path, '.txt')
+    if not source: return None
+    with open(source, encoding='utf-8-sig', errors='replace') as f: return f.read()
+
+
+# ---------- The four checks; each returns flat report rows ----------
+def check_data(user_df, m):
+    mistakes = m.index.findings(user_df, rules=m.rules).records()
+    return [{"Check": "data", "Row": r["Row"], "Column": r["Column"], "Issue": r["Error"], "Value": r["Value"],
+             "Details": r["Content"] if "Allowed" not in r else f"{r['Content']} (allowed e.g. {', '.join(r['Allowed'])})"}
+            for r in mistakes]
+
+
+def check_images(user_df, text, min_images=images.MIN_IMAGES):
+    col = images.find_name_column(user_df)
+    miss, extra, counts = images.match_images(images.excel_names(user_df, col), images.parse_path_table(text))
+    return ([{"Check": "images", "Column": col, "Issue": "Missing image", "Value": n} for n in miss] +
+            [{"Check": "images", "Column": col, "Issue": "Extra image", "Value": n} for n in extra] +
+            [{"Check": "images", "Column": col, "Issue": "Few images", "Value": r.Product, "Details": f"{r.Images} of {min_images}: {r.Files}"}
+             for r in images.few_images(counts, min_images).itertuples()])
+
+
+def check_names(user_df, m, name_column=None):
+    col = name_column or user_df.columns[names.default_name_column(user_df)]
+    report = names.analyze_names(user_df[col], m.name_index)
+    return [{"Check": "names", "Row": r["Row"], "Column": col, "Issue": r["Issue"], "Value": r["Name"], "Details": r["Details"]}
+            for r in report]
+
+
+def check_colors(user_df, zip_path, args):
+    color_col_map = colorcheck.color_columns(user_df)
+    if not color_col_map: return []
+    regions = not args.whole_image
+    with ImageZip(zip_path) as zf, ColorCache(method=args.quantizer, regions=regions) as cache:
+        results, skipped = colorcheck.run_color_check(
+            user_df, zf, color_col_map, colorcheck.color_name_column(user_df),
+            workers=args.workers, method=args.quantizer, cache=cache, regions=regions)
+    rows = [{"Check": "colors", "Row": r["Row"], "Column": r["Field"], "Issue": r["Status"], "Value": r["Expected"],
+             "Details": f"{r['Product']} ({r.get('Region', 'all')}): {r['Detected']}"} for r in results]
+    rows += [{"Check": "colors", "Issue": "Skipped image", "Value": s["Image"], "Details": s["Reason"]} for s in skipped]
+    return rows
+
+
+def check_duplicates(user_df, zip_path, args):
+    products = set(colorcheck.product_rows(user_df, colorcheck.color_name_column(user_df)))
+    with ImageZip(zip_path) as zf, phash.HashCache() as cache:
+        found, skipped = phash.find_duplicate_images(zf, products, workers=args.workers, cache=cache)
+    rows = [{"Check": "duplicates", "Issue": "Same image, other product", "Value": r["Image"],
+             "Details": f"{r['Product']} (group {r['Group']}, {r['Distance']} bits): also under {r['Also under']}"} for r in found]
+    rows += [{"Check": "duplicates", "Issue": "Skipped image", "Value": s["Image"], "Details": s["Reason"]} for s in skipped]
+    return rows
+
+
+def is_failure(row):
+    """Report rows that fail the run (matches and skipped images are informational)."""
+    if row["Issue"] == "Skipped image": return False
+    if row["Check"] != "colors": return True
+    return row["Issue"] == "❌ MISMATCH"
+
+
+def run_file(path, m, args):
+    """All requested checks for one user file -> (summary, report rows)."""
+    with open(path, 'rb') as f: user_df = clean_user_file(f)
+    summary = {"file": path, "rows": len(user_df), "checks": {}}
+    rows = []
+
+    def record(check, found):
+        fails = sum(is_failure(r) for r in found)
+        summary["checks"][check] = {"status": "fail" if fails else "pass", "issues": fails}
+        rows.extend(found)
+
+    def skip(check, reason):
+        summary["checks"][check] = {"status": "not run", "reason": reason}
+
+    if "data" in args.checks: record("data", check_data(user_df, m))
+    if "images" in args.checks:
+        text = image_paths_text(args, path)
+        if text is None: skip("images", "no --paths/--image-dir and no '<stem>.txt' next to the file")
+        else: record("images", check_images(user_df, text, args.min_images))
+    if "names" in args.checks:
+        if not m.name_index: skip("names", "name master not found")
+        else: record("names", check_names(user_df, m, args.name_column))
+    if "colors" in args.checks:
+        zip_path = args.zip or sibling(path, '.zip')
+        if zip_path is None: skip("colors", "no --zip and no '<stem>.zip' next to the file")
+        else: record("colors", check_colors(user_df, zip_path, args))
+    if "duplicates" in args.checks:
+        zip_path = args.zip or sibling(path, '.zip')
+        if zip_path is None: skip("duplicates", "no --zip and no '<stem>.zip' next to the file")
+        else: record("duplicates", check_duplicates(user_df, zip_path, args))
+
+    for r in rows: r["File"] = path
+    return summary, rows
+
+
+# ---------- Reports ----------
+def write_report(target, summaries, rows):
+    findings = pd.DataFrame(rows, columns=REPORT_COLUMNS)
+    findings["Row"] = findings["Row"].astype("Int64")
+    ext = os.path.splitext(target)[1].lower()
+    if ext == '.json':
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump({"files": summaries, "findings": findings.astype(object).where(findings.notna(), None).to_dict("records")},
+                      f, ensure_ascii=False, indent=2, default=str)
+    elif ext == '.csv':
+        findings.to_csv(target, index=False)
+    elif ext == '.xlsx':
+        summary_rows = [{"File": s["file"], "Rows": s["rows"], "Check": c, **info}
+                        for s in summaries for c, info in s["checks"].items()]
+        with pd.ExcelWriter(target, engine='xlsxwriter') as xw:
+            pd.DataFrame(summary_rows).to_excel(xw, sheet_name="Summary", index=False)
+            for check in CHECKS:
+                part = findings[findings["Check"] == check]
+                if len(part): part.to_excel(xw, sheet_name=check, index=False)
+    else:
+        raise ValueError(f"Unsupported report format '{ext}' (use .json, .csv or .xlsx).")
+
+
+def parse_args(argv):
+    p = argparse.ArgumentParser(prog="python -m validator", description="Run the Glasses Import Validator checks without Streamlit.")
+    p.add_argument("inputs", nargs="+", help="User files (.xlsx/.csv) or directories of them")
+    p.add_argument("--masters", default=".", help="Folder with the master files (default: current folder)")
+    p.add_argument("--checks", default=",".join(CHECKS), help=f"Comma-separated subset of {', '.join(CHECKS)}")
+    p.add_argument("--paths", help="Tab 2: text file of image paths (default: '<stem>.txt' next to each user file)")
+    p.add_argument("--image-dir", help="Tab 2: use the file names in this folder as the image list")
+    p.add_argument("--min-images", type=int, default=images.MIN_IMAGES, help="Tab 2: report products with fewer images than this")
+    p.add_argument("--zip", help="Tab 4: ZIP of product images (default: '<stem>.zip' next to each user file)")
+    p.add_argument("--rules", help=f"Tab 1: cross-column rule file, JSON or YAML (default: {rules.RULES_FILE}, skipped if missing)")
+    p.add_argument("--name-column", help="Tab 3: user column with product names (default: 'Glasses name')")
+    p.add_argument("--workers", type=int, default=None, help="Tab 4: worker processes (color check and image hashing)")
+    p.add_argument("--quantizer", default=QUANTIZER, choices=list(QUANTIZERS), help="Tab 4: color quantizer")
+    p.add_argument("--whole-image", action="store_true", help="Tab 4: check every color field against the whole image, not its region")
+    p.add_argument("--report", help="Write the combined report (.json, .csv or .xlsx)")
+    p.add_argument("--trace", help="Record stage timings and write them as a JSON trace (chrome://tracing)")
+    p.add_argument("--profile", help="Write a cProfile .prof file of the whole run")
+    args = p.parse_args(argv)
+    args.checks = [c.strip() for c in args.checks.split(",") if c.strip()]
+    unknown = set(args.checks) - set(CHECKS)
+    if unknown: p.error(f"unknown checks: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.trace: perf.enable()
+    profiler = perf.start_profile() if args.profile else None
+    try:
+        return run(args)
+    finally:
+        if args.trace: print(f"Trace written to {perf.dump_trace(args.trace)}")
+        if profiler:
+            perf.save_profile(profiler, args.profile)
+            print(f"Profile written to {args.profile}")
+
+
+def run(args):
+    try:
+        m = Masters(args.masters, args.rules)
+    except (masters.MasterLoadError, rules.RuleError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    files = user_files(args.inputs)
+    if not files:
+        print("❌ No user files found.", file=sys.stderr)
+        return 2
+
+    summaries, rows, errors = [], [], 0
+    for path in files:
+        try:
+            summary, found = run_file(path, m, args)
+        except Exception as e:
+            errors += 1
+            summaries.append({"file": path, "error": str(e), "checks": {}})
+            print(f"❌ {path}: {e}", file=sys.stderr)
+            continue
+        summaries.append(summary)
+        rows += found
+        status = ", ".join(f"{c}: {i['status']}" + (f" ({i['issues']})" if i.get('issues') else "") for c, i in summary["checks"].items())
+        print(f"{path} [{summary['rows']} rows] {status}")
+
+    if args.report:
+        write_report(args.report, summaries, rows)
+        print(f"Report written to {args.report}")
+
+    if errors: return 2
+    failed = any(i["status"] == "fail" for s in summaries for i in s["checks"].values())
+    return 1 if failed else 0
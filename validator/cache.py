@@ -0,0 +1,161 @@
+import os
+import io
+import json
+import pickle
+import hashlib
+
+import pandas as pd
+
+from validator import perf
+
+# ==========================================
+# 💾 PERSISTENT DISK CACHE
+# Survives restarts/redeploys (st.cache_data does not).
+# Entries are keyed on file content, so a redeploy that only
+# touches mtimes still hits; stale entries are evicted LRU.
+# ==========================================
+
+CACHE_DIR = os.environ.get("VALIDATOR_CACHE_DIR", ".validator_cache")
+CACHE_MAX_MB = float(os.environ.get("VALIDATOR_CACHE_MB", "512"))
+
+_HASH_INDEX = "hashes.json"
+
+
+def _content_hash(path, chunk=1 << 20):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class DiskCache:
+    """
+    Small file-per-entry cache.
+    DataFrames are stored as Parquet (pickle if pyarrow can't take them), anything else pickled.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=int(CACHE_MAX_MB * 1024 * 1024)):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+    # ---------- Keys ----------
+    def fingerprint(self, path):
+        """
+        Key for a source file: path + mtime + size + content hash.
+        The hash is only recomputed when path/mtime/size change.
+        """
+        st = os.stat(path)
+        stat_key = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+        index_path = os.path.join(self.root, _HASH_INDEX)
+        try:
+            with open(index_path) as f: index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+
+        digest = index.get(stat_key)
+        if digest is None:
+            digest = _content_hash(path)
+            # Drop hashes remembered for older versions of this same file
+            prefix = os.path.abspath(path) + "|"
+            index = {k: v for k, v in index.items() if not k.startswith(prefix)}
+            index[stat_key] = digest
+            tmp = index_path + ".tmp"
+            with open(tmp, 'w') as f: json.dump(index, f)
+            os.replace(tmp, index_path)
+        return f"{os.path.basename(path)}-{st.st_size}-{digest}"
+
+    def _entry(self, key):
+        safe = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return os.path.join(self.root, safe)
+
+    # ---------- Read / Write ----------
+    def get(self, key):
+        """Cached object for key, or None."""
+        base = self._entry(key)
+        for ext in ('.parquet', '.pkl'):
+            path = base + ext
+            if not os.path.exists(path): continue
+            try:
+                if ext == '.parquet': obj = pd.read_parquet(path)
+                else:
+                    with open(path, 'rb') as f: obj = pickle.load(f)
+            except Exception:
+                # Corrupt/partial entry: forget it and rebuild
+                self._remove(path)
+                return None
+            os.utime(path)  # mark as recently used
+            return obj
+        return None
+
+    def put(self, key, obj):
+        base = self._entry(key)
+        data = None
+        ext = '.pkl'
+        if isinstance(obj, pd.DataFrame):
+            try:
+                buf = io.BytesIO()
+                obj.to_parquet(buf)
+                data, ext = buf.getvalue(), '.parquet'
+            except Exception:
+                data = None
+        if data is None:
+            data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+        tmp = base + ext + ".tmp"
+        with open(tmp, 'wb') as f: f.write(data)
+        os.replace(tmp, base + ext)
+        self.evict()
+
+    # ---------- Eviction ----------
+    def _entries(self):
+        out = []
+        for name in os.listdir(self.root):
+            if not name.endswith(('.parquet', '.pkl')): continue
+            path = os.path.join(self.root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            out.append((st.st_mtime, st.st_size, path))
+        return out
+
+    def _remove(self, path):
+        try: os.remove(path)
+        except OSError: pass
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes: break
+            self._remove(path)
+            total -= size
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+
+def cached_load(path, kind, loader, cache=None):
+    """
+    loader(path) through the disk cache.
+    'kind' names the loader + its version, so parsing changes invalidate old entries.
+    """
+    try:
+        cache = cache or DiskCache()
+        key = f"{kind}:{cache.fingerprint(path)}"
+    except OSError:
+        # Read-only filesystem etc.: just parse
+        return loader(path)
+
+    with perf.stage(f"cache.get.{kind}"):
+        obj = cache.get(key)
+    if obj is not None: return obj
+    with perf.stage(f"cache.build.{kind}"):
+        obj = loader(path)
+    if obj is not None:
+        try: cache.put(key, obj)
+        except OSError: pass
+    return obj
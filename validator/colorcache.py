@@ -0,0 +1,83 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+
+from validator.cache import CACHE_DIR
+from validator.colors import extraction_signature
+
+# ==========================================
+# 🗄️ DOMINANT-COLOR RESULT CACHE (Tab 4)
+# Content-addressed: same image bytes + same extraction
+# parameters = same result, so re-uploaded ZIPs skip KMeans.
+# ==========================================
+
+COLOR_CACHE_MB = float(os.environ.get("VALIDATOR_COLOR_CACHE_MB", "64"))
+
+
+class ColorCache:
+    """SQLite store of extract_dominant_colors (regions: extract_region_colors) results with LRU eviction and a size cap."""
+
+    def __init__(self, path=None, max_bytes=int(COLOR_CACHE_MB * 1024 * 1024), n_colors=5, method=None, regions=False):
+        path = path or os.path.join(CACHE_DIR, "colors.sqlite")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.max_bytes = max_bytes
+        self.signature = extraction_signature(n_colors, method, regions)
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        # Autocommit + WAL: several sessions can share the file without long write locks
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS colors (key TEXT PRIMARY KEY, result TEXT NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS colors_used ON colors(used)")
+
+    def key(self, image_bytes):
+        return hashlib.blake2b(image_bytes, digest_size=16).hexdigest() + "-" + self.signature
+
+    def get(self, key):
+        row = self.db.execute("SELECT result FROM colors WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.db.execute("UPDATE colors SET used = ? WHERE key = ?", (time.time(), key))
+        result = json.loads(row[0])
+        if isinstance(result, dict):
+            return {region: [(name, pct) for name, pct in found] for region, found in result.items()}
+        return [(name, pct) for name, pct in result]
+
+    def put(self, key, detected):
+        if isinstance(detected, dict):
+            payload = json.dumps({region: [[name, float(pct)] for name, pct in found] for region, found in detected.items()})
+        else:
+            payload = json.dumps([[name, float(pct)] for name, pct in detected])
+        self.db.execute("INSERT OR REPLACE INTO colors VALUES (?, ?, ?, ?)", (key, payload, len(payload) + len(key), time.time()))
+        self._writes += 1
+        if self._writes % 500 == 0: self.evict()
+
+    def size(self):
+        return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM colors").fetchone()[0]
+
+    def evict(self):
+        """Drop least recently used results until the store fits in max_bytes."""
+        excess = self.size() - self.max_bytes
+        if excess <= 0: return
+        cutoff, freed = None, 0
+        for used, size in self.db.execute("SELECT used, size FROM colors ORDER BY used"):
+            freed += size
+            cutoff = used
+            if freed >= excess: break
+        self.db.execute("DELETE FROM colors WHERE used <= ?", (cutoff,))
+
+    def close(self):
+        self.evict()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+from validator import colors, perf
+from validator.colors import REGION_KEYS, SKIP_COLORS
+from validator.engine import EMPTY_MARKERS, as_text
+
+# ==========================================
+# 🎨 COLOR CHECK (Tab 4)
+# Images in a ZIP vs. the color columns of the user file.
+# With regions, each field is checked against the colors of its
+# own region (frame / lens / temple, see colors.segment), falling
+# back to the whole image where that region wasn't found.
+# All expected colors of all images are matched in one array pass.
+# ==========================================
+
+COLOR_FIELDS = {
+    "Glasses frame color": "Frame Colour ID",
+    "Glasses lens color": "lens Colour ID",
+    "Glasses temple color": "Temple Colour ID",
+}
+
+FIELD_REGIONS = {
+    "Glasses frame color": "frame",
+    "Glasses lens color": "lens",
+    "Glasses temple color": "temple",
+}
+
+# Indexed by match result: 0 = mismatch, 1 = match, 2 = cannot verify
+STATUSES = np.array(["❌ MISMATCH", "✅ MATCH", "⏭️ SKIPPED"], dtype=object)
+
+
+def color_columns(user_df):
+    """Field label -> user column, for every COLOR_FIELDS column present."""
+    color_col_map = {}
+    for label, user_key in COLOR_FIELDS.items():
+        found = next((c for c in user_df.columns if user_key in c), None)
+        if found:
+            color_col_map[label] = found
+    return color_col_map
+
+
+def color_name_column(user_df):
+    return next((c for c in user_df.columns if "Glasses name" in c), user_df.columns[0])
+
+
+def product_rows(user_df, name_col):
+    """Lookup key (stripped, lower-cased name) -> row index label; a repeated name maps to its last row."""
+    text = as_text(user_df[name_col]).str.strip()
+    keep = ~text.str.lower().isin(EMPTY_MARKERS).to_numpy(dtype=bool)
+    return dict(zip(text[keep].str.lower(), user_df.index[keep]))
+
+
+def image_key(img_path):
+    """(file name, product name, lookup key): file name without extension, '_' -> '/'."""
+    fname = img_path.split('/')[-1]
+    product_name = fname.rsplit('.', 1)[0] if '.' in fname else fname
+    return fname, product_name, product_name.replace('_', '/').strip().lower()
+
+
+@perf.timed("tab4.run")
+def run_color_check(user_df, zf, color_col_map, name_col, workers=None, method=None, cache=None, progress=None, regions=True, image_files=None,
+                    executor=None):
+    """
+    Compare the dominant colors of every image in zf (an ImageZip) with its product row.
+    image_files: only these ZIP entries (default: every image in zf).
+    regions: check each field against its own region (FIELD_REGIONS) instead of the whole image;
+    the cache must be built with the same setting.
+    executor: a colors.color_pool() shared by several calls (e.g. one per job).
+    progress(i, total, product_name) is called once per image.
+    Returns (results, skipped): Row/Product/Field/[Region/]Expected/Detected/Status and Image/Reason records.
+    """
+    name_lookup = product_rows(user_df, name_col)
+
+    skipped = []
+    analysed = []  # (product name, row index, {region: detected colors})
+    if image_files is None: image_files = zf.image_names()
+
+    # Decode + clustering run in the worker pool; results stream back in order.
+    # Images seen before (same bytes) come straight from the color cache.
+    matched = [p for p in image_files if image_key(p)[2] in name_lookup]
+    analysis = colors.iter_dominant_colors(zf.read, matched, workers=workers, cache=cache, method=method, regions=regions,
+                                           executor=executor)
+
+    for i, img_path in enumerate(image_files):
+        fname, product_name, product_name_clean = image_key(img_path)
+
+        # Match to Excel row
+        if product_name_clean not in name_lookup:
+            skipped.append({"Image": fname, "Reason": "No matching product in Excel"})
+            if progress: progress(i, len(image_files), product_name)
+            continue
+
+        # Dominant colors (computed in the pool)
+        _, detected, error = next(analysis)
+        if progress: progress(i, len(image_files), product_name)
+        if error is not None:
+            skipped.append({"Image": fname, "Reason": f"Could not process: {error}"})
+            continue
+        analysed.append((product_name, name_lookup[product_name_clean], detected if regions else {"all": detected}))
+
+    return match_fields(user_df, analysed, color_col_map, regions), skipped
+
+
+@perf.timed("tab4.match")
+def match_fields(user_df, analysed, color_col_map, regions=True):
+    """
+    Every expected color of every analysed image vs. its detected colors, in one pass.
+    analysed: (product name, row index, {region: detected colors}) per image.
+    Records come out per image, then field, then pipe-separated value, like the old per-image loop.
+    """
+    if not analysed or not color_col_map: return []
+    products, rows, detected = zip(*analysed)
+    present = colors.stack_regions(detected)      # image x region x palette color
+    found = present.any(-1)                       # image x region
+    compatible = colors.compatible_matrix()       # expected x detected (last row: unknown names)
+
+    # One check per (image, field, pipe-separated value)
+    parts = []
+    for f, col_name in enumerate(color_col_map.values()):
+        text = pd.Series(as_text(user_df[col_name]).loc[list(rows)].to_numpy(), dtype=object).str.strip()
+        text = text[~text.str.lower().isin(EMPTY_MARKERS).to_numpy(dtype=bool)]
+        values = text.str.split('|').explode().str.strip()
+        parts.append((values.index.to_numpy(dtype=np.int64), np.full(len(values), f), values.to_numpy(dtype=object)))
+    img, field, expected = (np.concatenate(a) for a in zip(*parts))
+    if not len(img): return []
+    order = np.lexsort((field, img))  # stable: value order within a field is kept
+    img, field, expected = img[order], field[order], expected[order]
+
+    # Region per check: the field's own one if it was found in that image, else the whole image
+    field_region = np.array([REGION_KEYS.index(FIELD_REGIONS[label]) if regions and label in FIELD_REGIONS else 0
+                             for label in color_col_map])
+    region = field_region[field]
+    region = np.where(found[img, region], region, 0)
+
+    code = pd.Index(colors.PALETTE.labels).get_indexer(expected)  # -1 = unknown name -> last row
+    hit = (compatible[code] & present[img, region]).any(-1)
+    status = STATUSES[np.where(np.isin(expected, list(SKIP_COLORS)), 2, hit.astype(np.int8))]
+
+    summaries = {}
+    labels = list(color_col_map)
+    results = []
+    for i, f, r, exp, st in zip(img.tolist(), field.tolist(), region.tolist(), expected, status):
+        summary = summaries.get((i, r))
+        if summary is None:
+            summary = summaries[(i, r)] = ", ".join(f"{name} ({pct}%)" for name, pct in detected[i][REGION_KEYS[r]])
+        rec = {"Row": rows[i] + 2, "Product": products[i], "Field": labels[f]}
+        if regions: rec["Region"] = REGION_KEYS[r]
+        rec.update({"Expected": exp, "Detected": summary, "Status": st})
+        results.append(rec)
+    return results
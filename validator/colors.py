@@ -0,0 +1,532 @@
+import io
+import os
+import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+import numpy as np
+from PIL import Image
+
+from validator import perf
+
+# ==========================================
+# 🎨 COLOR DETECTION HELPERS (Tab 4)
+# ==========================================
+COLOR_MAP = {
+    "Black":       (0, 0, 0),
+    "White":       (255, 255, 255),
+    "Red":         (180, 30, 30),
+    "Blue":        (30, 60, 180),
+    "Brown":       (130, 80, 40),
+    "Havana":      (140, 90, 50),
+    "Gold":        (212, 175, 55),
+    "Silver":      (180, 180, 185),
+    "Ruthenium":   (140, 140, 145),
+    "Rose Gold":   (190, 130, 110),
+    "Green":       (40, 120, 50),
+    "Grey":        (128, 128, 128),
+    "Pink":        (220, 130, 150),
+    "Purple":      (100, 40, 140),
+    "Orange":      (220, 120, 30),
+    "Yellow":      (220, 200, 50),
+    "Ivory":       (240, 230, 210),
+    "Turquoise":   (50, 180, 175),
+    "Burgundy":    (130, 20, 40),
+}
+
+# Colors that are close enough to be considered compatible
+COLOR_ALIASES = {
+    "Havana": {"Brown", "Havana"},
+    "Brown": {"Brown", "Havana"},
+    "Silver": {"Silver", "Ruthenium", "Grey"},
+    "Ruthenium": {"Silver", "Ruthenium", "Grey"},
+    "Grey": {"Grey", "Silver", "Ruthenium"},
+}
+
+SKIP_COLORS = {"Transparent", "Multicolor", "Special"}
+
+# Extraction parameters (part of the color cache key)
+THUMB_SIZE = (150, 150)
+ALPHA_MIN = 10      # pixels with alpha below this are background
+WHITE_MIN = 240     # R, G and B all above this = background remnant
+DRAFT_GAP = 2       # JPEG draft decode to >= 2x the thumbnail (PIL's own reducing_gap default)
+
+# Largest decoded image (width * height * bands) a single decode may allocate
+MAX_DECODE_MB = float(os.environ.get("VALIDATOR_MAX_DECODE_MB", "256"))
+
+
+def extraction_signature(n_colors=5, method=None, regions=False):
+    """Everything besides the image bytes that changes extract_dominant_colors (or extract_region_colors) output."""
+    palette = ";".join(f"{k}={v}" for k, v in sorted(COLOR_MAP.items()))
+    palette_version = hashlib.blake2b(palette.encode(), digest_size=8).hexdigest()
+    sig = f"{method or QUANTIZER}-n{n_colors}-t{THUMB_SIZE[0]}x{THUMB_SIZE[1]}-a{ALPHA_MIN}-w{WHITE_MIN}-p{palette_version}"
+    if COLOR_DISTANCE != "rgb": sig += f"-d{COLOR_DISTANCE}"
+    if regions: sig += f"-r{LENS_ALPHA_MAX}.{HIGHLIGHT_MIN}.{TEMPLE_GAP}.{TEMPLE_BAND}.{MIN_REGION_PIXELS}"
+    return sig
+
+# ==========================================
+# 🎯 PALETTE CLASSIFIER
+# Nearest COLOR_MAP entry for whole arrays of RGB values at once.
+# ==========================================
+COLOR_DISTANCE = os.environ.get("VALIDATOR_COLOR_DISTANCE", "rgb")  # "rgb" (Euclidean) or "lab" (CIE76 ΔE)
+
+def rgb_to_lab(rgb):
+    """sRGB (..., 3) in 0-255 -> CIELAB (D65)."""
+    c = np.asarray(rgb, dtype=np.float64) / 255.0
+    c = np.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+    xyz = c @ np.array([[0.4124564, 0.2126729, 0.0193339],
+                        [0.3575761, 0.7151522, 0.1191920],
+                        [0.1804375, 0.0721750, 0.9503041]])
+    xyz = xyz / np.array([0.95047, 1.0, 1.08883])
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+class Palette:
+    """
+    COLOR_MAP as a matrix, with a batched nearest-neighbour classifier.
+    - nearest(rgb):   exact, any (..., 3) array -> palette indices (ties go to the earlier entry, like the old loop)
+    - lookup(rgb):    O(1) per pixel through a 32k-entry table (5 bits per channel), built on first use
+    - names(indices): indices -> color names
+    """
+
+    def __init__(self, color_map=COLOR_MAP, distance=COLOR_DISTANCE):
+        if distance not in ("rgb", "lab"):
+            raise ValueError(f"Unknown color distance '{distance}' (use 'rgb' or 'lab').")
+        self.distance = distance
+        self.labels = np.array(list(color_map), dtype=object)
+        self.rgb = np.array(list(color_map.values()), dtype=np.int64)
+        self.lab = rgb_to_lab(self.rgb)
+        self._lut = None
+
+    def nearest(self, rgb):
+        rgb = np.asarray(rgb)
+        flat = rgb.reshape(-1, 3)
+        if self.distance == "lab":
+            pts, ref = rgb_to_lab(flat), self.lab
+        else:
+            # float64 holds these integer distances exactly: same ties, same winner as the Python loop
+            pts, ref = flat.astype(np.float64), self.rgb.astype(np.float64)
+        ref_sq = (ref * ref).sum(1)
+        out = np.empty(len(flat), dtype=np.intp)
+        for start in range(0, len(flat), 65536):  # bounded (chunk, n_colors) distance matrix
+            chunk = pts[start:start + 65536]
+            # |p - c|^2 without the constant |p|^2 term
+            d = ref_sq[None, :] - 2 * (chunk @ ref.T)
+            out[start:start + 65536] = d.argmin(1)
+        return out.reshape(rgb.shape[:-1])
+
+    def lut(self):
+        """32768-entry table: index (r>>3)<<10 | (g>>3)<<5 | b>>3 -> palette index of that bin's centre."""
+        if self._lut is None:
+            levels = np.arange(32) * 8 + 4
+            grid = np.stack(np.meshgrid(levels, levels, levels, indexing="ij"), -1).reshape(-1, 3)
+            self._lut = self.nearest(grid).astype(np.uint8)
+        return self._lut
+
+    def lookup(self, rgb):
+        rgb = np.asarray(rgb, dtype=np.uint8)
+        r, g, b = (rgb[..., i].astype(np.intp) >> 3 for i in range(3))
+        return self.lut()[(r << 10) | (g << 5) | b]
+
+    def names(self, indices):
+        return self.labels[np.asarray(indices)]
+
+    def classify(self, rgb, fast=False):
+        """Color names for an (..., 3) RGB array. fast=True uses the lookup table."""
+        return self.names(self.lookup(rgb) if fast else self.nearest(rgb))
+
+PALETTE = Palette()
+
+def rgb_to_color_name(rgb):
+    """Map an RGB tuple to the nearest named color (Euclidean, or ΔE with VALIDATOR_COLOR_DISTANCE=lab)."""
+    return PALETTE.classify(np.asarray(rgb).reshape(1, 3))[0]
+
+def thumbnail_rgba(image_bytes):
+    """Decode + thumbnail to at most THUMB_SIZE. Returns an (H, W, 4) uint8 RGBA array."""
+    with perf.stage("color.decode", items=len(image_bytes)):
+        img = Image.open(io.BytesIO(image_bytes))  # header only, pixels not decoded yet
+
+        # JPEG: let the decoder scale down by 1/2..1/8 (same draft thumbnail() would request)
+        img.draft(None, (THUMB_SIZE[0] * DRAFT_GAP, THUMB_SIZE[1] * DRAFT_GAP))
+
+        # Refuse what would not fit the decode budget (huge PNGs can't be reduced before decoding)
+        decoded = img.size[0] * img.size[1] * max(len(img.getbands()), 1)
+        if decoded > MAX_DECODE_MB * 1024 * 1024:
+            raise ValueError(f"{img.size[0]}x{img.size[1]} image exceeds the {MAX_DECODE_MB:g} MB decode budget")
+        img.load()
+
+    with perf.stage("color.thumbnail"):
+        # Resize for speed (max 150px on longest side)
+        img.thumbnail(THUMB_SIZE)
+
+        # Convert to RGBA to handle transparency
+        img = img.convert("RGBA")
+        return np.array(img)
+
+def visible_mask(pixels):
+    """(H, W) mask of product pixels: not transparent (alpha >= ALPHA_MIN), not near-white (R, G, B > WHITE_MIN)."""
+    rgb = pixels[..., :3]
+    white = (rgb[..., 0] > WHITE_MIN) & (rgb[..., 1] > WHITE_MIN) & (rgb[..., 2] > WHITE_MIN)
+    return (pixels[..., 3] >= ALPHA_MIN) & ~white
+
+def opaque_pixels(image_bytes):
+    """
+    Decode, thumbnail and drop background: transparent and near-white pixels.
+    Returns an (N, 3) uint8 array of the remaining RGB pixels.
+    """
+    pixels = thumbnail_rgba(image_bytes)
+    return pixels[..., :3][visible_mask(pixels)]
+
+# ------------------------------------------
+# Quantization backends: (N, 3) pixels -> (cluster centers, pixel counts)
+# ------------------------------------------
+def _quantize_sklearn(rgb_only, k):
+    """Full sklearn KMeans, 5 restarts (the original behaviour)."""
+    from sklearn.cluster import KMeans  # heavy import, only when this backend is used
+    kmeans = KMeans(n_clusters=k, n_init=5, random_state=42)
+    kmeans.fit(rgb_only)
+    # Count pixels per cluster
+    labels, counts = np.unique(kmeans.labels_, return_counts=True)
+    return kmeans.cluster_centers_, counts
+
+def _nearest(points, centers):
+    d = (points * points).sum(1)[:, None] - 2 * points @ centers.T + (centers * centers).sum(1)[None, :]
+    return d.argmin(1)
+
+def _quantize_minibatch(rgb_only, k, batch=512, iters=20, seed=42):
+    """Mini-batch k-means (Sculley 2010) in plain NumPy, k-means++ seeding."""
+    rng = np.random.default_rng(seed)
+    x = rgb_only.astype(np.float32)
+
+    # k-means++ init on a sample
+    sample = x[rng.choice(len(x), min(len(x), 2048), replace=False)]
+    centers = [sample[rng.integers(len(sample))]]
+    d2 = ((sample - centers[0]) ** 2).sum(1)
+    for _ in range(1, k):
+        if d2.sum() == 0: break
+        centers.append(sample[rng.choice(len(sample), p=d2 / d2.sum())])
+        d2 = np.minimum(d2, ((sample - centers[-1]) ** 2).sum(1))
+    centers = np.array(centers, dtype=np.float32)
+
+    k = len(centers)
+    seen = np.zeros(k)
+    for _ in range(iters):
+        b = x[rng.integers(0, len(x), min(batch, len(x)))]
+        labels = _nearest(b, centers)
+        n = np.bincount(labels, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=b[:, i], minlength=k) for i in range(3)], 1)
+        hit = n > 0
+        seen[hit] += n[hit]
+        lr = (n[hit] / seen[hit])[:, None]
+        centers[hit] += lr * (sums[hit] / n[hit][:, None] - centers[hit])
+
+    counts = np.bincount(_nearest(x, centers), minlength=len(centers))
+    keep = counts > 0
+    return centers[keep], counts[keep]
+
+def _quantize_pil(rgb_only, k, method):
+    img = Image.fromarray(np.ascontiguousarray(rgb_only).reshape(-1, 1, 3), "RGB")
+    q = img.quantize(colors=k, method=method)
+    idx = np.asarray(q).ravel()
+    palette = np.array(q.getpalette()[:3 * 256], dtype=np.float32).reshape(-1, 3)
+    counts = np.bincount(idx, minlength=len(palette))
+    used = np.flatnonzero(counts)
+    return palette[used], counts[used]
+
+def _quantize_mediancut(rgb_only, k):
+    """PIL median cut."""
+    return _quantize_pil(rgb_only, k, Image.Quantize.MEDIANCUT)
+
+def _quantize_octree(rgb_only, k):
+    """PIL fast octree."""
+    return _quantize_pil(rgb_only, k, Image.Quantize.FASTOCTREE)
+
+def _quantize_palette(rgb_only, k):
+    """No clustering: every pixel is binned straight to its nearest COLOR_MAP entry."""
+    counts = np.bincount(PALETTE.nearest(rgb_only), minlength=len(PALETTE.rgb))
+    used = np.flatnonzero(counts)
+    return PALETTE.rgb[used], counts[used]
+
+QUANTIZERS = {
+    "kmeans": _quantize_sklearn,
+    "minibatch": _quantize_minibatch,
+    "mediancut": _quantize_mediancut,
+    "octree": _quantize_octree,
+    "palette": _quantize_palette,
+}
+QUANTIZER = os.environ.get("VALIDATOR_QUANTIZER", "kmeans")
+
+def extract_dominant_colors(image_bytes, n_colors=5, method=None):
+    """
+    Extract dominant colors from a background-free image.
+    Filters out transparent and near-white pixels.
+    method picks the QUANTIZERS backend (default QUANTIZER).
+    Returns list of (color_name, percentage) sorted by dominance.
+    """
+    return dominant_colors(opaque_pixels(image_bytes), n_colors, method)
+
+def dominant_colors(rgb_only, n_colors=5, method=None):
+    """(color_name, percentage) list for an (N, 3) array of product pixels, sorted by dominance."""
+    if len(rgb_only) < 10:
+        return [("White", 100.0)]
+
+    k = min(n_colors, len(rgb_only))
+    method = method or QUANTIZER
+    with perf.stage(f"color.cluster.{method}", items=len(rgb_only)):
+        centers, counts = QUANTIZERS[method](rgb_only, k)
+    total = counts.sum()
+
+    # Map clusters to color names with percentages (all centers in one batch)
+    with perf.stage("color.match", items=len(centers)):
+        names = PALETTE.classify(np.asarray(centers).astype(np.int64))
+    results = []
+    for name, count in zip(names, counts):
+        pct = round(count / total * 100, 1)
+        results.append((name, pct))
+
+    # Merge duplicate color names (multiple clusters mapping to same name)
+    merged = {}
+    for name, pct in results:
+        merged[name] = merged.get(name, 0) + pct
+
+    return sorted(merged.items(), key=lambda x: x[1], reverse=True)
+
+# ==========================================
+# 🧩 REGION SEGMENTATION (Tab 4)
+# Coarse split of a background-free thumbnail, all NumPy masks:
+#   lens   - semi-transparent pixels (tinted glass keeps partial alpha),
+#            minus the rim edge and bright unsaturated reflections
+#   temple - opaque pixels left/right of the lenses (no lenses: the
+#            outer TEMPLE_BAND of the product's width)
+#   frame  - every other opaque pixel
+# Each region is clustered on its own; "all" is the whole-image
+# result (= extract_dominant_colors) used where a region is missing.
+# ==========================================
+REGIONS = ("frame", "lens", "temple")
+REGION_KEYS = ("all",) + REGIONS
+LENS_ALPHA_MAX = 230    # visible pixels with alpha below this are lens
+HIGHLIGHT_MIN = 200     # lens pixels with every channel above this are reflections
+TEMPLE_GAP = 0.03       # temples: opaque pixels this share of the product's width beyond the lenses
+TEMPLE_BAND = 0.10      # without lenses: the outer share of the product's width on each side
+MIN_REGION_PIXELS = 50  # smaller regions are left out
+
+def _grow(mask):
+    """mask plus its 8 neighbours (one-pixel dilation)."""
+    out = mask.copy()
+    out[1:] |= mask[:-1]; out[:-1] |= mask[1:]
+    out[:, 1:] |= out[:, :-1].copy(); out[:, :-1] |= out[:, 1:].copy()
+    return out
+
+def segment(pixels):
+    """(H, W) int8 region labels for an RGBA thumbnail: index in REGIONS, -1 for background, reflections and lens rims."""
+    visible = visible_mask(pixels)
+    labels = np.full(visible.shape, -1, dtype=np.int8)
+    if not visible.any(): return labels
+
+    glass = visible & (pixels[..., 3] < LENS_ALPHA_MAX)
+    solid = visible & ~glass
+    # Lens: glass away from the rim (edge pixels blend in the frame color), minus reflections
+    lens = glass & ~_grow(solid) & ~(pixels[..., :3].min(-1) > HIGHLIGHT_MIN)
+
+    # Temples: solid pixels left/right of the lenses, else in the outer band of the product
+    x = np.arange(visible.shape[1])
+    cols = np.flatnonzero(visible.any(0))
+    width = cols[-1] - cols[0] + 1
+    if lens.any():
+        lens_cols = np.flatnonzero(lens.any(0))
+        gap = int(round(width * TEMPLE_GAP))
+        side = (x < lens_cols[0] - gap) | (x > lens_cols[-1] + gap)
+    else:
+        band = int(round(width * TEMPLE_BAND))
+        side = (x < cols[0] + band) | (x > cols[-1] - band)
+
+    labels[solid] = REGIONS.index("frame")
+    labels[solid & side[None, :]] = REGIONS.index("temple")
+    labels[lens] = REGIONS.index("lens")
+    return labels
+
+def extract_region_colors(image_bytes, n_colors=5, method=None):
+    """
+    Dominant colors per region: {"all": [...], "frame": [...], "lens": [...], "temple": [...]}
+    ("all" equals extract_dominant_colors). Regions under MIN_REGION_PIXELS are left out.
+    """
+    pixels = thumbnail_rgba(image_bytes)
+    with perf.stage("color.segment", items=pixels.shape[0] * pixels.shape[1]):
+        labels = segment(pixels)
+    rgb = pixels[..., :3]
+    out = {"all": dominant_colors(rgb[visible_mask(pixels)], n_colors, method)}
+    for i, region in enumerate(REGIONS):
+        part = rgb[labels == i]
+        if len(part) >= MIN_REGION_PIXELS: out[region] = dominant_colors(part, n_colors, method)
+    return out
+
+def stack_regions(detected):
+    """
+    extract_region_colors results for many images -> one (n_images, len(REGION_KEYS), len(PALETTE.labels))
+    bool array: True where a palette color was detected in that image and region (all False = region missing).
+    """
+    index = {name: i for i, name in enumerate(PALETTE.labels)}
+    out = np.zeros((len(detected), len(REGION_KEYS), len(index)), dtype=bool)
+    for i, per_region in enumerate(detected):
+        for r, region in enumerate(REGION_KEYS):
+            for name, _ in per_region.get(region, ()):
+                out[i, r, index[name]] = True
+    return out
+
+def colors_match(expected_color, detected_colors):
+    """
+    Check if an expected color name is found in the detected colors.
+    Uses aliases for compatible colors (e.g., Havana ≈ Brown).
+    """
+    expected = expected_color.strip()
+    if expected in SKIP_COLORS:
+        return None  # Cannot verify
+
+    detected_names = {name for name, _ in detected_colors}
+
+    # Direct match
+    if expected in detected_names:
+        return True
+
+    # Alias match (e.g., Havana matches Brown)
+    compatible = COLOR_ALIASES.get(expected, {expected})
+    if compatible & detected_names:
+        return True
+
+    return False
+
+def compatible_matrix():
+    """(n + 1, n) bool over PALETTE.labels: row e marks the detected colors colors_match accepts for e; the last row (unknown names) is all False."""
+    labels = list(PALETTE.labels)
+    out = np.zeros((len(labels) + 1, len(labels)), dtype=bool)
+    for e, name in enumerate(labels):
+        for d, other in enumerate(labels):
+            out[e, d] = other == name or other in COLOR_ALIASES.get(name, ())
+    return out
+
+# ==========================================
+# ⚡ PARALLEL COLOR ANALYSIS (Tab 4)
+# Decode + KMeans fan out to a process pool;
+# results come back in input order.
+# ==========================================
+COLOR_WORKERS = int(os.environ.get("VALIDATOR_COLOR_WORKERS", "0")) or (os.cpu_count() or 1)
+MAX_INFLIGHT_MB = float(os.environ.get("VALIDATOR_COLOR_INFLIGHT_MB", "256"))
+
+
+def _mp_context():
+    # Never fork the (threaded) Streamlit server. forkserver imports this module once
+    # and forks workers from that clean process; spawn elsewhere (Windows/macOS).
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload([__name__])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+_IN_WORKER = False
+
+
+def _init_worker(perf_enabled=False):
+    global _IN_WORKER
+    _IN_WORKER = True
+    perf.enable(perf_enabled)
+    # One process per core already: keep BLAS/OpenMP inside KMeans single-threaded
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(1)
+    except ImportError:
+        pass
+
+
+def analyze_image(image_bytes, method=None, regions=False):
+    """
+    (detected_colors, None) or (None, error message). Never raises, so it is safe in a worker.
+    regions=True detects per region (extract_region_colors).
+    In a pool worker with perf enabled, the step timings ride along as a third item.
+    """
+    extract = extract_region_colors if regions else extract_dominant_colors
+    try:
+        result = extract(image_bytes, method=method), None
+    except Exception as e:
+        result = None, str(e)
+    if _IN_WORKER and perf.ENABLED: result += (perf.RECORDER.drain(),)
+    return result
+
+
+def color_pool(workers=None):
+    """Worker pool for iter_dominant_colors (None when workers=1). The caller shuts it down."""
+    workers = workers or COLOR_WORKERS
+    if workers <= 1: return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context(), initializer=_init_worker,
+                               initargs=(perf.ENABLED,))
+
+
+def iter_dominant_colors(read_bytes, names, workers=None, max_inflight_bytes=None, cache=None, method=None, regions=False,
+                         executor=None):
+    """
+    Yields (name, detected_colors, error) for every name, in input order.
+    read_bytes(name) -> bytes (e.g. ZipFile.read). Reading stays on the calling thread;
+    at most max_inflight_bytes of image data are queued in the pool at once.
+    workers=1 runs serially in-process.
+    cache: optional ColorCache (built for the same method); hits skip decode + clustering entirely.
+    method: QUANTIZERS backend.
+    regions: per-region results ({region: detected_colors}, see extract_region_colors); the cache must match.
+    executor: a color_pool() to reuse across calls (left running); by default one is started and shut down here.
+    """
+    method = method or QUANTIZER
+    workers = workers or COLOR_WORKERS
+    budget = max_inflight_bytes or int(MAX_INFLIGHT_MB * 1024 * 1024)
+    pool = executor or color_pool(workers)
+
+    pending = deque()  # (name, Future or finished (detected, error), size, cache key)
+    inflight = 0
+
+    def pop():
+        nonlocal inflight
+        name, job, size, key = pending.popleft()
+        inflight -= size
+        result = job if isinstance(job, tuple) else job.result()
+        detected, err = result[:2]
+        if len(result) > 2: perf.RECORDER.merge(result[2])
+        if key is not None and err is None: cache.put(key, detected)
+        return name, detected, err
+
+    def ready():
+        job = pending[0][1]
+        return isinstance(job, tuple) or job.done()
+
+    try:
+        for name in names:
+            try:
+                data = read_bytes(name)
+            except Exception as e:
+                data, job, key = b"", (None, str(e)), None
+            else:
+                job, key = None, None
+                if cache is not None:
+                    key = cache.key(data)
+                    hit = cache.get(key)
+                    if hit is not None: job, key = (hit, None), None
+
+            if job is None and pool is None:
+                job = analyze_image(data, method, regions)
+            if job is None:
+                # Back-pressure: wait for the oldest jobs while over the byte budget
+                # (one oversized image is still allowed when nothing else is in flight)
+                while pending and (inflight + len(data) > budget or len(pending) >= workers * 4):
+                    yield pop()
+                pending.append((name, pool.submit(analyze_image, data, method, regions), len(data), key))
+                inflight += len(data)
+            else:
+                pending.append((name, job, 0, key))
+            del data
+
+            # Stream whatever is finished at the head of the queue
+            while pending and ready():
+                yield pop()
+
+        while pending:
+            yield pop()
+    finally:
+        if pool and pool is not executor: pool.shutdown(cancel_futures=True)
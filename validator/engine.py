@@ -0,0 +1,176 @@
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from validator import perf
+
+# ==========================================
+# 🚀 COLUMN-WISE VALIDATION ENGINE (Tab 1)
+# Same findings as the old iterrows() loop,
+# but every check runs on a whole column at once.
+# ==========================================
+
+EMPTY_MARKERS = ['nan', '', 'none']
+
+# Order matters: findings for one cell are reported in this order.
+WHITESPACE_LABELS = ["Leading Space", "Trailing Space", "Double Spaces", "Space around Separator"]
+
+FINDING_COLUMNS = ["Row", "Column", "Error", "Value", "Content", "Allowed"]
+
+
+def build_valid_values(master_df, master_cols):
+    """Allowed values per master column: comma-split, stripped, lower-cased."""
+    valid_values = {}
+    for m_col in master_cols:
+        raw = master_df[m_col].dropna().astype(str)
+        exploded = raw.str.split(r',+').explode()
+        clean_set = set(exploded.str.strip().str.lower())
+        clean_set.discard("")
+        valid_values[m_col] = clean_set
+    return valid_values
+
+
+def as_text(col):
+    """String form of a column exactly as str(cell) gave it (missing cells become 'nan')."""
+    text = col.astype(object).where(col.notna(), "nan")
+    if col.dtype == object and not text.map(type).eq(str).all():
+        text = text.map(str)
+    return text
+
+
+def _whitespace_masks(text):
+    return [
+        text.str.startswith(" "),
+        text.str.endswith(" "),
+        text.str.contains("  ", regex=False),
+        text.str.contains("| ", regex=False) | text.str.contains(" |", regex=False),
+    ]
+
+
+def _block(pos, seq, u_col, error, value, content, allowed):
+    n = len(pos)
+    return {
+        "_pos": pos, "_seq": seq, "Column": np.full(n, u_col, dtype=object),
+        "Error": np.full(n, error, dtype=object), "Value": value, "Content": content,
+        "Allowed": np.full(n, allowed, dtype=object) if allowed is None else _repeat(allowed, n),
+    }
+
+
+def _repeat(item, n):
+    out = np.empty(n, dtype=object)
+    out.fill(item)  # the same list object in every slot
+    return out
+
+
+def _check_uniques(text, valid_set, u_col, allowed):
+    """Run every check on distinct cell values; block _pos holds the unique id."""
+    keep = ~text.str.lower().isin(EMPTY_MARKERS).to_numpy(dtype=bool)
+    text = text[keep]
+    blocks = []
+
+    # 1. Whitespace
+    for seq, (label, mask) in enumerate(zip(WHITESPACE_LABELS, _whitespace_masks(text))):
+        hit = text[mask.to_numpy(dtype=bool)]
+        if hit.empty: continue
+        blocks.append(_block(hit.index.to_numpy(), np.full(len(hit), seq), u_col, "Whitespace",
+                             np.full(len(hit), label, dtype=object), hit.to_numpy(), None))
+
+    # 2. Content (pipe-separated parts against the master set)
+    parts = text.str.strip().str.split("|", regex=False).explode().str.strip()
+    bad = ((parts != "") & ~parts.str.lower().isin(valid_set)).to_numpy(dtype=bool)
+    if bad.any():
+        part_seq = parts.groupby(level=0).cumcount().to_numpy()[bad]
+        hit = parts[bad]
+        pos = hit.index.to_numpy()
+        blocks.append(_block(pos, len(WHITESPACE_LABELS) + part_seq, u_col, "Invalid Content",
+                             hit.to_numpy(), text.to_numpy()[text.index.get_indexer(pos)], allowed))
+    return blocks
+
+
+def check_column(text, valid_set, u_col, allowed):
+    """
+    Validate one user column (text with a positional index).
+    Cells are factorized first, so each distinct value is checked once and
+    findings are fanned back out to every row holding it.
+    Returns a list of blocks: dicts of equal-length arrays, keyed like FINDING_COLUMNS plus _pos/_seq.
+    """
+    codes, uniques = pd.factorize(text.to_numpy(dtype=object))
+    blocks = _check_uniques(pd.Series(uniques, dtype=object), valid_set, u_col, allowed)
+    if not blocks: return blocks
+
+    # Rows grouped by unique id: rows of id u are by_code[starts[u]:starts[u] + counts[u]]
+    by_code = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=len(uniques))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    out = []
+    for block in blocks:
+        uid = block["_pos"]
+        lengths = counts[uid]
+        pick = np.repeat(np.arange(len(uid)), lengths)
+        offset = np.arange(len(pick)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        expanded = {k: v[pick] for k, v in block.items()}
+        expanded["_pos"] = by_code[starts[uid][pick] + offset]
+        out.append(expanded)
+    return out
+
+
+def _collect(user_df, active_map, valid_values, progress=None, allowed=None, memo=None, extra=None):
+    """
+    All findings as one dict of arrays, ordered row by row like the old loop.
+    'allowed' optionally gives the precomputed "Allowed" sample per master column.
+    'memo' (incremental.ValidationMemo) re-checks only cells that changed since its last run.
+    'extra': finished blocks of other checks (rules.RuleSet.check), placed after the column findings of their row.
+    """
+    blocks, col_ids = [], []
+    total = len(active_map)
+    if memo is not None: memo.begin()
+    for col_pos, (m_col, u_col) in enumerate(active_map.items()):
+        if progress: progress(col_pos / total if total else 1.0)
+        sample = allowed[m_col] if allowed else list(islice(valid_values[m_col], 3))
+        with perf.stage("tab1.check_column", items=len(user_df)):
+            if memo is not None:
+                found = memo.check_column(user_df[u_col].reset_index(drop=True), valid_values[m_col], u_col, sample)
+            else:
+                found = check_column(as_text(user_df[u_col]).reset_index(drop=True), valid_values[m_col], u_col, sample)
+        for block in found:
+            blocks.append(block)
+            col_ids.append(np.full(len(block["_pos"]), col_pos))
+    for i, block in enumerate(extra or ()):
+        blocks.append(block)
+        col_ids.append(np.full(len(block["_pos"]), total + i))
+
+    if not blocks: return None
+    with perf.stage("tab1.assemble", items=sum(len(b["_pos"]) for b in blocks)):
+        return _assemble(user_df, blocks, col_ids)
+
+
+def _assemble(user_df, blocks, col_ids):
+    pos = np.concatenate([b["_pos"] for b in blocks])
+    seq = np.concatenate([b["_seq"] for b in blocks])
+    order = np.lexsort((seq, np.concatenate(col_ids), pos))
+    out = {"Row": (np.asarray(user_df.index) + 2)[pos][order]}
+    for key in FINDING_COLUMNS[1:]:
+        out[key] = np.concatenate([b[key] for b in blocks])[order]
+    return out
+
+
+def find_mistakes(user_df, active_map, valid_values, progress=None, allowed=None, memo=None, extra=None):
+    """Run Tab 1 checks over every mapped column. Returns a DataFrame with FINDING_COLUMNS."""
+    found = _collect(user_df, active_map, valid_values, progress, allowed, memo, extra)
+    if found is None: return pd.DataFrame(columns=FINDING_COLUMNS)
+    return pd.DataFrame({k: pd.array(v, dtype=object) if v.dtype == object else v for k, v in found.items()})
+
+
+def validate_frame(user_df, active_map, valid_values, progress=None, allowed=None, memo=None, extra=None):
+    """Tab 1 validation. Returns the list of mistake records (Row/Column/Error/Value/Content/Allowed)."""
+    found = _collect(user_df, active_map, valid_values, progress, allowed, memo, extra)
+    if found is None: return []
+    mistakes = []
+    for row, col, err, val, content, sample in zip(found["Row"].tolist(), *(found[k] for k in FINDING_COLUMNS[1:])):
+        rec = {"Row": row, "Column": col, "Error": err, "Value": val, "Content": content}
+        # Whitespace findings never carried an 'Allowed' sample
+        if sample is not None: rec["Allowed"] = list(sample)
+        mistakes.append(rec)
+    return mistakes
@@ -0,0 +1,230 @@
+import io
+import csv
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from validator import perf
+from validator.engine import FINDING_COLUMNS, _collect
+from validator.rules import RULE_ERROR, merge_stats
+
+# ==========================================
+# 📋 FINDINGS BUFFER (Tab 1 reports)
+# Hundreds of thousands of findings kept as a few flat arrays:
+# row numbers, column/error codes and factorized Value/Content
+# (each distinct string stored once). Each distinct "Allowed"
+# sample is kept once, too. Pages and exports are cut from it
+# chunk by chunk, so no step holds the whole report as dicts.
+# ==========================================
+
+ERROR_TYPES = ["Whitespace", "Invalid Content", RULE_ERROR]
+EXPORT_CHUNK = 50_000
+EXCEL_MAX_ROWS = 1_048_576  # per sheet, header included
+
+
+class Findings:
+    """
+    - row:            Excel row number per finding
+    - col / err:      codes into columns / ERROR_TYPES
+    - value, content: (codes, uniques) pairs from pd.factorize
+    - allowed:        (codes, samples): the "Allowed" sample per finding (-1 = none); two master
+                      columns on one user column keep their own samples
+    - rule_stats:     per cross-column rule: violations, ms, why it was skipped (see rules.RuleSet.check)
+    """
+
+    def __init__(self, row, col, err, value, content, columns, allowed, rule_stats=()):
+        self.row = row
+        self.col = col
+        self.err = err
+        self.value = value
+        self.content = content
+        self.columns = columns
+        self.allowed = allowed
+        self.rule_stats = list(rule_stats)
+
+    @classmethod
+    def from_arrays(cls, found, columns=()):
+        """From the engine's dict of arrays (None = no findings); columns fixes the column order."""
+        # Two master columns can map to one user column (e.g. 'width ID' inside 'lens width ID')
+        columns = list(dict.fromkeys(columns))
+        if found is None:
+            empty = (np.empty(0, dtype=np.int32), np.empty(0, dtype=object))
+            return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int8),
+                       empty, empty, columns, empty)
+        columns += [c for c in pd.unique(found["Column"]) if c not in columns]
+        col = pd.Categorical(found["Column"], categories=columns).codes.astype(np.int32)
+        err = pd.Categorical(found["Error"], categories=ERROR_TYPES).codes.astype(np.int8)
+        return cls(np.asarray(found["Row"], dtype=np.int64), col, err,
+                   _factorize(found["Value"]), _factorize(found["Content"]), columns, _factorize_samples(found["Allowed"]))
+
+    @classmethod
+    def concat(cls, parts, columns=()):
+        """One buffer out of several (e.g. row chunks of one file), in the given order."""
+        stats = merge_stats(getattr(p, "rule_stats", ()) for p in parts)
+        parts = [p for p in parts if len(p)]
+        chunks = [p.arrays() for p in parts]
+        found = {k: np.concatenate([c[k] for c in chunks]) for k in FINDING_COLUMNS} if chunks else None
+        merged = cls.from_arrays(found, columns)
+        merged.rule_stats = stats
+        return merged
+
+    def __len__(self):
+        return len(self.row)
+
+    @property
+    def errors(self):
+        return [e for i, e in enumerate(ERROR_TYPES) if (self.err == i).any()]
+
+    def nbytes(self):
+        """Approximate memory of the buffer (distinct strings counted once)."""
+        strings = sum(len(s) + 49 for codes, uniques in (self.value, self.content) for s in uniques)
+        arrays = [self.row, self.col, self.err, self.value[0], self.content[0], self.allowed[0]]
+        return sum(a.nbytes for a in arrays) + 8 * (len(self.value[1]) + len(self.content[1])) + strings
+
+    # ---------- Views ----------
+    def counts(self):
+        """Issues per column and error type, in column order."""
+        n_err = len(ERROR_TYPES)
+        grid = np.bincount(self.col.astype(np.int64) * n_err + self.err, minlength=len(self.columns) * n_err)
+        rows = [{"Column": c, "Error": e, "Issues": int(grid[i * n_err + j])}
+                for i, c in enumerate(self.columns) for j, e in enumerate(ERROR_TYPES) if grid[i * n_err + j]]
+        return pd.DataFrame(rows, columns=["Column", "Error", "Issues"])
+
+    def select(self, columns=None, errors=None):
+        """Findings of the given columns / error types only (None = all)."""
+        keep = np.ones(len(self), dtype=bool)
+        if columns: keep &= np.isin(self.col, [self.columns.index(c) for c in columns])
+        if errors: keep &= np.isin(self.err, [ERROR_TYPES.index(e) for e in errors])
+        if keep.all(): return self
+        return Findings(self.row[keep], self.col[keep], self.err[keep],
+                        (self.value[0][keep], self.value[1]), (self.content[0][keep], self.content[1]),
+                        self.columns, (self.allowed[0][keep], self.allowed[1]), self.rule_stats)
+
+    def arrays(self, start=0, stop=None, allowed_text=False):
+        """Findings [start:stop] as a dict of arrays keyed by FINDING_COLUMNS (Allowed joined by ', ' if allowed_text)."""
+        sl = slice(start, stop)
+        col, err = self.col[sl], self.err[sl]
+        codes, uniques = self.allowed
+        samples = np.empty(len(uniques) + 1, dtype=object)  # last slot: code -1 -> None
+        for i, sample in enumerate(uniques): samples[i] = ", ".join(sample) if allowed_text else sample
+        return {
+            "Row": self.row[sl],
+            "Column": np.asarray(self.columns, dtype=object)[col],
+            "Error": np.asarray(ERROR_TYPES, dtype=object)[err],
+            "Value": self.value[1][self.value[0][sl]],
+            "Content": self.content[1][self.content[0][sl]],
+            "Allowed": samples[codes[sl]],
+        }
+
+    def frame(self, start=0, stop=None, allowed_text=False):
+        """Findings [start:stop] as a DataFrame, like engine.find_mistakes."""
+        found = self.arrays(start, stop, allowed_text)
+        return pd.DataFrame({k: pd.array(v, dtype=object) if v.dtype == object else v for k, v in found.items()})
+
+    def chunks(self, size=EXPORT_CHUNK, allowed_text=False):
+        """Row tuples in FINDING_COLUMNS order, EXPORT_CHUNK findings materialized at a time."""
+        for start in range(0, len(self), size):
+            found = self.arrays(start, start + size, allowed_text)
+            yield zip(found["Row"].tolist(), *(found[k] for k in FINDING_COLUMNS[1:]))
+
+    def records(self):
+        """Mistake records as validate_frame returns them."""
+        for chunk in self.chunks():
+            for row, col, err, val, content, sample in chunk:
+                rec = {"Row": row, "Column": col, "Error": err, "Value": val, "Content": content}
+                if sample is not None: rec["Allowed"] = list(sample)
+                yield rec
+
+    # ---------- Streamed export ----------
+    def write_csv(self, target, encoding='utf-8'):
+        """CSV to a path or binary file, chunk by chunk."""
+        f = open(target, 'wb') if isinstance(target, str) else target
+        text = io.TextIOWrapper(f, encoding=encoding, newline='')
+        try:
+            with perf.stage("tab1.export_csv", items=len(self)):
+                w = csv.writer(text)
+                w.writerow(FINDING_COLUMNS)
+                for chunk in self.chunks(allowed_text=True):
+                    w.writerows(chunk)
+        finally:
+            text.flush()
+            text.detach()
+            if f is not target: f.close()
+
+    def export(self, fmt="csv"):
+        """
+        CSV or XLSX bytes for a download button (Streamlit reads the whole download anyway).
+        Written through a temp file, so only the finished file is held in memory.
+        """
+        with tempfile.TemporaryFile() as out:
+            if fmt == "csv": self.write_csv(out)
+            else: self.write_xlsx(out)
+            out.seek(0)
+            return out.read()
+
+    def write_xlsx(self, target):
+        """
+        XLSX to a path or binary file with xlsxwriter in constant_memory mode (rows are flushed as written).
+        Sheets: 'Summary' (counts) + 'Mistakes', continued on 'Mistakes 2', ... past Excel's row limit.
+        """
+        import xlsxwriter
+        wb = xlsxwriter.Workbook(target, {'constant_memory': True, 'strings_to_formulas': False, 'strings_to_urls': False})
+        with perf.stage("tab1.export_xlsx", items=len(self)):
+            bold = wb.add_format({'bold': True})
+            summary = wb.add_worksheet("Summary")
+            summary.write_row(0, 0, ["Column", "Error", "Issues"], bold)
+            for r, rec in enumerate(self.counts().itertuples(index=False), start=1):
+                summary.write_row(r, 0, list(rec))
+
+            write_number, write_string = xlsxwriter.worksheet.Worksheet.write_number, xlsxwriter.worksheet.Worksheet.write_string
+            sheet, r, n_sheets = None, EXCEL_MAX_ROWS, 0
+            for chunk in self.chunks(allowed_text=True):
+                for rec in chunk:
+                    if r >= EXCEL_MAX_ROWS:
+                        n_sheets += 1
+                        sheet = wb.add_worksheet("Mistakes" if n_sheets == 1 else f"Mistakes {n_sheets}")
+                        sheet.write_row(0, 0, FINDING_COLUMNS, bold)
+                        r = 1
+                    row, col, err, val, content, sample = rec
+                    # Typed writes skip write_row's per-cell type dispatch
+                    write_number(sheet, r, 0, row)
+                    write_string(sheet, r, 1, col)
+                    write_string(sheet, r, 2, err)
+                    write_string(sheet, r, 3, val)
+                    write_string(sheet, r, 4, content)
+                    if sample is not None: write_string(sheet, r, 5, sample)
+                    r += 1
+            if sheet is None:
+                wb.add_worksheet("Mistakes").write_row(0, 0, FINDING_COLUMNS, bold)
+            wb.close()
+
+
+def _factorize(values):
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    return codes.astype(np.int32), np.asarray(uniques, dtype=object)
+
+
+def _factorize_samples(samples):
+    """(codes, uniques) for the per-finding "Allowed" lists: equal samples share a code, None -> -1."""
+    samples = np.asarray(samples, dtype=object)
+    # Blocks repeat one list object: factorize on identity, then compare the contents once per object
+    ids, _ = pd.factorize(np.fromiter(map(id, samples), dtype=np.int64, count=len(samples)))
+    _, firsts = np.unique(ids, return_index=True)
+    keys, uniques = {}, np.empty(len(firsts), dtype=object)
+    remap = np.empty(len(firsts), dtype=np.int32)
+    for i, pos in enumerate(firsts):
+        sample = samples[pos]
+        if sample is None: remap[i] = -1; continue
+        remap[i] = keys.setdefault(tuple(sample), len(keys))
+        uniques[remap[i]] = sample
+    return remap[ids], uniques[:len(keys)]
+
+
+def collect_findings(user_df, active_map, valid_values, progress=None, allowed=None, memo=None, rules=None):
+    """Run Tab 1 checks over every mapped column (+ the cross-column rules of a rules.RuleSet). Returns a Findings buffer."""
+    extra, stats = rules.check(user_df) if rules is not None else ([], [])
+    found = _collect(user_df, active_map, valid_values, progress, allowed, memo, extra)
+    findings = Findings.from_arrays(found, columns=active_map.values())
+    findings.rule_stats = stats
+    return findings
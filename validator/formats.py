@@ -0,0 +1,138 @@
+import csv
+import importlib.util
+
+import pandas as pd
+
+# ==========================================
+# 🔎 FILE FORMAT SNIFFING + FAST READERS
+# Look at the first bytes once and pick the one reader that fits,
+# instead of "try Excel, on any error try CSV".
+# ==========================================
+
+SNIFF_BYTES = 64 * 1024
+XLSX_MAGIC = b"PK\x03\x04"                      # xlsx = zip container
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # legacy .xls
+CSV_ENCODINGS = ['utf-8', 'cp1252', 'latin1']
+# '|' is deliberately not a candidate: it separates values inside cells
+CSV_DELIMITERS = ",;\t"
+
+# Optional: pip install python-calamine (Rust xlsx reader, several times faster than openpyxl)
+XLSX_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else "openpyxl"
+
+# Same strings pandas turns into NaN by default
+NA_STRINGS = {"-1.#IND", "1.#QNAN", "1.#IND", "-1.#QNAN", "#N/A N/A", "#N/A", "N/A", "n/a", "NA", "<NA>",
+              "#NA", "NULL", "null", "NaN", "-NaN", "nan", "-nan", "None", ""}
+# Excel error values (pandas reads these as NaN)
+EXCEL_ERRORS = {"#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!", "#N/A", "#GETTING_DATA"}
+
+
+def sniff_kind(head):
+    """'xlsx', 'xls' or 'csv' from the first bytes of a file."""
+    if head.startswith(XLSX_MAGIC): return "xlsx"
+    if head.startswith(OLE_MAGIC): return "xls"
+    return "csv"
+
+
+def read_head(file, n=SNIFF_BYTES):
+    """First n bytes of a path or binary file object (file position is restored)."""
+    if isinstance(file, (str, bytes)) or hasattr(file, '__fspath__'):
+        with open(file, 'rb') as f: return f.read(n)
+    pos = file.tell()
+    head = file.read(n)
+    file.seek(pos)
+    return head
+
+
+def _decode(sample):
+    """(encoding, text) for a byte sample; a multi-byte char cut off at the end is ignored."""
+    for enc in CSV_ENCODINGS:
+        try:
+            return enc, sample.decode(enc)
+        except UnicodeDecodeError as e:
+            if enc == 'utf-8' and e.start >= len(sample) - 3 and e.reason == 'unexpected end of data':
+                return enc, sample[:e.start].decode(enc)
+    return 'latin1', sample.decode('latin1')
+
+
+def sniff_csv(sample):
+    """(encoding, delimiter) of a CSV from a byte sample."""
+    encoding, text = _decode(sample)
+    text = text.lstrip('\ufeff')
+    lines = text.splitlines()
+    # Drop a last line that may be cut off mid-row
+    if len(lines) > 1 and not text.endswith(('\n', '\r')): lines = lines[:-1]
+    lines = lines[:50]
+    try:
+        delimiter = csv.Sniffer().sniff("\n".join(lines), delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        # Most frequent candidate in the header line, comma if there is none
+        header = lines[0] if lines else ""
+        delimiter = max(CSV_DELIMITERS, key=header.count) if any(d in header for d in CSV_DELIMITERS) else ','
+    return encoding, delimiter
+
+
+# ---------- Excel cells as pd.read_excel(dtype=str) gives them ----------
+def cell_text(v):
+    # Integral floats lose '.0', NA strings become missing
+    if v is None: return None
+    if isinstance(v, float) and v.is_integer(): v = int(v)
+    v = str(v)
+    return None if v in NA_STRINGS else v
+
+
+def dedupe(headers):
+    # pandas-style 'X', 'X.1', 'X.2' for repeated headers
+    seen, out = {}, []
+    for h in headers:
+        name = h
+        while name in seen:
+            seen[h] += 1
+            name = f"{h}.{seen[h]}"
+        seen[name] = 0
+        out.append(name)
+    return out
+
+
+def _header_text(v):
+    if v is None or v == "": return None
+    if isinstance(v, float) and v.is_integer(): v = int(v)
+    return str(v)
+
+
+_XLSX_NA = NA_STRINGS | EXCEL_ERRORS
+
+
+def _xlsx_cell(v):
+    if type(v) is str: return None if v in _XLSX_NA else v  # most cells: skip cell_text
+    return cell_text(v)
+
+
+def read_xlsx_str(file):
+    """
+    First sheet, header row 0, every cell as text: the same frame as
+    pd.read_excel(file, dtype=str) but streamed with openpyxl read-only + values_only.
+    """
+    import openpyxl
+    wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = wb.worksheets[0]
+        sheet.reset_dimensions()
+        rows = []
+        for row in sheet.iter_rows(values_only=True):
+            n = len(row)
+            while n and (row[n - 1] is None or row[n - 1] == ""): n -= 1
+            rows.append(row[:n])
+    finally:
+        wb.close()
+
+    while rows and not rows[-1]: rows.pop()
+    if not rows: return pd.DataFrame()
+    width = max(len(r) for r in rows)
+    header = list(rows[0]) + [None] * (width - len(rows[0]))
+    names = dedupe([f"Unnamed: {i}" if _header_text(h) is None else _header_text(h) for i, h in enumerate(header)])
+
+    body = rows[1:]
+    cols = []
+    for i in range(width):
+        cols.append([_xlsx_cell(r[i]) if i < len(r) else None for r in body])
+    return pd.DataFrame({n: pd.Series(c, dtype=str) for n, c in zip(names, cols)})
@@ -0,0 +1,116 @@
+import os
+import re
+import hashlib
+import threading
+
+import pandas as pd
+
+from validator import perf
+
+# ==========================================
+# 🖼️ IMAGE NAME vs. EXCEL (Tab 2)
+# Pasted paths are parsed once per text (memoized on its hash),
+# so a rerun doesn't parse 50k lines again; matching against the
+# Excel names is set/isin based.
+# ==========================================
+
+# "Name (2).jpg": extra angle of "Name". Only the explicit "(N)" form counts: a plain trailing
+# number ("rb 3025-01", "model 12") is part of too many model names, so such files stay in 'extra'.
+# Only used when the full file name is not a product itself.
+ANGLE_SUFFIX = r"\s*\(\d{1,2}\)$"
+# Products with fewer images than this are listed (Tab 2 default, batch --min-images)
+MIN_IMAGES = int(os.environ.get("VALIDATOR_MIN_IMAGES", "1"))
+PARSE_MEMO_MAX = 8
+
+_ANGLE = re.compile(ANGLE_SUFFIX)
+
+
+def find_name_column(user_df, target_col_name="Glasses name"):
+    return next((c for c in user_df.columns if target_col_name.lower() in c.lower()), user_df.columns[0])
+
+
+def excel_names(user_df, col):
+    return set(user_df[col].dropna().astype(str).str.strip().str.lower().tolist())
+
+
+# Streamlit runs each session's script in its own thread
+_PARSED = {}
+_PARSED_LOCK = threading.Lock()
+
+
+def parse_path_table(pasted_paths):
+    """
+    Pasted paths -> DataFrame with one row per image: File (file name) and Key
+    (file name without extension, '_' -> '/', stripped, lower-cased).
+    Takes '/' and '\\' paths, quoted "Copy as path" lines and blank lines.
+    Memoized on the text hash; the returned frame is shared, don't modify it.
+    """
+    digest = hashlib.blake2b(pasted_paths.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    with _PARSED_LOCK:
+        table = _PARSED.get(digest)
+    if table is not None: return table
+
+    with perf.stage("tab2.parse") as s:
+        files, keys = [], []
+        for line in pasted_paths.splitlines():
+            path = line.strip().strip('"\'').strip()
+            fname = path[max(path.rfind('\\'), path.rfind('/')) + 1:]
+            key = (fname.rpartition('.')[0] if '.' in fname else fname).replace('_', '/').strip().lower()
+            if key:
+                files.append(fname)
+                keys.append(key)
+        table = pd.DataFrame({"File": files, "Key": keys}, dtype=object)
+        s.add(len(table))
+
+    # Parsed outside the lock; if two threads raced on the same text, the first stored frame wins
+    with _PARSED_LOCK:
+        if digest in _PARSED: return _PARSED[digest]
+        if len(_PARSED) >= PARSE_MEMO_MAX: _PARSED.pop(next(iter(_PARSED)))
+        _PARSED[digest] = table
+    return table
+
+
+def parse_paths(pasted_paths):
+    """'Copy as path' output -> set of product names (file name, no extension, '_' -> '/')."""
+    return set(parse_path_table(pasted_paths)["Key"])
+
+
+def base_key(key):
+    """Image key without an ANGLE_SUFFIX."""
+    return _ANGLE.sub('', key).strip()
+
+
+def resolve_product(key, names):
+    """The product an image key belongs to: the key itself, else the key minus an ANGLE_SUFFIX; None if neither is a product."""
+    if key in names: return key
+    base = base_key(key)
+    return base if base in names else None
+
+
+@perf.timed("tab2.check")
+def match_images(names, table):
+    """
+    Excel product names vs. a parse_path_table() frame.
+    Returns (missing, extra, counts):
+    - missing: products without any image (sorted)
+    - extra:   image keys that match no product (sorted)
+    - counts:  DataFrame Product / Images / Files for every product, fewest images first
+    """
+    names = set(names)
+    files, extra = {}, set()
+    for fname, key in zip(table["File"].tolist(), table["Key"].tolist()):
+        product = resolve_product(key, names)
+        if product is None: extra.add(key)
+        else: files.setdefault(product, []).append(fname)
+    counts = pd.DataFrame({"Product": sorted(names)}, dtype=object)
+    counts["Images"] = [len(files.get(p, ())) for p in counts["Product"]]
+    counts["Files"] = [", ".join(files.get(p, ())) for p in counts["Product"]]
+    counts = counts.sort_values(["Images", "Product"], kind="stable").reset_index(drop=True)
+    missing = counts["Product"][counts["Images"] == 0].tolist()
+    extra = sorted(extra)
+    return missing, extra, counts
+
+
+def few_images(counts, min_images=MIN_IMAGES):
+    """Rows of match_images() counts with at least one but fewer than min_images images."""
+    return counts[(counts["Images"] > 0) & (counts["Images"] < min_images)]
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+from validator.engine import as_text, check_column
+
+# ==========================================
+# ♻️ INCREMENTAL RE-VALIDATION (Tab 1)
+# Upload -> fix a few cells in Excel -> re-upload:
+# every cell is fingerprinted, and only cells whose value is new
+# to a column get checked again. Findings of a cell depend only on
+# its value and the column's master set, so the rest are copied over.
+# Unchanged cells are found by comparing the raw column with the last
+# upload (cheap); only the others are turned into text and hashed.
+# ==========================================
+
+
+def _concat(blocks):
+    """One block out of several, sorted by row (finding order inside a row kept)."""
+    if not blocks: return None
+    block = {k: np.concatenate([b[k] for b in blocks]) for k in blocks[0]}
+    order = np.lexsort((block["_seq"], block["_pos"]))
+    return {k: v[order] for k, v in block.items()}
+
+
+def _unchanged(col, prev):
+    """Positions (in both columns) where col holds exactly the same cell as prev."""
+    n = min(len(col), len(prev))
+    if col.dtype != prev.dtype: return np.empty(0, dtype=np.int64)
+    a, b = col.iloc[:n], prev.iloc[:n]
+    try:
+        same = a.eq(b).fillna(False) | (a.isna() & b.isna())
+    except (TypeError, ValueError):
+        return np.empty(0, dtype=np.int64)
+    # Equal but printed differently: 1 == 1.0 == True, 0.0 == -0.0
+    if col.dtype == object: same &= a.map(type).eq(b.map(type))
+    elif col.dtype.kind == 'f': same &= np.signbit(a.to_numpy()) == np.signbit(b.to_numpy())
+    return np.flatnonzero(same.to_numpy(dtype=bool))
+
+
+class _ColumnMemo:
+    """Raw cells, text hashes + findings (sorted by row) of one user column in the last run."""
+
+    def __init__(self, col, hashes, block):
+        self.col = col
+        self.hashes = hashes
+        self.block = block
+        self._lookup = None
+        counts = np.bincount(block["_pos"], minlength=len(hashes)) if block is not None else np.zeros(len(hashes), dtype=np.int64)
+        self.counts = counts
+        self.starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+
+    def lookup(self):
+        """(unique hash index, row of its first occurrence), built on first use."""
+        if self._lookup is None:
+            first = ~pd.Index(self.hashes).duplicated()
+            self._lookup = (pd.Index(self.hashes[first]), np.flatnonzero(first))
+        return self._lookup
+
+    def gather(self, old_rows, new_rows):
+        """Findings of old_rows, relabelled to new_rows."""
+        if self.block is None: return None
+        lengths = self.counts[old_rows]
+        if not lengths.sum(): return None
+        pick = np.repeat(np.arange(len(old_rows)), lengths)
+        offset = np.arange(len(pick)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        src = self.starts[old_rows][pick] + offset
+        out = {k: v[src] for k, v in self.block.items()}
+        out["_pos"] = np.asarray(new_rows)[pick]
+        return out
+
+
+class ValidationMemo:
+    """
+    Per-session memory of the previous Tab 1 run.
+    Pass it to MasterIndex.validate(..., memo=...); 'stats' tells how much was actually re-checked.
+    """
+
+    def __init__(self):
+        self.columns = {}
+        self._used = set()
+        self.stats = {"cells": 0, "rechecked": 0}
+
+    def nbytes(self):
+        """Approximate memory held: remembered cells (pointers only, the strings belong to the user file), hashes, findings."""
+        total = 0
+        for memo in self.columns.values():
+            total += memo.col.memory_usage(index=False) + memo.hashes.nbytes + memo.counts.nbytes + memo.starts.nbytes
+            if memo.block is not None: total += sum(v.nbytes for v in memo.block.values())
+        return int(total)
+
+    def begin(self):
+        """Start a run: forget columns the previous run did not touch."""
+        if self._used: self.columns = {k: v for k, v in self.columns.items() if k in self._used}
+        self._used = set()
+        self.stats = {"cells": 0, "rechecked": 0}
+
+    def check_column(self, col, valid_set, u_col, allowed):
+        """
+        engine.check_column for a raw user column (positional index) that only
+        checks cells it has not seen in this column before.
+        """
+        if not isinstance(valid_set, frozenset): valid_set = frozenset(valid_set)
+        key = (u_col, hash(valid_set), tuple(allowed))
+        self._used.add(key)
+        self.stats["cells"] += len(col)
+        prev = self.columns.get(key)
+
+        if prev is None:
+            text = as_text(col)
+            blocks = check_column(text, valid_set, u_col, allowed)
+            self.columns[key] = _ColumnMemo(col, pd.util.hash_array(text.to_numpy(dtype=object)), _concat(blocks))
+            self.stats["rechecked"] += len(col)
+            return blocks
+
+        # Source row in the previous run for every row: same cell at the same position,
+        # else the same text anywhere in the column, else it has to be checked
+        src = np.full(len(col), -1, dtype=np.int64)
+        hashes = np.zeros(len(col), dtype=np.uint64)
+        same = _unchanged(col, prev.col)
+        if len(same) == len(col) == len(prev.col):
+            prev.col = col
+            return [prev.block] if prev.block is not None else []
+        src[same] = same
+        hashes[same] = prev.hashes[same]
+        todo = np.flatnonzero(src < 0)
+        fresh = todo
+        if len(todo):
+            text = as_text(col.iloc[todo]).to_numpy(dtype=object)
+            hashes[todo] = pd.util.hash_array(text)
+            index, first_row = prev.lookup()
+            hit = index.get_indexer(hashes[todo])
+            src[todo[hit >= 0]] = first_row[hit[hit >= 0]]
+            fresh = todo[hit < 0]
+            fresh_text = text[hit < 0]
+        reused = np.flatnonzero(src >= 0)
+
+        blocks = []
+        copied = prev.gather(src[reused], reused)
+        if copied is not None: blocks.append(copied)
+        if len(fresh):
+            for block in check_column(pd.Series(fresh_text, dtype=object), valid_set, u_col, allowed):
+                block["_pos"] = fresh[block["_pos"]]
+                blocks.append(block)
+        self.stats["rechecked"] += len(fresh)
+
+        self.columns[key] = _ColumnMemo(col, hashes, _concat(blocks))
+        return blocks
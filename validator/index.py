@@ -0,0 +1,79 @@
+from itertools import islice
+
+from validator import masters, perf
+from validator.masters import IDEAL_PAIRS  # noqa: F401 (re-exported)
+from validator.cache import cached_load
+from validator.engine import build_valid_values, find_mistakes, validate_frame
+from validator.findings import collect_findings
+
+# ==========================================
+# 🗂️ MASTER VALIDATION INDEX (Tab 1)
+# Built once per master file version, then shared:
+# a validation click only has to map user columns and look up.
+# ==========================================
+
+INDEX_VERSION = "master-index-v2"
+
+
+class MasterIndex:
+    """
+    Precompiled lookups for Tab 1:
+    - pairs:        (resolved master column, user column ID) in IDEAL_PAIRS order
+    - valid_values: master column -> frozenset of allowed lower-cased values
+    - allowed:      master column -> the 3-item "Allowed" sample shown in reports
+    Read-only once built, so one instance can serve every session.
+    """
+
+    def __init__(self, pairs, valid_values, allowed, n_rows=0):
+        self.pairs = pairs
+        self.valid_values = valid_values
+        self.allowed = allowed
+        self.n_rows = n_rows
+
+    @classmethod
+    @perf.timed("index.build")
+    def from_frame(cls, master_df, ideal_pairs=IDEAL_PAIRS):
+        master_cols = list(master_df.columns)
+        pairs = []
+        for mk, uk in ideal_pairs.items():
+            rmc = next((c for c in master_cols if mk in c), None)
+            if rmc: pairs.append((rmc, uk))
+        resolved = dict.fromkeys(rmc for rmc, _ in pairs)
+        valid_values = {m: frozenset(v) for m, v in build_valid_values(master_df, resolved).items()}
+        allowed = {m: list(islice(v, 3)) for m, v in valid_values.items()}
+        return cls(pairs, valid_values, allowed, len(master_df))
+
+    def active_map(self, user_cols):
+        """Master column -> actual user column, for every pair present in the user file."""
+        user_cols = list(user_cols)
+        active_map = {}
+        for rmc, uk in self.pairs:
+            ruc = next((c for c in user_cols if uk in c), None)
+            if ruc: active_map[rmc] = ruc
+        return active_map
+
+    def find_mistakes(self, user_df, active_map=None, progress=None, memo=None, rules=None):
+        """Findings as a DataFrame (see engine.find_mistakes); rules: a rules.RuleSet checked as well."""
+        if active_map is None: active_map = self.active_map(user_df.columns)
+        extra = rules.check(user_df)[0] if rules is not None else None
+        return find_mistakes(user_df, active_map, self.valid_values, progress, self.allowed, memo, extra)
+
+    def findings(self, user_df, active_map=None, progress=None, memo=None, rules=None):
+        """Findings as a compact columnar buffer (see findings.Findings)."""
+        if active_map is None: active_map = self.active_map(user_df.columns)
+        return collect_findings(user_df, active_map, self.valid_values, progress, self.allowed, memo, rules)
+
+    def validate(self, user_df, active_map=None, progress=None, memo=None, rules=None):
+        """Findings as the list of mistake records (see engine.validate_frame)."""
+        if active_map is None: active_map = self.active_map(user_df.columns)
+        extra = rules.check(user_df)[0] if rules is not None else None
+        return validate_frame(user_df, active_map, self.valid_values, progress, self.allowed, memo, extra)
+
+
+def load_master_index(folder='.', cache=None, master_df=None):
+    """MasterIndex for the current master file, through the persistent disk cache (master_df: already loaded master)."""
+    path = masters.find_master_file(folder)
+
+    def build(p):
+        return MasterIndex.from_frame(master_df if master_df is not None else masters.load_master(folder, cache=cache))
+    return cached_load(path, INDEX_VERSION, build, cache)
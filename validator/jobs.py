@@ -0,0 +1,343 @@
+import os
+import json
+import time
+import uuid
+import pickle
+import shutil
+import sqlite3
+import threading
+from contextlib import ExitStack
+
+import pandas as pd
+
+from validator import colorcheck, colors, names, perf, rules
+from validator.cache import CACHE_DIR
+from validator.colorcache import ColorCache
+from validator.findings import Findings
+from validator.userfile import clean_user_file
+from validator.zipstream import ImageZip
+
+# ==========================================
+# ⏳ BACKGROUND JOBS (Tabs 1, 3, 4)
+# Long checks run on a server thread instead of in the button
+# handler, so a rerun or a closed browser doesn't lose them.
+# Inputs are copied to a job folder; every row / image chunk is
+# checkpointed to SQLite as it finishes. An interrupted job
+# (server restart, cancel, error) resumes at the first chunk
+# without a checkpoint. Results stay downloadable until pruned.
+# ==========================================
+
+JOB_THREADS = int(os.environ.get("VALIDATOR_JOB_THREADS", "1"))
+JOB_KEEP_DAYS = float(os.environ.get("VALIDATOR_JOB_KEEP_DAYS", "7"))
+CHUNK_ROWS = 50_000     # Tab 1 / Tab 3 rows per checkpoint
+CHUNK_IMAGES = 200      # Tab 4 images per checkpoint
+
+# 'queued' -> 'running' -> 'done' / 'failed' / 'cancelled' (the last two can be resumed)
+FINISHED = ("done", "failed", "cancelled")
+UNITS = {"data": "rows", "names": "names", "colors": "images"}
+
+
+class JobStore:
+    """SQLite job table + one checkpoint row per finished chunk; job inputs live in <root>/jobs/<id>/."""
+
+    def __init__(self, root=CACHE_DIR):
+        self.folder = os.path.join(root, "jobs")
+        os.makedirs(self.folder, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit + WAL, like the color cache; one connection shared by the runner threads
+        self.db = sqlite3.connect(os.path.join(root, "jobs.sqlite"), timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY, kind TEXT NOT NULL, label TEXT, owner TEXT, params TEXT NOT NULL,
+            status TEXT NOT NULL, error TEXT, chunks INTEGER, items INTEGER,
+            created REAL NOT NULL, updated REAL NOT NULL)""")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS checkpoints (
+            job TEXT NOT NULL, seq INTEGER NOT NULL, items INTEGER NOT NULL, seconds REAL NOT NULL, result BLOB NOT NULL,
+            PRIMARY KEY (job, seq))""")
+
+    def _sql(self, query, args=()):
+        with self._lock:
+            return self.db.execute(query, args).fetchall()
+
+    # ---------- Jobs ----------
+    def create(self, kind, inputs, params=None, label=None, owner=None):
+        """
+        New queued job. inputs: file name -> bytes or a file-like object (copied into the job folder).
+        Returns the job id.
+        """
+        job_id = uuid.uuid4().hex[:12]
+        folder = self.path(job_id)
+        os.makedirs(folder)
+        for name, data in inputs.items():
+            with open(os.path.join(folder, name), 'wb') as f:
+                if isinstance(data, bytes): f.write(data)
+                else:
+                    if hasattr(data, 'seek'): data.seek(0)
+                    shutil.copyfileobj(data, f, 1 << 20)
+        now = time.time()
+        self._sql("INSERT INTO jobs VALUES (?, ?, ?, ?, ?, 'queued', NULL, NULL, NULL, ?, ?)",
+                  (job_id, kind, label, owner, json.dumps(params or {}), now, now))
+        return job_id
+
+    def path(self, job_id, name=None):
+        folder = os.path.join(self.folder, job_id)
+        return folder if name is None else os.path.join(folder, name)
+
+    def get(self, job_id):
+        """Job as a dict with progress figures (see progress()), or None."""
+        rows = self._sql("SELECT id, kind, label, owner, params, status, error, chunks, items, created, updated FROM jobs WHERE id = ?", (job_id,))
+        if not rows: return None
+        keys = ("id", "kind", "label", "owner", "params", "status", "error", "chunks", "items", "created", "updated")
+        job = dict(zip(keys, rows[0]))
+        job["params"] = json.loads(job["params"])
+        job.update(self.progress(job))
+        return job
+
+    def jobs(self, owner=None, ids=()):
+        """Jobs of an owner and/or with the given ids, newest first."""
+        ids = list(ids)
+        query = "SELECT id FROM jobs WHERE owner = ?" + (f" OR id IN ({','.join('?' * len(ids))})" if ids else "")
+        found = [r[0] for r in self._sql(query + " ORDER BY created DESC", (owner, *ids))]
+        return [job for job in map(self.get, found) if job]
+
+    def set_status(self, job_id, status, error=None, only_from=None):
+        """Returns False if only_from is given and the job was in another state."""
+        query = "UPDATE jobs SET status = ?, error = ?, updated = ? WHERE id = ?"
+        args = [status, error, time.time(), job_id]
+        if only_from:
+            query += f" AND status IN ({','.join('?' * len(only_from))})"
+            args += list(only_from)
+        with self._lock:
+            return self.db.execute(query, args).rowcount > 0
+
+    def set_plan(self, job_id, chunks, items, params):
+        self._sql("UPDATE jobs SET chunks = ?, items = ?, params = ?, updated = ? WHERE id = ?",
+                  (chunks, items, json.dumps(params), time.time(), job_id))
+
+    def claim(self):
+        """Next queued job, marked running (None if the queue is empty)."""
+        with self._lock:
+            for (job_id,) in self.db.execute("SELECT id FROM jobs WHERE status = 'queued' ORDER BY created").fetchall():
+                cur = self.db.execute("UPDATE jobs SET status = 'running', error = NULL, updated = ? WHERE id = ? AND status = 'queued'",
+                                      (time.time(), job_id))
+                if cur.rowcount: return job_id
+        return None
+
+    def requeue_interrupted(self):
+        """Jobs left 'running' by a previous server process go back to the queue."""
+        self._sql("UPDATE jobs SET status = 'queued', updated = ? WHERE status = 'running'", (time.time(),))
+
+    def prune(self, keep_days=JOB_KEEP_DAYS):
+        """Delete finished jobs (rows, checkpoints, inputs) not touched for keep_days."""
+        cutoff = time.time() - keep_days * 86400
+        old = [r[0] for r in self._sql("SELECT id FROM jobs WHERE status IN ('done', 'failed', 'cancelled') AND updated < ?", (cutoff,))]
+        for job_id in old:
+            self._sql("DELETE FROM checkpoints WHERE job = ?", (job_id,))
+            self._sql("DELETE FROM jobs WHERE id = ?", (job_id,))
+            shutil.rmtree(self.path(job_id), ignore_errors=True)
+
+    # ---------- Checkpoints ----------
+    def save_chunk(self, job_id, seq, result, items, seconds):
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        self._sql("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)", (job_id, seq, items, seconds, blob))
+        self._sql("UPDATE jobs SET updated = ? WHERE id = ?", (time.time(), job_id))
+
+    def done_chunks(self, job_id):
+        return {r[0] for r in self._sql("SELECT seq FROM checkpoints WHERE job = ?", (job_id,))}
+
+    def chunk_results(self, job_id):
+        """Checkpointed chunk results in chunk order."""
+        return [pickle.loads(r[0]) for r in self._sql("SELECT result FROM checkpoints WHERE job = ? ORDER BY seq", (job_id,))]
+
+    def progress(self, job):
+        """done_chunks / done_items / seconds of work, rate (items/s) and eta (s) from the checkpoints."""
+        n, items, seconds = self._sql("SELECT COUNT(*), COALESCE(SUM(items), 0), COALESCE(SUM(seconds), 0) FROM checkpoints WHERE job = ?",
+                                      (job["id"],))[0]
+        rate = items / seconds if seconds else None
+        left = (job["items"] or 0) - items
+        eta = left / rate if rate and job["status"] in ("queued", "running") else None
+        return {"done_chunks": n, "done_items": items, "seconds": seconds, "rate": rate, "eta": eta}
+
+    def close(self):
+        self.db.close()
+
+
+# ---------- Job kinds ----------
+# plan(job, store, shared, stack) -> (chunk bounds, run(start, stop) -> chunk result);
+#   may add to job["params"] (saved with the plan)
+# combine(job, chunk results) -> the job's result
+
+def _user_df(job, store):
+    with open(store.path(job["id"], job["params"]["user_file"]), 'rb') as f:
+        return clean_user_file(f)
+
+
+def _bounds(n, size):
+    return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+def _plan_data(job, store, shared, stack):
+    user_df = _user_df(job, store)
+    index = shared("master")
+    active_map = index.active_map(user_df.columns)
+    rule_set = rules.load_rules()
+    job["params"]["columns"] = list(active_map.values())
+    return _bounds(len(user_df), CHUNK_ROWS), lambda a, b: index.findings(user_df.iloc[a:b], active_map, rules=rule_set)
+
+
+def _combine_data(job, parts):
+    """Findings buffer (columns in mapping order)."""
+    return Findings.concat(parts, job["params"].get("columns", ()))
+
+
+def _plan_names(job, store, shared, stack):
+    user_df = _user_df(job, store)
+    name_index = shared("names")
+    col = user_df[job["params"]["column"]]
+    return _bounds(len(col), CHUNK_ROWS), lambda a, b: names.analyze_names(col.iloc[a:b], name_index)
+
+
+def _combine_names(job, parts):
+    """Report records (Row/Name/Issue/Details)."""
+    return [rec for part in parts for rec in part]
+
+
+def _plan_colors(job, store, shared, stack):
+    p = job["params"]
+    user_df = _user_df(job, store)
+    zf = stack.enter_context(ImageZip(store.path(job["id"], "images.zip")))
+    cache = stack.enter_context(ColorCache(method=p.get("method"), regions=p.get("regions", True)))
+    color_col_map = colorcheck.color_columns(user_df)
+    name_col = colorcheck.color_name_column(user_df)
+    image_files = zf.image_names()
+    # One worker pool for the whole job, not one forkserver start per chunk
+    pool = colors.color_pool(p.get("workers"))
+    if pool: stack.callback(pool.shutdown, cancel_futures=True)
+
+    def run(a, b):
+        return colorcheck.run_color_check(user_df, zf, color_col_map, name_col, workers=p.get("workers"), method=p.get("method"),
+                                          cache=cache, regions=p.get("regions", True), image_files=image_files[a:b],
+                                          executor=pool)
+    return _bounds(len(image_files), CHUNK_IMAGES), run
+
+
+def _combine_colors(job, parts):
+    """(results, skipped) like colorcheck.run_color_check."""
+    return [r for results, _ in parts for r in results], [s for _, skipped in parts for s in skipped]
+
+
+KINDS = {
+    "data": (_plan_data, _combine_data),
+    "names": (_plan_names, _combine_names),
+    "colors": (_plan_colors, _combine_colors),
+}
+
+
+class JobRunner:
+    """
+    JOB_THREADS threads taking queued jobs from a JobStore.
+    shared(item) returns the current master build ('master' / 'names'), waiting while it loads.
+    """
+
+    def __init__(self, store, shared, threads=JOB_THREADS):
+        self.store = store
+        self.shared = shared
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        store.requeue_interrupted()
+        store.prune()
+        self.threads = [threading.Thread(target=self._loop, name=f"job-runner-{i}", daemon=True) for i in range(max(threads, 1))]
+        for t in self.threads: t.start()
+
+    def submit(self, kind, inputs, params=None, label=None, owner=None):
+        if kind not in KINDS: raise ValueError(f"Unknown job kind '{kind}' (use {', '.join(KINDS)}).")
+        job_id = self.store.create(kind, inputs, params, label, owner)
+        self._wake.set()
+        return job_id
+
+    def cancel(self, job_id):
+        """Stops the job after its current chunk; checkpoints are kept for a resume."""
+        return self.store.set_status(job_id, "cancelled", only_from=("queued", "running"))
+
+    def resume(self, job_id):
+        """Queue a failed / cancelled job again; it continues after its last checkpoint."""
+        ok = self.store.set_status(job_id, "queued", only_from=("failed", "cancelled"))
+        if ok: self._wake.set()
+        return ok
+
+    def result(self, job_id):
+        """Combined result of a finished job (see the combine functions), or None."""
+        job = self.store.get(job_id)
+        if job is None or job["status"] != "done": return None
+        return KINDS[job["kind"]][1](job, self.store.chunk_results(job_id))
+
+    def export(self, job_id, fmt="csv"):
+        """
+        Download bytes of a finished job, or None: Tab 1 jobs as CSV / XLSX (Findings.export),
+        the other kinds as CSV.
+        """
+        job, result = self.store.get(job_id), self.result(job_id)
+        if result is None: return None
+        if job["kind"] == "data": return result.export(fmt)
+        if job["kind"] == "colors": frame = pd.concat([pd.DataFrame(result[0]), pd.DataFrame(result[1])], ignore_index=True)
+        else: frame = pd.DataFrame(result)
+        return frame.to_csv(index=False).encode('utf-8')
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            job_id = self.store.claim()
+            if job_id is None:
+                self._wake.wait(5)
+                self._wake.clear()
+                continue
+            try:
+                self._run(job_id)
+            except Exception as e:
+                self.store.set_status(job_id, "failed", str(e), only_from=("running",))
+
+    def _run(self, job_id):
+        job = self.store.get(job_id)
+        plan, _ = KINDS[job["kind"]]
+        with ExitStack() as stack, perf.stage(f"job.{job['kind']}"):
+            bounds, run = plan(job, self.store, self.shared, stack)
+            self.store.set_plan(job_id, len(bounds), bounds[-1][1] if bounds else 0, job["params"])
+            done = self.store.done_chunks(job_id)
+            for seq, (a, b) in enumerate(bounds):
+                if seq in done: continue
+                if self.store.get(job_id)["status"] != "running": return  # cancelled
+                t0 = time.perf_counter()
+                result = run(a, b)
+                self.store.save_chunk(job_id, seq, result, b - a, time.perf_counter() - t0)
+        self.store.set_status(job_id, "done", only_from=("running",))
+
+
+def start_runner(shared, root=CACHE_DIR, threads=JOB_THREADS):
+    return JobRunner(JobStore(root), shared, threads)
+
+
+def _clock(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def job_frame(jobs):
+    """Jobs as a table for the UI: progress, throughput and ETA."""
+    rows = []
+    for job in jobs:
+        unit = UNITS.get(job["kind"], "items")
+        total = job["items"]
+        rows.append({
+            "Job": job["id"], "Check": job["kind"], "File": job["label"], "Status": job["status"],
+            "Progress": job["done_items"] / total if total else (1.0 if job["status"] == "done" else 0.0),
+            "Done": f"{job['done_items']:,} / {total:,} {unit}" if total is not None else "",
+            "Throughput": f"{job['rate']:,.1f} {unit}/s" if job["rate"] else "",
+            "ETA": _clock(job["eta"]) if job["eta"] is not None else "",
+            "Created": time.strftime("%Y-%m-%d %H:%M", time.localtime(job["created"])),
+            "Error": job["error"] or "",
+        })
+    return pd.DataFrame(rows)
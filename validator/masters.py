@@ -0,0 +1,311 @@
+import os
+import re
+
+import pandas as pd
+
+from validator import perf
+from validator.cache import cached_load
+from validator.formats import CSV_ENCODINGS, cell_text, dedupe, read_head, sniff_csv, sniff_kind
+
+# ==========================================
+# 📚 MASTER FILE LOADERS (Streamlit-free)
+# app.py wraps these with st.cache_data + error display.
+# ==========================================
+
+# Bump when parsing/filtering changes so old disk cache entries are ignored.
+MASTER_VERSION = "master-v2"
+COMPACT_MASTER_VERSION = "master-compact-v3"
+NAME_MASTER_VERSION = "name-master-v2"
+CSV_DIALECT_VERSION = "csv-dialect-v1"
+
+# "compact" = only the IDEAL_PAIRS columns, Glasses rows filtered while reading,
+# categorical/Arrow storage. "full" = every column as str (the original loader).
+MASTER_MODE = os.environ.get("VALIDATOR_MASTER_MODE", "compact")
+
+# Master column name -> user column ID
+IDEAL_PAIRS = {
+    "Glasses type": "Glasses type ID",
+    "Manufacturer": "Manufacturer ID",
+    "Glasses size: glasses width": "width ID",
+    "Glasses size: temple length": "temple length ID",
+    "Glasses size: lens height": "lens height ID",
+    "Glasses size: lens width": "lens width ID",
+    "Glasses size: bridge": "bridge ID",
+    "Glasses shape": "Glasses shape ID",
+    "Glasses other info": "other info ID",
+    "Glasses frame type": "frame type ID",
+    "Glasses frame color": "Frame Colour ID",
+    "Glasses temple color": "Temple Colour ID",
+    "Glasses main material": "main material ID",
+    "Glasses lens color": "lens Colour ID",
+    "Glasses lens material": "lens material ID",
+    "Glasses lens effect": "lens effect ID",
+    "Sunglasses filter": "Sunglasses filter ID",
+    "Glasses genre": "Glasses gendre ID",
+    "Glasses usable": "Glasses usable ID",
+    "Glasses collection": "Glasses collection ID",
+    "UV filter": "UV filter ID",
+    "Items type": "Items type ID",
+    "Items packing": "Items packing ID",
+    "Glasses contain": "Glasses contain ID",
+    "Sport glasses": "Sports Glasses ID",
+    "Glasses frame color effect": "frame color effect ID",
+    "Glasses other features": "other features ID",
+    "SunGlasses RX lenses": "RX lenses ID",
+    "Glasses clip-on lens color": "clip-on lens colour ID",
+    "Brand": "Brand ID",
+    "Producing company": "Producing company ID",
+    "Glasses for your face shape": "face shape ID",
+    "Glasses lenses no-orders": "no-orders ID"
+}
+
+
+class MasterLoadError(Exception):
+    """Master file missing or unreadable."""
+
+
+def clean_header(name):
+    return re.sub(r'\s+', ' ', str(name)).strip()
+
+
+def clean_headers(df):
+    df.columns = df.columns.astype(str).str.replace(r'\s+', ' ', regex=True).str.strip()
+    return df
+
+
+def find_master_file(folder='.'):
+    # Exclude 'name_master' so we don't accidentally load the wrong file here
+    candidates = [f for f in os.listdir(folder) if (f.endswith('.xlsx') or f.endswith('.csv')) and "mistakes" not in f and "name_master" not in f and not f.startswith('~$')]
+    if not candidates:
+        raise MasterLoadError("No Master File found!")
+    return os.path.join(folder, candidates[0])
+
+
+def find_name_master_file(folder='.'):
+    target = os.path.join(folder, "name_master_clean.xlsx")
+    if os.path.exists(target): return target
+    candidates = [f for f in os.listdir(folder) if "name_master" in f and not f.startswith('~$')]
+    if not candidates: return None
+    return os.path.join(folder, candidates[0])
+
+
+def csv_dialect(file_path, cache=None):
+    """(encoding, delimiter) sniffed from the first bytes of a CSV, remembered per file version."""
+    return cached_load(file_path, CSV_DIALECT_VERSION, lambda p: sniff_csv(read_head(p)), cache)
+
+
+def read_csv_sniffed(file_path, cache=None, dialect=None, **kwargs):
+    """
+    Exactly one C-engine parse with the sniffed dialect.
+    Only a non-UTF-8 byte past the sniffed sample costs another parse (cp1252, then latin1).
+    Takes a path or a binary file object (e.g. an upload); pass 'dialect' if it's already sniffed.
+    The encoding that worked lands in df.attrs['csv'].
+    """
+    is_path = isinstance(file_path, (str, os.PathLike))
+    if dialect is None: dialect = csv_dialect(file_path, cache) if is_path else sniff_csv(read_head(file_path))
+    encoding, sep = dialect
+    kwargs.setdefault('on_bad_lines', 'skip')
+    pos = None if is_path else file_path.tell()
+    encodings = [encoding] + CSV_ENCODINGS[CSV_ENCODINGS.index(encoding) + 1:]
+    for enc in encodings:
+        if pos is not None: file_path.seek(pos)
+        try:
+            df = pd.read_csv(file_path, dtype=str, encoding=enc, sep=sep, **kwargs)
+        except UnicodeDecodeError:
+            continue
+        df.attrs['csv'] = {"encoding": enc, "sep": sep}
+        return df
+
+
+def read_master_table(file_path, on_fallback=None, cache=None, **kwargs):
+    """
+    Excel or CSV, decided from the file's first bytes (no parse-and-retry).
+    Returns None if the file can't be parsed.
+    """
+    try:
+        kind = sniff_kind(read_head(file_path))
+        if kind == "xlsx": return pd.read_excel(file_path, dtype=str, engine='openpyxl', **kwargs)
+        if kind == "xls": return pd.read_excel(file_path, dtype=str, **kwargs)
+        df = read_csv_sniffed(file_path, cache, **kwargs)
+    except Exception:
+        return None
+    if on_fallback: on_fallback(file_path)
+    return df
+
+
+@perf.timed("master.parse")
+def parse_master(file_path, on_fallback=None, cache=None):
+    """
+    TRULY INDESTRUCTIBLE LOADER
+    1. Sniffs the file: Excel (.xlsx/.xls) or CSV.
+    2. CSV: encoding + separator detected from a sample, then one C-engine parse.
+    Returns the header-cleaned, Glasses-only frame.
+    """
+    df = read_master_table(file_path, on_fallback, cache)
+
+    if df is None:
+        raise MasterLoadError(f"Could not read '{file_path}' as Excel or CSV.")
+
+    # Clean headers
+    clean_headers(df)
+
+    # Filter for 'Glasses'
+    target_col = next((c for c in df.columns if "Items type" in c), None)
+    if not target_col:
+        raise MasterLoadError("'Items type' column missing in Master File.")
+    return df[df[target_col] == "Glasses"]
+
+
+@perf.timed("names.parse")
+def parse_name_master(target_filename, cache=None):
+    """
+    SURGICAL LOADER.
+    Only loads columns 'name' and 'name_private'.
+    Ignores everything else to run fast.
+    Returns the list of unique 'glasses' names, or None.
+    """
+    # DEFINING THE FILTER:
+    # We use a lambda function to tell Pandas WHICH columns to keep.
+    def column_filter(col_name):
+        if not isinstance(col_name, str): return False
+        c = col_name.strip().lower()
+        return c == "name" or "name_private" in c
+
+    df = read_master_table(target_filename, cache=cache, usecols=column_filter)
+    if df is None: return None
+
+    # Clean Headers
+    clean_headers(df)
+
+    # 1. FILTER: Column 'name_private' must contain "glasses"
+    private_col = next((c for c in df.columns if "name_private" in c), None)
+    if not private_col: return None
+
+    filtered_df = df[df[private_col].str.contains("glasses", case=False, na=False)]
+
+    # 2. TARGET: Column 'name'
+    name_col = next((c for c in df.columns if "name" == c or "name" == c.strip()), None)
+    if not name_col: return None
+
+    return filtered_df[name_col].dropna().unique().tolist()
+
+
+# ==========================================
+# 🪶 COMPACT MASTER LOADER
+# Only what Tab 1 reads: IDEAL_PAIRS columns of Glasses rows.
+# ==========================================
+def master_column_wanted(name):
+    """True for 'Items type' and every master column an IDEAL_PAIRS key matches."""
+    c = clean_header(name)
+    return "Items type" in c or any(mk in c for mk in IDEAL_PAIRS)
+
+
+def _read_excel_compact(file_path):
+    """Stream the first sheet with openpyxl read-only, keeping wanted columns of Glasses rows only."""
+    import openpyxl
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = wb.worksheets[0]
+        # Read-only mode trusts the sheet's <dimension> tag, which other tools often leave stale
+        sheet.reset_dimensions()
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None: raise MasterLoadError(f"'{file_path}' is empty.")
+        names = dedupe([f"Unnamed: {i}" if h is None else str(h) for i, h in enumerate(header)])
+        keep = [i for i, n in enumerate(names) if master_column_wanted(n)]
+        type_pos = next((i for i in keep if "Items type" in clean_header(names[i])), None)
+        if type_pos is None:
+            raise MasterLoadError("'Items type' column missing in Master File.")
+
+        cols = {i: [] for i in keep}
+        index = []
+        for r, row in enumerate(rows):
+            if type_pos >= len(row) or cell_text(row[type_pos]) != "Glasses": continue
+            index.append(r)
+            for i in keep:
+                cols[i].append(cell_text(row[i]) if i < len(row) else None)
+    finally:
+        wb.close()
+    return pd.DataFrame({names[i]: pd.Series(cols[i], dtype=object) for i in keep}).set_axis(pd.Index(index), axis=0), len(names)
+
+
+def _read_csv_compact(file_path, on_fallback=None, cache=None):
+    """CSV fallback: wanted columns only, Glasses rows filtered chunk by chunk, one pass with the sniffed dialect."""
+    encoding, sep = csv_dialect(file_path, cache)
+    encodings = [encoding] + CSV_ENCODINGS[CSV_ENCODINGS.index(encoding) + 1:]
+    for enc in encodings:
+        try:
+            header = pd.read_csv(file_path, dtype=str, encoding=enc, sep=sep, nrows=0).columns
+            reader = pd.read_csv(file_path, dtype=str, encoding=enc, sep=sep, on_bad_lines='skip',
+                                 usecols=master_column_wanted, chunksize=50_000)
+            parts = []
+            for chunk in reader:
+                type_col = next((c for c in chunk.columns if "Items type" in clean_header(c)), None)
+                if type_col is None: raise MasterLoadError("'Items type' column missing in Master File.")
+                parts.append(chunk[chunk[type_col] == "Glasses"])
+        except UnicodeDecodeError:
+            continue
+        except MasterLoadError:
+            raise
+        except Exception:
+            break
+        if not parts: break
+        if on_fallback: on_fallback(file_path)
+        return pd.concat(parts), len(header)
+    raise MasterLoadError(f"Could not read '{file_path}' as Excel or CSV.")
+
+
+def compact_frame(df, high_cardinality=0.5):
+    """Object string columns -> category (repetitive) or Arrow strings (mostly unique)."""
+    out = {}
+    for c in df.columns:
+        col = df[c].astype(object)
+        n = col.count()
+        if n and col.nunique() / n > high_cardinality:
+            try:
+                out[c] = col.astype("string[pyarrow]")
+                continue
+            except (ImportError, TypeError):
+                pass
+        out[c] = col.astype("category")
+    return pd.DataFrame(out, index=df.index)
+
+
+@perf.timed("master.parse_compact")
+def parse_master_compact(file_path, on_fallback=None, cache=None):
+    """
+    Memory-compact variant of parse_master: same Glasses rows, only the columns Tab 1 uses,
+    stored as categoricals / Arrow strings. Memory figures land in df.attrs['memory'].
+    """
+    try:
+        kind = sniff_kind(read_head(file_path))
+    except OSError as e:
+        raise MasterLoadError(f"Could not read '{file_path}': {e}")
+    if kind == "xlsx": df, total_cols = _read_excel_compact(file_path)
+    else: df, total_cols = _read_csv_compact(file_path, on_fallback, cache)
+
+    clean_headers(df)
+    before = df.astype(object).memory_usage(deep=True).sum()
+    df = compact_frame(df)
+    df.attrs['memory'] = {
+        "object_mb": round(float(before) / 1024 / 1024, 2),
+        "compact_mb": round(float(df.memory_usage(deep=True).sum()) / 1024 / 1024, 2),
+        "columns_loaded": len(df.columns),
+        "columns_total": total_cols,
+    }
+    return df
+
+
+def load_master(folder='.', on_fallback=None, cache=None, mode=None):
+    """Find + parse the main master ('compact' or 'full' mode), through the persistent disk cache."""
+    path = find_master_file(folder)
+    if (mode or MASTER_MODE) == "full":
+        return cached_load(path, MASTER_VERSION, lambda p: parse_master(p, on_fallback, cache), cache)
+    return cached_load(path, COMPACT_MASTER_VERSION, lambda p: parse_master_compact(p, on_fallback, cache), cache)
+
+
+def load_name_master(folder='.', cache=None):
+    """Find + parse the name master (None if missing/unreadable), through the disk cache."""
+    path = find_name_master_file(folder)
+    if path is None: return None
+    return cached_load(path, NAME_MASTER_VERSION, lambda p: parse_name_master(p, cache), cache)
@@ -0,0 +1,127 @@
+import os
+import sys
+import time
+import threading
+
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 📏 MEMORY ACCOUNTING (server mode)
+# Master data lives once per server process (the background
+# worker's builds) and is shared by every session. What a session
+# keeps between runs (its user file, findings, memos) is its own;
+# the admin page lists both so the resident footprint adds up.
+# ==========================================
+
+# Sessions not seen for this long are dropped from the table
+SESSION_IDLE_SECONDS = float(os.environ.get("VALIDATOR_SESSION_IDLE_SECONDS", "3600"))
+
+
+def deep_size(obj, exclude=()):
+    """
+    Approximate bytes held by obj and everything it references.
+    Objects with an nbytes() method report themselves; DataFrames use memory_usage(deep=True).
+    Objects in exclude (e.g. shared master data) and anything reachable only through them are not counted.
+    """
+    seen = {id(o) for o in exclude if o is not None}
+    total, stack = 0, [obj]
+    while stack:
+        o = stack.pop()
+        if o is None or id(o) in seen: continue
+        seen.add(id(o))
+        if isinstance(o, (pd.DataFrame, pd.Series, pd.Index)):
+            usage = o.memory_usage(deep=True)
+            total += int(usage.sum() if isinstance(usage, pd.Series) else usage)
+        elif isinstance(o, np.ndarray):
+            total += o.nbytes
+            if o.dtype == object: stack.extend(o.ravel().tolist())
+        elif callable(getattr(o, "nbytes", None)):
+            total += int(o.nbytes())
+        elif isinstance(o, (str, bytes, int, float, bool)):
+            total += sys.getsizeof(o)
+        elif isinstance(o, dict):
+            total += sys.getsizeof(o)
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            total += sys.getsizeof(o)
+            stack.extend(o)
+        elif hasattr(o, "__dict__"):
+            total += sys.getsizeof(o)
+            stack.append(vars(o))
+        else:
+            total += sys.getsizeof(o)
+    return total
+
+
+def process_rss():
+    """Resident set size of this process in bytes (peak RSS where /proc is missing; None if unknown)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"): return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class SessionRegistry:
+    """
+    Last known footprint of every session on this server:
+    session id -> bytes per session_state key, last seen, and the shared build it ran against.
+    Sizes are remembered per object, so an unchanged user file isn't measured again on every rerun.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def update(self, session_id, state, shared=(), build=None):
+        """Measure a session's state (a mapping); objects in shared are not counted."""
+        with self._lock:
+            prev = self._sessions.get(session_id, {}).get("objects", {})
+        objects, sizes = {}, {}
+        for key, value in dict(state).items():
+            known = prev.get(key)
+            if known and known[0] == id(value) and not callable(getattr(value, "nbytes", None)):
+                size = known[1]
+            else:
+                size = deep_size(value, exclude=shared)
+            objects[key] = (id(value), size)
+            sizes[key] = size
+        with self._lock:
+            self._sessions[session_id] = {"sizes": sizes, "objects": objects, "seen": time.time(), "build": build}
+
+    def forget(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def prune(self, max_idle=SESSION_IDLE_SECONDS):
+        """Drop sessions not seen for max_idle seconds."""
+        cutoff = time.time() - max_idle
+        with self._lock:
+            for sid in [s for s, info in self._sessions.items() if info["seen"] < cutoff]:
+                del self._sessions[sid]
+
+    def sessions(self):
+        """(session id, sizes, last seen, build) per session, most recently seen first."""
+        with self._lock:
+            items = [(sid, dict(info["sizes"]), info["seen"], info["build"]) for sid, info in self._sessions.items()]
+        return sorted(items, key=lambda item: item[2], reverse=True)
+
+    def holders(self):
+        """Shared build -> number of sessions whose last run used it."""
+        counts = {}
+        for _, _, _, build in self.sessions():
+            counts[build] = counts.get(build, 0) + 1
+        return counts
+
+
+# One per server process: every session of the app and the admin page see the same registry
+SESSIONS = SessionRegistry()
@@ -0,0 +1,208 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from thefuzz import fuzz
+
+from validator import masters, perf
+from validator.cache import cached_load
+
+# ==========================================
+# 🧬 SYNTAX & DUPLICATES (Tab 3)
+# ==========================================
+
+NAME_INDEX_VERSION = "name-index-v3"
+NEAR_MIN_SCORE = int(os.environ.get("VALIDATOR_NEAR_DUP_SCORE", 90))  # 0-100, fuzz.ratio on the name keys
+NEAR_TOP_K = 3
+NEAR_CANDIDATES = 64  # best trigram-overlap candidates that get a real fuzz score
+NEAR_POSTINGS_BUDGET = 20_000  # rare trigrams first; stop collecting postings after this many ids
+NEAR_MEMO_MAX = 200_000  # remembered query results (re-uploads only look up names they have not seen)
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+class _SkeletonTable(dict):
+    """
+    str.translate table: upper -> 'A', lower -> 'a', digit -> '0', anything else unchanged.
+    Latin ranges are precomputed; other code points are classified once on first sight.
+    """
+
+    def __missing__(self, code):
+        char = chr(code)
+        if char.isupper(): out = "A"
+        elif char.islower(): out = "a"
+        elif char.isdigit(): out = "0"
+        else: out = char
+        self[code] = out
+        return out
+
+
+SKELETON_TABLE = _SkeletonTable()
+for _code in range(0x250):
+    SKELETON_TABLE[_code]
+
+
+def get_skeleton(text):
+    if not isinstance(text, str): return ""
+    return text.translate(SKELETON_TABLE)
+
+
+def skeletons(series):
+    """get_skeleton over a whole Series of strings."""
+    return series.str.translate(SKELETON_TABLE)
+
+
+def name_key(text):
+    """Normalized name key: case-folded, punctuation and spaces dropped ('Ray-Ban 3025' -> 'rayban3025')."""
+    return _NON_ALNUM.sub("", text.casefold())
+
+
+def trigrams(key):
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NearDuplicateIndex:
+    """
+    Near-duplicate lookup over the name master:
+    - keys:     unique normalized name keys (exact hit = score 100)
+    - labels:   one original master name per key, for reports
+    - postings: trigram -> sorted int32 array of key ids
+    A query scores only the keys sharing the most (rarest-first) trigrams, never the whole master.
+    Results are remembered per name, so re-uploading a fixed file only queries the new names.
+    """
+
+    def __init__(self, keys, labels, postings):
+        self.keys = keys
+        self.labels = labels
+        self.postings = postings
+        self.key_ids = {k: i for i, k in enumerate(keys)}
+        self._memo = {}
+
+    @classmethod
+    @perf.timed("names.near_index_build")
+    def from_list(cls, name_master_list):
+        labels = {}
+        for n in name_master_list:
+            n = n.strip()
+            k = name_key(n)
+            if k and k not in labels: labels[k] = n
+        keys = list(labels)
+        grams = {}
+        for i, k in enumerate(keys):
+            for g in trigrams(k): grams.setdefault(g, []).append(i)
+        postings = {g: np.array(ids, dtype=np.int32) for g, ids in grams.items()}
+        return cls(keys, list(labels.values()), postings)
+
+    def __getstate__(self):
+        return {"keys": self.keys, "labels": self.labels, "postings": self.postings}
+
+    def __setstate__(self, state):
+        self.__init__(state["keys"], state["labels"], state["postings"])
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _candidates(self, key):
+        lists = sorted((self.postings[g] for g in trigrams(key) if g in self.postings), key=len)
+        picked, total = [], 0
+        for ids in lists:
+            if picked and total + len(ids) > NEAR_POSTINGS_BUDGET: break
+            picked.append(ids)
+            total += len(ids)
+        if not picked: return []
+        ids, counts = np.unique(np.concatenate(picked), return_counts=True)
+        if len(ids) > NEAR_CANDIDATES:
+            ids = ids[np.argpartition(-counts, NEAR_CANDIDATES)[:NEAR_CANDIDATES]]
+        return ids
+
+    def query(self, name, k=NEAR_TOP_K, min_score=NEAR_MIN_SCORE):
+        """Top-k (master name, score) pairs with score >= min_score, best first."""
+        memo_key = (name, k, min_score)
+        hits = self._memo.get(memo_key)
+        if hits is None:
+            if len(self._memo) >= NEAR_MEMO_MAX: self._memo.clear()
+            with perf.stage("tab3.near_query"):
+                hits = self._memo[memo_key] = self._query(name, k, min_score)
+        return list(hits)
+
+    def _query(self, name, k, min_score):
+        key = name_key(name)
+        if not key: return []
+        exact = self.key_ids.get(key)
+        hits = [] if exact is None else [(self.labels[exact], 100)]
+        for i in self._candidates(key):
+            if i == exact: continue
+            score = fuzz.ratio(key, self.keys[i])
+            if score >= min_score: hits.append((self.labels[i], score))
+        hits.sort(key=lambda h: -h[1])
+        return hits[:k]
+
+
+class NameIndex:
+    """Exact names, name skeletons and the near-duplicate index of the name master, built once per name-master version."""
+
+    def __init__(self, names, skeleton_set, n_names=0, near=None):
+        self.names = names
+        self.skeletons = skeleton_set
+        self.n_names = n_names
+        self.near = near
+
+    @classmethod
+    @perf.timed("names.index_build")
+    def from_list(cls, name_master_list):
+        s = pd.Series(name_master_list, dtype=object)
+        return cls(frozenset(s.str.strip()), frozenset(skeletons(s)), len(s), NearDuplicateIndex.from_list(name_master_list))
+
+    def __len__(self):
+        return self.n_names
+
+
+def load_name_index(folder='.', cache=None):
+    """NameIndex for the current name master (None if there is none), through the disk cache."""
+    path = masters.find_name_master_file(folder)
+    if path is None: return None
+
+    def build(p):
+        name_master_list = masters.load_name_master(folder, cache=cache)
+        return NameIndex.from_list(name_master_list) if name_master_list else None
+    return cached_load(path, NAME_INDEX_VERSION, build, cache)
+
+
+def default_name_column(user_df):
+    """Position of the 'Glasses name' column (0 if missing)."""
+    return next((i for i, c in enumerate(user_df.columns) if "Glasses name" in c), 0)
+
+
+def analyze_names(user_names, name_index):
+    """
+    Duplicate, near-duplicate + skeleton check of a user name column against the name master.
+    name_index: NameIndex (or the raw name master list).
+    Returns report records (Row/Name/Issue/Details).
+    """
+    if not isinstance(name_index, NameIndex):
+        name_index = NameIndex.from_list(name_index)
+
+    with perf.stage("tab3.analyze", items=len(user_names)):
+        return _analyze(user_names, name_index)
+
+
+def _analyze(user_names, name_index):
+    clean = user_names.dropna().astype(str).astype(object).str.strip()
+    duplicate = clean.isin(name_index.names).to_numpy(dtype=bool)
+    skel = skeletons(clean)
+    suspicious = ~duplicate & ~skel.isin(name_index.skeletons).to_numpy(dtype=bool)
+
+    report = []
+    for row_idx, name, skeleton, is_dup, is_sus in zip(clean.index, clean, skel, duplicate, suspicious):
+        if is_dup:
+            report.append({"Row": row_idx + 2, "Name": name, "Issue": "❌ DUPLICATE", "Details": "Name already exists in master file."})
+            continue
+        similar = name_index.near.query(name) if name_index.near is not None else []
+        if similar:
+            report.append({"Row": row_idx + 2, "Name": name, "Issue": "🔁 NEAR DUPLICATE",
+                           "Details": "Similar to: " + ", ".join(f"'{n}' ({score})" for n, score in similar)})
+        elif is_sus:
+            report.append({"Row": row_idx + 2, "Name": name, "Issue": "⚠️ SUSPICIOUS SYNTAX", "Details": f"New Pattern: {skeleton}"})
+    return report
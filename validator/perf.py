@@ -0,0 +1,158 @@
+import io
+import os
+import json
+import time
+import pstats
+import cProfile
+import functools
+import threading
+
+# ==========================================
+# ⏱️ INSTRUMENTATION
+#   with perf.stage("tab1.check_column", items=len(col)): ...
+# Disabled (default) a stage is one shared no-op object, so the
+# hooks can stay in hot paths. Enabled, every stage adds to
+# per-name totals and a trace event (Chrome trace JSON format,
+# open with chrome://tracing or https://ui.perfetto.dev).
+# VALIDATOR_PERF=1 enables it at startup.
+# ==========================================
+
+ENABLED = os.environ.get("VALIDATOR_PERF", "") not in ("", "0")
+MAX_EVENTS = 100_000
+
+
+class _NoopStage:
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+    def add(self, n): pass
+
+
+_NOOP = _NoopStage()
+
+
+class Recorder:
+    """Per-stage totals {name: [calls, seconds, items]} + a bounded list of trace events."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.totals = {}
+            self.events = []
+            self.origin = time.perf_counter()
+
+    def record(self, name, start, seconds, items=0, pid=None, tid=None):
+        with self.lock:
+            t = self.totals.setdefault(name, [0, 0.0, 0])
+            t[0] += 1
+            t[1] += seconds
+            t[2] += items
+            if len(self.events) < MAX_EVENTS:
+                self.events.append((name, start, seconds, items, pid or os.getpid(), tid or threading.get_ident()))
+
+    def drain(self):
+        """Hand over everything recorded so far (ships worker-process timings back with their results)."""
+        with self.lock:
+            events = [(n, d, i, p, t) for n, _, d, i, p, t in self.events]
+            self.totals, self.events = {}, []
+        return events
+
+    def merge(self, events):
+        """Add events drained in another process; they are placed as ending now (clocks differ per process)."""
+        now = time.perf_counter()
+        for name, seconds, items, pid, tid in events:
+            self.record(name, now - seconds, seconds, items, pid, tid)
+
+
+RECORDER = Recorder()
+
+
+class _Stage:
+    __slots__ = ("name", "items", "start")
+
+    def __init__(self, name, items):
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        RECORDER.record(self.name, self.start, time.perf_counter() - self.start, self.items)
+        return False
+
+    def add(self, n):
+        self.items += n
+
+
+def stage(name, items=0):
+    """Context manager timing one stage; .add(n) counts processed items inside it."""
+    if not ENABLED: return _NOOP
+    return _Stage(name, items)
+
+
+def timed(name):
+    """Decorator form of stage() for whole functions."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not ENABLED: return fn(*args, **kwargs)
+            with _Stage(name, 0): return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def enable(on=True):
+    global ENABLED
+    ENABLED = bool(on)
+
+
+# ---------- Reports ----------
+def summary():
+    """One row per stage: calls, total/mean time, items and throughput; slowest first."""
+    with RECORDER.lock:
+        totals = {k: list(v) for k, v in RECORDER.totals.items()}
+    rows = []
+    for name, (calls, seconds, items) in totals.items():
+        rows.append({
+            "Stage": name, "Calls": calls, "Total s": round(seconds, 4),
+            "Mean ms": round(seconds / calls * 1000, 3) if calls else 0.0,
+            "Items": items, "Items/s": round(items / seconds, 1) if items and seconds else None,
+        })
+    return sorted(rows, key=lambda r: -r["Total s"])
+
+
+def trace():
+    """Chrome trace-event JSON (dict) of the recorded stages."""
+    with RECORDER.lock:
+        events, origin = list(RECORDER.events), RECORDER.origin
+    return {"traceEvents": [
+        {"name": name, "ph": "X", "ts": round((start - origin) * 1e6, 1), "dur": round(seconds * 1e6, 1),
+         "pid": pid, "tid": tid, "args": {"items": items} if items else {}}
+        for name, start, seconds, items, pid, tid in events
+    ], "displayTimeUnit": "ms"}
+
+
+def dump_trace(path):
+    with open(path, 'w') as f: json.dump(trace(), f)
+    return path
+
+
+# ---------- cProfile on demand ----------
+def start_profile():
+    """cProfile for the calling thread until save_profile()."""
+    prof = cProfile.Profile()
+    prof.enable()
+    return prof
+
+
+def save_profile(prof, path):
+    """Stop prof, write a .prof file (snakeviz / pstats) and return the top functions as text."""
+    prof.disable()
+    prof.dump_stats(path)
+    out = io.StringIO()
+    pstats.Stats(prof, stream=out).sort_stats("cumulative").print_stats(25)
+    return out.getvalue()
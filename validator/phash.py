@@ -0,0 +1,266 @@
+import os
+import time
+import sqlite3
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from validator import colorcheck, colors, images, perf
+from validator.cache import CACHE_DIR
+
+# ==========================================
+# 🪞 DUPLICATE IMAGES (Tab 4)
+# Every image gets a 64-bit difference hash (dHash) of its product
+# area: re-encoded, resized or re-padded copies of one shot differ in
+# a few bits only. dHash is grayscale, so the product's mean color
+# rides along: the same model shot in another colorway has a close
+# hash but a different color and is not a duplicate. Near pairs are found with a multi-index Hamming
+# search: the hash is split into MAX_DISTANCE + 1 blocks, and two
+# hashes within MAX_DISTANCE bits agree exactly on at least one block
+# (pigeonhole), so only hashes sharing a block value are compared.
+# Hashes are cached per image content: a re-uploaded ZIP is not decoded.
+# ==========================================
+
+HASH_SIZE = 8  # 8 x 8 gradient bits = 64-bit hash
+HASH_SIGNATURE = f"dhash{HASH_SIZE}-crop-{colors.THUMB_SIZE[0]}"
+MAX_DISTANCE = int(os.environ.get("VALIDATOR_DUP_DISTANCE", "5"))
+COLOR_TOLERANCE = int(os.environ.get("VALIDATOR_DUP_COLOR_TOLERANCE", "20"))  # max R/G/B difference of the mean colors
+HASH_CACHE_ENTRIES = int(os.environ.get("VALIDATOR_HASH_CACHE_ENTRIES", "1000000"))
+BATCH_IMAGES = 256
+
+
+def image_hash(image_bytes):
+    """
+    (dHash, mean color) of the product area. The image is decoded like Tab 4 (colors.thumbnail_rgba),
+    cropped to the visible pixels and put on white; dHash = one bit per "pixel brighter than its right
+    neighbour" of a (HASH_SIZE + 1) x HASH_SIZE grayscale, an int < 2**64. Mean color: 0xRRGGBB of the visible pixels.
+    """
+    pixels = colors.thumbnail_rgba(image_bytes)
+    with perf.stage("phash.hash"):
+        alpha = pixels[..., 3:4] / 255.0
+        rgb = (pixels[..., :3] * alpha + 255 * (1 - alpha)).astype(np.uint8)
+        visible = colors.visible_mask(pixels)
+        if visible.any():
+            mean = rgb[visible].mean(0).round().astype(int)
+            # Crop to rows / columns with a real share of product pixels (not JPEG specks on the background)
+            rows = np.flatnonzero(visible.sum(1) > visible.shape[1] * 0.02)
+            cols = np.flatnonzero(visible.sum(0) > visible.shape[0] * 0.02)
+            if len(rows) and len(cols): rgb = rgb[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+        else:
+            mean = np.array([255, 255, 255])
+        gray = np.asarray(Image.fromarray(rgb).convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.BOX), dtype=np.int16)
+        bits = (gray[:, :-1] > gray[:, 1:]).ravel()
+        return int.from_bytes(np.packbits(bits).tobytes(), "big"), (int(mean[0]) << 16) | (int(mean[1]) << 8) | int(mean[2])
+
+
+def _hash_safe(image_bytes):
+    """(hash, None) or (None, error message); never raises, so it is safe in a worker."""
+    try:
+        result = image_hash(image_bytes), None
+    except Exception as e:
+        result = None, str(e)
+    if colors._IN_WORKER and perf.ENABLED: result += (perf.RECORDER.drain(),)
+    return result
+
+
+class HashCache:
+    """SQLite store of image_hash results keyed on image content, trimmed to the HASH_CACHE_ENTRIES most recently used."""
+
+    def __init__(self, path=None, max_entries=HASH_CACHE_ENTRIES):
+        path = path or os.path.join(CACHE_DIR, "phash.sqlite")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS hashes (key TEXT PRIMARY KEY, hash TEXT NOT NULL, used REAL NOT NULL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS hashes_used ON hashes(used)")
+
+    def key(self, image_bytes):
+        return hashlib.blake2b(image_bytes, digest_size=16).hexdigest() + "-" + HASH_SIGNATURE
+
+    def get_many(self, keys):
+        """key -> hash for the keys that are cached."""
+        found = {}
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            marks = ",".join("?" * len(part))
+            found.update((k, tuple(int(v, 16) for v in h.split(":"))) for k, h in self.db.execute(f"SELECT key, hash FROM hashes WHERE key IN ({marks})", part))
+            self.db.execute(f"UPDATE hashes SET used = ? WHERE key IN ({marks})", [time.time()] + part)
+        self.hits += len(found)
+        self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, items):
+        now = time.time()
+        self.db.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?)", [(k, f"{h:016x}:{c:06x}", now) for k, (h, c) in items])
+
+    def evict(self):
+        """Drop least recently used hashes beyond max_entries."""
+        excess = self.db.execute("SELECT COUNT(*) FROM hashes").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.db.execute("DELETE FROM hashes WHERE key IN (SELECT key FROM hashes ORDER BY used LIMIT ?)", (excess,))
+
+    def close(self):
+        self.evict()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def hash_images(read_bytes, names, workers=None, cache=None, progress=None):
+    """
+    Hash every named image. read_bytes(name) -> bytes (e.g. ImageZip.read).
+    Images are read in batches of BATCH_IMAGES (or MAX_INFLIGHT_MB of bytes); cache misses of a
+    batch are hashed in the Tab 4 worker pool (workers=1: in-process).
+    progress(done, total) is called after every batch.
+    Returns (name -> (dHash, mean color), name -> error message).
+    """
+    workers = workers or colors.COLOR_WORKERS
+    budget = int(colors.MAX_INFLIGHT_MB * 1024 * 1024)
+    hashes, errors = {}, {}
+    pool = None
+
+    def flush(batch, done):
+        nonlocal pool
+        keys = [cache.key(data) for _, data in batch] if cache is not None else None
+        known = cache.get_many(keys) if cache is not None else {}
+        todo = [i for i in range(len(batch)) if keys is None or keys[i] not in known]
+        datas = [batch[i][1] for i in todo]
+        # The pool starts with the first cache miss: a fully cached ZIP never pays for it
+        if pool is None and workers > 1 and len(datas) > 1:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=colors._mp_context(), initializer=colors._init_worker,
+                                       initargs=(perf.ENABLED,))
+        results = pool.map(_hash_safe, datas, chunksize=max(1, len(datas) // (workers * 4))) if pool else map(_hash_safe, datas)
+        fresh = {}
+        for i, result in zip(todo, results):
+            if len(result) > 2: perf.RECORDER.merge(result[2])
+            if result[1] is not None: errors[batch[i][0]] = result[1]
+            else: fresh[i] = result[0]
+        if cache is not None: cache.put_many([(keys[i], h) for i, h in fresh.items()])
+        for i, (name, _) in enumerate(batch):
+            h = fresh.get(i, known.get(keys[i]) if keys is not None else None)
+            if h is not None: hashes[name] = h
+        if progress: progress(done, len(names))
+
+    try:
+        batch, size = [], 0
+        for done, name in enumerate(names, 1):
+            try:
+                data = read_bytes(name)
+            except Exception as e:
+                errors[name] = str(e)
+                continue
+            batch.append((name, data))
+            size += len(data)
+            if len(batch) >= BATCH_IMAGES or size >= budget:
+                flush(batch, done)
+                batch, size = [], 0
+        if batch: flush(batch, len(names))
+    finally:
+        if pool: pool.shutdown(cancel_futures=True)
+    return hashes, errors
+
+
+# ---------- Near-duplicate search ----------
+def hamming(a, b):
+    """Bit differences between uint64 arrays (element-wise)."""
+    x = np.bitwise_xor(a, b)
+    if hasattr(np, "bitwise_count"): return np.bitwise_count(x).astype(np.int64)
+    return np.unpackbits(x.view(np.uint8).reshape(-1, 8), axis=1).sum(1)
+
+
+def near_pairs(hashes, max_distance=MAX_DISTANCE):
+    """
+    (i, j, distance) arrays of every pair i < j of the uint64 array hashes within max_distance bits.
+    Per block, hashes are sorted by block value and compared with the next 1, 2, ... entries
+    while any still share the value, so the work is the sum of squared bucket sizes, not n².
+    """
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    n = len(hashes)
+    bounds = np.linspace(0, 64, max_distance + 2).astype(np.uint64)
+    found = []
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        block = (hashes >> lo) & np.uint64((1 << int(hi - lo)) - 1)
+        order = np.argsort(block, kind="stable")
+        sorted_block = block[order]
+        for k in range(1, n):
+            same = sorted_block[k:] == sorted_block[:-k]
+            if not same.any(): break
+            a, b = order[:-k][same], order[k:][same]
+            dist = hamming(hashes[a], hashes[b])
+            close = dist <= max_distance
+            found.append((np.minimum(a, b)[close], np.maximum(a, b)[close], dist[close]))
+    if not found: return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.int64)
+    i, j, dist = (np.concatenate(a) for a in zip(*found))
+    _, first = np.unique(i * n + j, return_index=True)  # a pair can share several blocks
+    return i[first], j[first], dist[first]
+
+
+def groups(n, i, j):
+    """Connected-component label (smallest member) per item, given edges i-j."""
+    label = np.arange(n)
+    while len(i):
+        low = np.minimum(label[i], label[j])
+        changed = (label[i] != low) | (label[j] != low)
+        if not changed.any(): break
+        np.minimum.at(label, i, low)
+        np.minimum.at(label, j, low)
+        label = label[label]
+    return label
+
+
+@perf.timed("tab4.duplicates")
+def find_duplicate_images(zf, names, workers=None, cache=None, progress=None, max_distance=MAX_DISTANCE,
+                          color_tolerance=COLOR_TOLERANCE, image_files=None):
+    """
+    Near-identical images in zf (an ImageZip) that are filed under different products.
+    names: product keys of the user file (stripped, lower-cased); angle shots ("Name (2).jpg") count
+    for their product, images of unknown products for their own file name.
+    Near-identical: dHash within max_distance bits and mean colors within color_tolerance.
+    Returns (records, skipped): Group/Product/Image/Distance/Also under records (Distance: bits
+    from the group's first image) and Image/Reason records.
+    """
+    if image_files is None: image_files = zf.image_names()
+    hashes, errors = hash_images(zf.read, image_files, workers=workers, cache=cache, progress=progress)
+    skipped = [{"Image": p.split('/')[-1], "Reason": f"Could not process: {errors[p]}"} for p in image_files if p in errors]
+
+    paths = [p for p in image_files if p in hashes]
+    if len(paths) < 2: return [], skipped
+    with perf.stage("phash.search", items=len(paths)):
+        values = np.array([hashes[p][0] for p in paths], dtype=np.uint64)
+        mean = np.array([hashes[p][1] for p in paths], dtype=np.int64)
+        rgb = np.stack([(mean >> 16) & 255, (mean >> 8) & 255, mean & 255], axis=1)
+        # Identical fingerprints (the same file twice) are searched once
+        unique, inverse = np.unique(np.stack([values, mean.astype(np.uint64)], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        first = np.zeros(len(unique), dtype=np.int64)
+        first[inverse[::-1]] = np.arange(len(paths))[::-1]
+        i, j, _ = near_pairs(unique[:, 0], max_distance)
+        same_color = np.abs(rgb[first[i]] - rgb[first[j]]).max(1) <= color_tolerance
+        label = groups(len(unique), i[same_color], j[same_color])[inverse]
+
+    keys = [colorcheck.image_key(p)[2] for p in paths]
+    products = np.array([images.resolve_product(k, names) or images.base_key(k) for k in keys], dtype=object)
+
+    records = []
+    members = np.flatnonzero(np.bincount(label, minlength=len(paths))[label] > 1)
+    roots, first_seen = np.unique(label[members], return_index=True)
+    for root in roots[np.argsort(first_seen)]:  # groups in ZIP order
+        idx = members[label[members] == root]
+        group_products = list(dict.fromkeys(products[idx]))
+        if len(group_products) < 2: continue
+        group = records[-1]["Group"] + 1 if records else 1
+        dist = hamming(values[idx], np.full(len(idx), values[idx[0]], dtype=np.uint64))
+        for k, d in zip(idx.tolist(), dist.tolist()):
+            records.append({"Group": group, "Product": products[k], "Image": paths[k].split('/')[-1], "Distance": d,
+                            "Also under": ", ".join(p for p in group_products if p != products[k])})
+    return records, skipped
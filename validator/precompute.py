@@ -0,0 +1,169 @@
+import os
+import time
+import threading
+
+from validator import masters, names
+from validator.index import load_master_index
+from validator.memory import deep_size
+
+# ==========================================
+# 🏗️ BACKGROUND MASTER WORKER
+# One per server: loads the masters + builds the Tab 1 / Tab 3
+# indexes off the request path, then watches the master files
+# and rebuilds when they change. Readers always get the last
+# complete build, so a rebuild never blocks a session.
+# ==========================================
+
+WATCH_SECONDS = float(os.environ.get("VALIDATOR_WATCH_SECONDS", "5"))
+
+# Status per item: 'loading' -> 'ready' / 'missing' / 'error' ('rebuilding' while a ready item is refreshed)
+ITEMS = ("master", "names")
+
+
+class MasterWorker(threading.Thread):
+    """
+    - master_index / master_info (rows + compact memory figures) for Tab 1
+    - name_index for Tab 3
+    - status / errors / built_at per item in ITEMS
+    A failed rebuild keeps serving the previous build (see stale_since).
+    """
+
+    def __init__(self, folder='.', interval=WATCH_SECONDS, cache=None):
+        super().__init__(name="master-worker", daemon=True)
+        self.folder = folder
+        self.interval = interval
+        self.cache = cache
+        self.master_index = None
+        self.master_info = None
+        self.name_index = None
+        self.status = dict.fromkeys(ITEMS, "loading")
+        self.errors = {}
+        self.notes = []
+        self.built_at = {}
+        self._signatures = {}
+        self._footprint = (None, {})
+        self._changed = threading.Condition()
+        self._stop_event = threading.Event()
+
+    # ---------- Watching ----------
+    def _path(self, item):
+        if item == "master":
+            try: return masters.find_master_file(self.folder)
+            except masters.MasterLoadError: return None
+        return masters.find_name_master_file(self.folder)
+
+    def _signature(self, item):
+        path = self._path(item)
+        if path is None: return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (path, st.st_mtime_ns, st.st_size)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            for item in ITEMS:
+                sig = self._signature(item)
+                if item not in self._signatures or sig != self._signatures[item]:
+                    self._signatures[item] = sig
+                    self._rebuild(item, sig)
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+    # ---------- Building ----------
+    def _set(self, item, status, error=None):
+        with self._changed:
+            self.status[item] = status
+            if error is None: self.errors.pop(item, None)
+            else: self.errors[item] = error
+            self._changed.notify_all()
+
+    def _rebuild(self, item, sig):
+        if self.status[item] == "ready": self._set(item, "rebuilding")
+        try:
+            if item == "master": self._build_master(sig)
+            else: self._build_names(sig)
+        except Exception as e:
+            self._set(item, "error", str(e))
+
+    def _build_master(self, sig):
+        if sig is None:
+            self.master_index = self.master_info = None
+            self._set("master", "error", "No Master File found!")
+            return
+        self.notes = []
+        df = masters.load_master(self.folder, on_fallback=lambda p: self.notes.append(f"Loaded '{p}' as CSV."), cache=self.cache)
+        master_index = load_master_index(self.folder, cache=self.cache, master_df=df)
+        self.master_index, self.master_info = master_index, {"rows": len(df), "memory": df.attrs.get("memory")}
+        self.built_at["master"] = time.time()
+        self._set("master", "ready")
+
+    def _build_names(self, sig):
+        if sig is None:
+            self.name_index = None
+            self._set("names", "missing")
+            return
+        name_index = names.load_name_index(self.folder, cache=self.cache)
+        self.name_index = name_index
+        self.built_at["names"] = time.time()
+        self._set("names", "ready" if name_index else "missing")
+
+    # ---------- Readers ----------
+    def wait(self, item, timeout=None):
+        """Block until item is no longer loading; returns its status."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.status[item] != "loading", timeout)
+            return self.status[item]
+
+    def build(self, item, timeout=None):
+        """The current build of item ('master' / 'names'), waiting while it loads; MasterLoadError if there is none."""
+        status = self.wait(item, timeout)
+        found = self.master_index if item == "master" else self.name_index
+        if found is None: raise masters.MasterLoadError(self.errors.get(item) or f"No {item} data ({status}).")
+        return found
+
+    def stale_since(self, item):
+        """
+        When the last rebuild of item failed but the build before it is still served:
+        that build's time (time.time()), else None.
+        """
+        found = self.master_index if item == "master" else self.name_index
+        if self.status[item] == "error" and found is not None: return self.built_at.get(item)
+        return None
+
+    def snapshot(self):
+        """Status of every item, for change detection in the UI."""
+        return tuple(self.status[i] for i in ITEMS) + tuple(self.built_at.get(i) for i in ITEMS)
+
+    def shared(self):
+        """The current builds every session reads (never copied per session)."""
+        return self.master_index, self.name_index
+
+    def footprint(self):
+        """Bytes held by the current builds per item, measured once per build."""
+        key = tuple(self.built_at.get(i) for i in ITEMS)
+        if self._footprint[0] != key:
+            master_index, name_index = self.shared()
+            self._footprint = (key, {"master": deep_size(master_index), "names": deep_size(name_index)})
+        return self._footprint[1]
+
+
+def start_worker(folder='.', interval=WATCH_SECONDS, cache=None):
+    worker = MasterWorker(folder, interval, cache)
+    worker.start()
+    return worker
+
+
+_WORKER = None
+_WORKER_LOCK = threading.Lock()
+
+
+def shared_worker(folder='.', interval=WATCH_SECONDS, cache=None):
+    """The one worker of this server process, started on first use (the app and the admin page share it)."""
+    global _WORKER
+    with _WORKER_LOCK:
+        if _WORKER is None: _WORKER = start_worker(folder, interval, cache)
+        return _WORKER
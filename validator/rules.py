@@ -0,0 +1,332 @@
+import os
+import re
+import json
+import time
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+from validator import perf
+from validator.engine import EMPTY_MARKERS, as_text
+
+# ==========================================
+# 📐 CROSS-COLUMN RULES (Tab 1)
+# Declarative constraints between user columns (JSON, or YAML
+# if PyYAML is installed), compiled once per rule file version
+# into functions of whole columns: every rule is a few boolean
+# masks over the full user_df, never a loop over rows.
+# Conditions are three-valued: a cell that is empty or not a
+# number (for numeric tests) makes a test "unknown", and a rule
+# only fires where its 'when' is true and its 'check' is known false.
+# ==========================================
+
+# Default: next to app.py, wherever the server or batch run is started from
+RULES_FILE = os.environ.get("VALIDATOR_RULES") or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "validation_rules.json")
+RULE_ERROR = "Rule Violation"
+YAML_AVAILABLE = importlib.util.find_spec("yaml") is not None
+COMPARE_OPS = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal, "==": np.equal, "!=": np.not_equal}
+NUMBER = r'(-?\d+(?:[.,]\d+)?)'
+
+
+class RuleError(ValueError):
+    """Rule file missing a field, using an unknown test or not parseable."""
+
+
+class _Columns:
+    """
+    Lazily derived views of the user columns a rule set reads, computed once per user_df.
+    Every column is factorized first: tests run over its distinct cells and are spread
+    back to rows through the codes, so repeated values (most ID columns) cost nothing.
+    """
+
+    def __init__(self, user_df, resolve):
+        self.df = user_df
+        self.resolve = resolve
+        self._cache = {}
+
+    def _get(self, kind, key, make):
+        if (kind, key) not in self._cache: self._cache[(kind, key)] = make()
+        return self._cache[(kind, key)]
+
+    def factorized(self, key):
+        """(codes per row, stripped distinct cells)."""
+        def make():
+            codes, uniques = pd.factorize(as_text(self.df[self.resolve[key]]).to_numpy(dtype=object))
+            return codes, pd.Series(uniques, dtype=object).str.strip().to_numpy(dtype=object)
+        return self._get("factorized", key, make)
+
+    def per_row(self, key, per_unique):
+        """Spread one value per distinct cell back to the rows."""
+        return per_unique[self.factorized(key)[0]]
+
+    def unique_empty(self, key):
+        return self._get("empty", key, lambda: pd.Series(self.factorized(key)[1], dtype=object).str.lower().isin(EMPTY_MARKERS).to_numpy(dtype=bool))
+
+    def empty(self, key):
+        return self.per_row(key, self.unique_empty(key))
+
+    def number(self, key):
+        def make():
+            found = pd.Series(self.factorized(key)[1], dtype=object).str.extract(NUMBER, expand=False).str.replace(",", ".", regex=False)
+            out = pd.to_numeric(found, errors="coerce").to_numpy(dtype=float, copy=True)
+            out[self.unique_empty(key)] = np.nan
+            return self.per_row(key, out)
+        return self._get("number", key, make)
+
+    def any_part(self, key, values):
+        """Per distinct cell: is any of its pipe-separated parts (lower-cased) in values."""
+        parts = pd.Series(self.factorized(key)[1], dtype=object).str.lower().str.split("|", regex=False).explode().str.strip()
+        hit = np.zeros(len(self.factorized(key)[1]), dtype=bool)
+        hit[parts.index.to_numpy()[parts.isin(values).to_numpy(dtype=bool)]] = True
+        return hit
+
+
+# ---------- Compiling ----------
+# compile_condition(spec) -> (column keys read, in order; fn(cols) -> (value mask, known mask))
+
+def _leaf(spec):
+    key = spec["column"]
+    tests = [t for t in ("empty", "in", "not_in", "contains", "matches", "between") if t in spec]
+    if len(tests) != 1:
+        raise RuleError(f"Condition on '{key}' needs exactly one of empty / in / not_in / contains / matches / between (got {tests or 'none'}).")
+    test, arg = tests[0], spec[tests[0]]
+
+    if test == "empty":
+        def fn(cols):
+            e = cols.empty(key)
+            return (e if arg else ~e), np.ones(len(e), dtype=bool)
+    elif test in ("in", "not_in"):
+        allowed = {str(v).strip().lower() for v in (arg if isinstance(arg, list) else [arg])}
+
+        def fn(cols):
+            # A multi-value cell is "in" when any of its parts is
+            hit = cols.per_row(key, cols.any_part(key, allowed))
+            return (hit if test == "in" else ~hit), ~cols.empty(key)
+    elif test in ("contains", "matches"):
+        try:
+            pattern = re.compile(arg if test == "matches" else re.escape(str(arg)), re.IGNORECASE)
+        except re.error as e:
+            raise RuleError(f"Bad pattern for '{key}': {e}")
+        search = pattern.fullmatch if test == "matches" else pattern.search
+
+        def fn(cols):
+            uniques = cols.factorized(key)[1]
+            hit = np.fromiter((search(u) is not None for u in uniques), dtype=bool, count=len(uniques))
+            return cols.per_row(key, hit), ~cols.empty(key)
+    else:
+        lo, hi = _range(arg, key)
+
+        def fn(cols):
+            n = cols.number(key)
+            with np.errstate(invalid="ignore"):
+                return (n >= lo) & (n <= hi), ~np.isnan(n)
+    return [key], fn
+
+
+def _range(arg, key):
+    if not isinstance(arg, list) or len(arg) != 2:
+        raise RuleError(f"'between' for '{key}' needs [min, max].")
+    lo, hi = (-np.inf if arg[0] is None else float(arg[0])), (np.inf if arg[1] is None else float(arg[1]))
+    return lo, hi
+
+
+def _operand(spec):
+    """Numeric operand: {"column": key}, {"value": n} or {"sum": {key: factor, ...}, "plus": n}."""
+    if "value" in spec:
+        value = float(spec["value"])
+        return [], lambda cols: np.full(len(cols.df), value)
+    if "column" in spec:
+        key = spec["column"]
+        return [key], lambda cols: cols.number(key) + float(spec.get("plus", 0))
+    if "sum" in spec:
+        terms = {k: float(f) for k, f in spec["sum"].items()}
+
+        def fn(cols):
+            total = np.full(len(cols.df), float(spec.get("plus", 0)))
+            for k, f in terms.items(): total = total + f * cols.number(k)
+            return total
+        return list(terms), fn
+    raise RuleError(f"Operand needs 'column', 'value' or 'sum': {spec}")
+
+
+def _compare(spec):
+    op = spec.get("op")
+    if op not in COMPARE_OPS: raise RuleError(f"'compare' needs an op out of {', '.join(COMPARE_OPS)} (got {op!r}).")
+    (lcols, left), (rcols, right) = _operand(spec["left"]), _operand(spec["right"])
+
+    def fn(cols):
+        a, b = left(cols), right(cols)
+        with np.errstate(invalid="ignore"):
+            return COMPARE_OPS[op](a, b), ~(np.isnan(a) | np.isnan(b))
+    return lcols + rcols, fn
+
+
+def compile_condition(spec):
+    if not isinstance(spec, dict): raise RuleError(f"Condition must be an object: {spec!r}")
+    if "all" in spec or "any" in spec:
+        combine_all = "all" in spec
+        subs = [compile_condition(s) for s in spec["all" if combine_all else "any"]]
+        if not subs: raise RuleError(f"Empty 'all' / 'any': {spec!r}")
+
+        def fn(cols):
+            values, known = zip(*(f(cols) for _, f in subs))
+            v, k = np.array(values), np.array(known)
+            if combine_all:
+                # false as soon as one is known false; true when all are known true
+                false = (k & ~v).any(0)
+                return ~false & k.all(0), false | k.all(0)
+            true = (k & v).any(0)
+            return true, true | k.all(0)
+        return [c for columns, _ in subs for c in columns], fn
+    if "not" in spec:
+        columns, sub = compile_condition(spec["not"])
+
+        def fn(cols):
+            v, k = sub(cols)
+            return ~v, k
+        return columns, fn
+    if "compare" in spec:
+        return _compare(spec["compare"])
+    if "column" in spec:
+        return _leaf(spec)
+    raise RuleError(f"Unknown condition: {spec!r}")
+
+
+class Rule:
+    """
+    One compiled rule.
+    - name:    shown as the finding's Value
+    - report:  user column key the finding is filed under (default: the first column the check reads)
+    - columns: every user column key the rule reads (their cells become the finding's Content)
+    """
+
+    def __init__(self, spec):
+        if not isinstance(spec, dict): raise RuleError(f"Rule must be an object: {spec!r}")
+        self.name = spec.get("name")
+        if not self.name: raise RuleError(f"Rule without a name: {spec!r}")
+        if "check" not in spec: raise RuleError(f"Rule '{self.name}' has no 'check'.")
+        try:
+            check_cols, self._check = compile_condition(spec["check"])
+            when_cols, self._when = compile_condition(spec["when"]) if "when" in spec else ([], None)
+        except RuleError as e:
+            raise RuleError(f"Rule '{self.name}': {e}")
+        except (KeyError, TypeError, ValueError) as e:
+            raise RuleError(f"Rule '{self.name}': malformed condition ({e})")
+        self.columns = list(dict.fromkeys(when_cols + check_cols))
+        if not self.columns: raise RuleError(f"Rule '{self.name}' reads no column.")
+        self.report = spec.get("report") or (check_cols or self.columns)[0]
+        if self.report not in self.columns: self.columns.append(self.report)
+
+    def violations(self, cols):
+        """Row positions where 'when' holds and 'check' is known to fail."""
+        value, known = self._check(cols)
+        bad = known & ~value
+        if self._when is not None:
+            w_value, w_known = self._when(cols)
+            bad &= w_known & w_value
+        return np.flatnonzero(bad)
+
+
+class RuleSet:
+    """Compiled rules of one rule file; read-only, shared by every session."""
+
+    def __init__(self, rules, source=None):
+        self.rules = rules
+        self.source = source
+
+    @classmethod
+    def from_spec(cls, spec, source=None):
+        items = spec.get("rules", []) if isinstance(spec, dict) else spec
+        if not isinstance(items, list): raise RuleError("Rule file must hold a list of rules (or {\"rules\": [...]}).")
+        return cls([Rule(item) for item in items], source)
+
+    def __len__(self):
+        return len(self.rules)
+
+    @staticmethod
+    def resolve(user_cols, keys):
+        """
+        Rule column key -> user column of exactly that name (surrounding spaces ignored).
+        No substring match: 'width ID' must never read 'lens width ID'.
+        """
+        by_name = {}
+        for c in user_cols: by_name.setdefault(str(c).strip(), c)
+        return {k: by_name[k.strip()] for k in keys if k.strip() in by_name}
+
+    def check(self, user_df):
+        """
+        (blocks, stats): engine-style finding blocks (positional _pos, one block per rule that fired)
+        and per rule its violations, time and the columns it skipped for.
+        Rules reading a column the user file lacks are skipped.
+        """
+        resolve = self.resolve(user_df.columns, {k for r in self.rules for k in r.columns})
+        cols = _Columns(user_df, resolve)
+        blocks, stats = [], []
+        for seq, rule in enumerate(self.rules):
+            missing = [k for k in rule.columns if k not in resolve]
+            if missing:
+                stats.append({"Rule": rule.name, "Violations": 0, "ms": 0.0, "Skipped": "missing " + ", ".join(missing)})
+                continue
+            t0 = time.perf_counter()
+            with perf.stage(f"tab1.rule.{rule.name}", items=len(user_df)):
+                pos = rule.violations(cols)
+                if len(pos): blocks.append(self._block(rule, seq, pos, cols, resolve))
+            stats.append({"Rule": rule.name, "Violations": len(pos), "ms": round((time.perf_counter() - t0) * 1000, 2), "Skipped": ""})
+        return blocks, stats
+
+    @staticmethod
+    def _block(rule, seq, pos, cols, resolve):
+        content = None
+        for k in rule.columns:
+            codes, uniques = cols.factorized(k)
+            part = resolve[k] + "=" + pd.Series(uniques[codes[pos]], dtype=object)
+            content = part if content is None else content + "; " + part
+        n = len(pos)
+        return {
+            "_pos": pos, "_seq": np.full(n, seq), "Column": np.full(n, resolve[rule.report], dtype=object),
+            "Error": np.full(n, RULE_ERROR, dtype=object), "Value": np.full(n, rule.name, dtype=object),
+            "Content": content.to_numpy(dtype=object), "Allowed": np.full(n, None, dtype=object),
+        }
+
+
+def merge_stats(stat_lists):
+    """Per-rule stats of several checks (e.g. row chunks of one file) added up, in rule order."""
+    merged = {}
+    for stats in stat_lists:
+        for s in stats:
+            m = merged.setdefault(s["Rule"], dict(s, Violations=0, ms=0.0))
+            m["Violations"] += s["Violations"]
+            m["ms"] = round(m["ms"] + s["ms"], 2)
+    return list(merged.values())
+
+
+_LOADED = {}
+
+
+def load_rules(path=None):
+    """RuleSet of a JSON / YAML rule file, compiled once per file version (None if the file doesn't exist)."""
+    path = path or RULES_FILE
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    path_key, version = os.path.abspath(path), (st.st_mtime_ns, st.st_size)
+    loaded = _LOADED.get(path_key)
+    if loaded is None or loaded[0] != version:
+        with open(path, encoding='utf-8') as f:
+            if path.lower().endswith(('.yaml', '.yml')):
+                if not YAML_AVAILABLE: raise RuleError(f"'{path}' is YAML: install PyYAML (or use a .json rule file).")
+                import yaml
+                try:
+                    spec = yaml.safe_load(f)
+                except yaml.YAMLError as e:
+                    raise RuleError(f"'{path}' is not valid YAML: {e}")
+            else:
+                try:
+                    spec = json.load(f)
+                except ValueError as e:
+                    raise RuleError(f"'{path}' is not valid JSON: {e}")
+        with perf.stage("tab1.rules_compile"):
+            loaded = _LOADED[path_key] = (version, RuleSet.from_spec(spec, source=path))
+    return loaded[1]
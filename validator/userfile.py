@@ -0,0 +1,39 @@
+import time
+
+import pandas as pd
+
+from validator import perf
+from validator.formats import XLSX_ENGINE, read_head, read_xlsx_str, sniff_csv, sniff_kind
+from validator.masters import read_csv_sniffed
+
+# ==========================================
+# 📥 USER FILE LOADER
+# The file type is sniffed from its first bytes, so exactly one
+# reader runs: a broken xlsx is reported, not re-parsed as CSV.
+# Timings land in df.attrs['load'].
+# ==========================================
+
+
+def read_user_file(file):
+    """(DataFrame of str cells, format, reader) for an uploaded file or path."""
+    head = read_head(file)
+    kind = sniff_kind(head)
+    if kind == "xlsx":
+        if XLSX_ENGINE == "calamine":
+            return pd.read_excel(file, dtype=str, header=0, engine="calamine"), kind, "calamine"
+        return read_xlsx_str(file), kind, "openpyxl (streaming)"
+    if kind == "xls":
+        return pd.read_excel(file, dtype=str, header=0), kind, "xlrd"
+    # Same cp1252/latin1 fallback as the masters; a malformed row is an error here, not skipped
+    df = read_csv_sniffed(file, dialect=sniff_csv(head), header=0, on_bad_lines='error')
+    return df, kind, f"csv ({df.attrs['csv']['encoding']}, {df.attrs['csv']['sep']!r})"
+
+
+def clean_user_file(file):
+    t0 = time.perf_counter()
+    with perf.stage("userfile.read") as s:
+        df, kind, reader = read_user_file(file)
+        s.add(len(df))
+    df.columns = df.columns.astype(str).str.replace(r'\s+', ' ', regex=True).str.strip()
+    df.attrs['load'] = {"format": kind, "reader": reader, "seconds": round(time.perf_counter() - t0, 3)}
+    return df
@@ -0,0 +1,73 @@
+import os
+import shutil
+import zipfile
+import tempfile
+
+# ==========================================
+# 📦 STREAMING ZIP INGESTION (Tab 4)
+# The archive is spooled to disk and entries are read one at a time,
+# so memory holds the central directory + the images in flight, not the ZIP.
+# ==========================================
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+MAX_ENTRY_MB = float(os.environ.get("VALIDATOR_MAX_ENTRY_MB", "64"))
+_CHUNK = 1 << 20
+
+
+def spool_upload(upload, folder=None):
+    """Copy a file-like upload to a temp file in 1 MB chunks. Returns the temp path."""
+    if hasattr(upload, 'seek'): upload.seek(0)
+    fd, path = tempfile.mkstemp(suffix='.zip', dir=folder)
+    with os.fdopen(fd, 'wb') as out:
+        shutil.copyfileobj(upload, out, _CHUNK)
+    return path
+
+
+class ImageZip:
+    """
+    Lazy view of the images in a ZIP.
+    source: path on disk (used in place) or a file-like upload (spooled to a temp file).
+    read(name) returns one entry's bytes, refusing entries above max_entry_bytes.
+    """
+
+    def __init__(self, source, max_entry_bytes=None):
+        self._temp = None
+        if isinstance(source, (str, os.PathLike)):
+            path = source
+        else:
+            path = self._temp = spool_upload(source)
+        self.max_entry_bytes = max_entry_bytes or int(MAX_ENTRY_MB * 1024 * 1024)
+        self.zf = zipfile.ZipFile(path, 'r')
+
+    def image_names(self):
+        return [f for f in self.zf.namelist()
+                if not f.startswith('__MACOSX')
+                and not f.startswith('.')
+                and f.lower().endswith(IMAGE_EXTENSIONS)]
+
+    def read(self, name):
+        info = self.zf.getinfo(name)
+        if info.file_size > self.max_entry_bytes:
+            raise ValueError(f"entry is {info.file_size / 1024 / 1024:.0f} MB (limit {self.max_entry_bytes / 1024 / 1024:.0f} MB)")
+        return self.zf.read(info)
+
+    def iter_images(self):
+        """(name, bytes or exception) per image entry, one entry in memory at a time."""
+        for name in self.image_names():
+            try:
+                yield name, self.read(name)
+            except Exception as e:
+                yield name, e
+
+    def close(self):
+        self.zf.close()
+        if self._temp:
+            try: os.remove(self._temp)
+            except OSError: pass
+            self._temp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()